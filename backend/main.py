@@ -1,18 +1,34 @@
 from fastapi import FastAPI, HTTPException, Depends, Query, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import List, Optional, Dict, Any
 import uvicorn
+import asyncio
 import os
 import re
 from dotenv import load_dotenv
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, and_, func, select, exists, text, false
 
 # Import our modules
-from database import get_db, create_tables
-from services.nlp_engine import RealEstateNLPEngine
+from database import engine, get_db, get_async_db, create_tables, SessionLocal, AsyncSessionLocal, USE_ASYNC_DB, pool_stats
+from services.nlp_engine import RealEstateNLPEngine, QueryPlan
+from services.nlp_worker_pool import NLPWorkerPool
 from services.knowledge_base import RealEstateKnowledgeBase
+from services.gazetteer_refresh import GazetteerRefresher
+from services.pagination import (
+    price_cursor, decode_price_cursor, after_price_cursor, name_cursor, decode_name_cursor, after_position, approximate_count
+)
+from services import search_queries, async_queries, lookup
+from services.search_doc import SearchDocRefresher
+from services.property_index import property_index
+from services.amenity_bits import USE_AMENITY_BITSET, amenity_catalog
+from services.geo_index import USE_GEO_INDEX, GeoPoint, geo_index, within_radius_sql
+from services.result_cache import DataVersionWatcher, result_cache
+from services import serializers
 from models import Base, Amenity, ProjectAmenity, Project, ProjectLocation, Property, Location
 from models.project import Project
 from models.property import Property
@@ -35,7 +51,8 @@ load_dotenv()
 app = FastAPI(
     title="Real Estate NLP API",
     description="AI-powered real estate search and booking system with natural language processing",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=serializers.FastJSONResponse
 )
 
 # Add CORS middleware
@@ -51,6 +68,39 @@ app.add_middleware(
 nlp_engine = RealEstateNLPEngine()
 knowledge_base = RealEstateKnowledgeBase()
 
+# Query parsing runs off the event loop: NLP_WORKERS processes, or the thread pool when 0
+nlp_worker_pool = NLPWorkerPool(
+    nlp_engine,
+    workers=int(os.getenv("NLP_WORKERS", "0")),
+    recycle_delay_seconds=float(os.getenv("NLP_WORKER_RECYCLE_SECONDS", "60"))
+)
+
+# Keeps the NLP location dictionary in sync with the locations / nearby_places tables
+gazetteer_refresher = GazetteerRefresher(
+    nlp_engine,
+    interval_seconds=int(os.getenv("GAZETTEER_REFRESH_SECONDS", "300")),
+    on_change=nlp_worker_pool.schedule_recycle
+)
+
+# Keeps the property_search_doc materialized view fresh when SEARCH_BACKEND=search_doc
+search_doc_refresher = SearchDocRefresher(interval_seconds=int(os.getenv("SEARCH_DOC_REFRESH_SECONDS", "30")))
+result_cache_watcher = DataVersionWatcher(
+    engine, result_cache, interval_seconds=float(os.getenv("RESULT_CACHE_VERSION_POLL_SECONDS", "2"))
+)
+
+# Batch search limits
+NLP_BATCH_MAX_QUERIES = int(os.getenv("NLP_BATCH_MAX_QUERIES", "50"))
+batch_db_semaphore = asyncio.Semaphore(int(os.getenv("NLP_BATCH_DB_CONCURRENCY", "8")))
+
+# List endpoint page sizes; format=ndjson streams larger pages
+PAGE_MAX_LIMIT = 100
+STREAM_MAX_LIMIT = int(os.getenv("STREAM_MAX_LIMIT", "5000"))
+STREAM_BATCH_ROWS = int(os.getenv("STREAM_BATCH_ROWS", "100"))  # Rows fetched and formatted per streamed chunk
+
+class NLPBatchSearchRequest(BaseModel):
+    """Body of the batch NLP search endpoint"""
+    queries: List[str] = Field(..., min_length=1, max_length=NLP_BATCH_MAX_QUERIES)
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize database and create tables on startup"""
@@ -59,6 +109,36 @@ async def startup_event():
         print("✅ Database tables created successfully!")
     except Exception as e:
         print(f"❌ Error creating database tables: {e}")
+    
+    nlp_worker_pool.start()
+    
+    # Load the gazetteer in the background; queries use the built-in lists until it lands
+    app.state.gazetteer_task = asyncio.create_task(gazetteer_refresher.run())
+    
+    if search_queries.SEARCH_BACKEND == "search_doc":
+        app.state.search_doc_task = asyncio.create_task(search_doc_refresher.run())
+    elif search_queries.SEARCH_BACKEND == "memory":
+        # Searches use SQL until the first snapshot is built
+        app.state.property_index_task = asyncio.create_task(property_index.run())
+    
+    if USE_AMENITY_BITSET:
+        app.state.amenity_catalog_task = asyncio.create_task(amenity_catalog.run())
+    
+    if USE_GEO_INDEX:
+        app.state.geo_index_task = asyncio.create_task(geo_index.run())
+    
+    if result_cache is not None:
+        app.state.result_cache_task = asyncio.create_task(result_cache_watcher.run())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks"""
+    for task_name in ("gazetteer_task", "search_doc_task", "property_index_task", "amenity_catalog_task",
+                      "geo_index_task", "result_cache_task"):
+        task = getattr(app.state, task_name, None)
+        if task:
+            task.cancel()
+    nlp_worker_pool.shutdown()
 
 @app.get("/")
 async def root():
@@ -77,456 +157,98 @@ async def health_check():
 @app.post("/api/v1/search/nlp")
 async def nlp_search(
     query: str = Form(..., description="Natural language search query"),
-    db: Session = Depends(get_db)
+    limit: int = Form(search_queries.SEARCH_RESULT_LIMIT, ge=1, le=100, description="Number of results to return"),
+    cursor: Optional[str] = Form(None, description="next_cursor from the previous page"),
+    include_total: bool = Form(False, description="Also return an approximate total number of matches"),
+    sort: str = Form("price", pattern="^(price|relevance)$", description="price (paginated) or relevance (top results)"),
+    include_facets: bool = Form(False, description="Also return counts per BHK, price band, locality, project status and amenity"),
+    db: Session = Depends(get_db),
+    async_db: Optional[AsyncSession] = Depends(get_async_db)
 ):
     """
     Natural language search endpoint
-    Processes natural language queries and returns relevant properties
+    Processes natural language queries and returns relevant properties, one keyset page at a time
     """
+    if cursor and sort == "relevance":
+        raise HTTPException(status_code=400, detail="cursor is only supported with sort=price")
     try:
-        # Process the query with NLP engine
-        nlp_result = nlp_engine.process_query(query)
-        
-        # Get search criteria
-        search_criteria = nlp_engine.get_search_criteria(query)
-        
-        # Log the search query for training (temporarily disabled)
-        # search_query = SearchQuery(
-        #     query_text=query,
-        #     detected_intent=nlp_result.intent,
-        #     extracted_entities=search_criteria["filters"],
-        #     search_results_count=0  # Will be updated after search
-        # )
-        # db.add(search_query)
-        # db.commit()
-        
-        # Build database query based on extracted criteria
-        db_query = db.query(Property, Project, Location).join(Project).join(ProjectLocation).join(Location)
-        
-        # Globally exclude sold properties (case-insensitive match on 'sold')
-        from sqlalchemy import func
-        db_query = db_query.filter(
-            (Property.status.is_(None)) | (~func.lower(Property.status).like('%sold%'))
-        )
-        
-        # Apply filters based on extracted entities
-        if "location" in search_criteria["filters"]:
-            location = search_criteria["filters"]["location"]
-            # Search in cities and localities
-            db_query = db_query.filter(
-                (Location.city.ilike(f"%{location}%")) | 
-                (Location.locality.ilike(f"%{location}%"))
-            )
-            print(f"✅ Applied location filter: {location}")
-        
-        # Apply project-level status filters inferred from query text
-        try:
-            from sqlalchemy import func
-            qlower = (query or "").lower()
-            project_status_filter_applied = False
-            if "ready to move" in qlower or "ready-to-move" in qlower or "ready to occupy" in qlower:
-                db_query = db_query.filter(func.lower(Project.project_status).like('%ready%move%'))
-                project_status_filter_applied = True
-                print("✅ Applied project status filter: Ready to move")
-            elif "under construction" in qlower or "under-construction" in qlower or "uc" in qlower:
-                db_query = db_query.filter(func.lower(Project.project_status).like('%under%construction%'))
-                project_status_filter_applied = True
-                print("✅ Applied project status filter: Under construction")
-            elif "completed" in qlower or "ready" in qlower and "move" not in qlower:
-                # Broad 'completed' catch; avoid double-catching ready-to-move which includes 'ready'
-                db_query = db_query.filter(func.lower(Project.project_status).like('%completed%'))
-                project_status_filter_applied = True
-                print("✅ Applied project status filter: Completed")
-            
-            # Note: If needed, extend with more status phrases and mappings
-            if not project_status_filter_applied:
-                print("ℹ️  No explicit project status phrase detected in query")
-        except Exception as _e:
-            # Don't fail search if status parsing fails
-            print(f"⚠️ Skipped project status filter due to error: {_e}")
-
-        if "bhk" in search_criteria["filters"]:
-            bhk = search_criteria["filters"]["bhk"]
-            bhk_operator = search_criteria["filters"].get("bhk_operator", "=")
-            
-            # Apply BHK filter with operator
-            if bhk_operator == "=":
-                db_query = db_query.filter(Property.bhk_count == bhk)
-            elif bhk_operator == ">":
-                db_query = db_query.filter(Property.bhk_count > bhk)
-            elif bhk_operator == "<":
-                db_query = db_query.filter(Property.bhk_count < bhk)
-            elif bhk_operator == ">=":
-                db_query = db_query.filter(Property.bhk_count >= bhk)
-            elif bhk_operator == "<=":
-                db_query = db_query.filter(Property.bhk_count <= bhk)
-            
-            print(f"✅ Applied BHK filter: {bhk_operator} {bhk}")
-        
-        if "property_type" in search_criteria["filters"]:
-            prop_type = search_criteria["filters"]["property_type"]
-            # Skip generic property type filters that are too broad
-            generic_types = ['flat', 'apartment', 'house', 'property', 'residential']
-            if prop_type.lower() in generic_types:
-                print(f"⚠️ Skipped generic property_type filter '{prop_type}' (too broad, would exclude valid properties)")
-            # Only apply property_type filter if it's not a BHK-related property_type
-            # (since BHK is already handled by the bhk filter above)
-            elif not any(bhk_term in prop_type.lower() for bhk_term in ['bhk', 'bedroom', 'bed']):
-                db_query = db_query.filter(Property.property_type.ilike(f"%{prop_type}%"))
-                print(f"✅ Applied property type filter: {prop_type}")
-            else:
-                print(f"⚠️ Skipped property_type filter '{prop_type}' as it's BHK-related (handled by BHK filter)")
-        
-        # Apply price filters from NLP extraction with operators
-        if "price_range" in search_criteria["filters"]:
-            price_operator = search_criteria["filters"].get("price_operator", "=")
-            price_value = search_criteria["filters"].get("price_value")
-            
-            if price_value is not None:
-                # Apply price filter using the sell_price column from properties table
-                if price_operator == "<":
-                    db_query = db_query.filter(Property.sell_price < price_value)
-                    print(f"✅ Applied price filter: < ₹{price_value:,} (using sell_price column)")
-                elif price_operator == ">":
-                    db_query = db_query.filter(Property.sell_price > price_value)
-                    print(f"✅ Applied price filter: > ₹{price_value:,} (using sell_price column)")
-                elif price_operator == "<=":
-                    db_query = db_query.filter(Property.sell_price <= price_value)
-                    print(f"✅ Applied price filter: <= ₹{price_value:,} (using sell_price column)")
-                elif price_operator == ">=":
-                    db_query = db_query.filter(Property.sell_price >= price_value)
-                    print(f"✅ Applied price filter: >= ₹{price_value:,} (using sell_price column)")
-                elif price_operator == "=":
-                    db_query = db_query.filter(Property.sell_price == price_value)
-                    print(f"✅ Applied price filter: = ₹{price_value:,} (using sell_price column)")
-            else:
-                # Fallback to old pattern matching for backward compatibility
-                price_text = search_criteria["filters"]["price_range"].lower()
-                
-                # Pattern for "under X crore/lakhs"
-                under_match = re.search(r'under\s+(\d+(?:\.\d+)?)\s*(?:cr|crore|crores|lakh|lakhs)', price_text)
-                if under_match:
-                    max_price = float(under_match.group(1))
-                    if 'lakh' in price_text:
-                        max_price = max_price * 100000  # Convert lakhs to rupees
-                    elif 'crore' in price_text or 'cr' in price_text:
-                        max_price = max_price * 10000000  # Convert crores to rupees
-                    
-                    db_query = db_query.filter(Property.sell_price < max_price)
-                    print(f"✅ Applied price filter: under ₹{max_price:,} (using sell_price column)")
-                
-                # Pattern for "above X crore/lakhs"
-                above_match = re.search(r'above\s+(\d+(?:\.\d+)?)\s*(?:cr|crore|crores|lakh|lakhs)', price_text)
-                if above_match:
-                    min_price = float(above_match.group(1))
-                    if 'lakh' in price_text:
-                        min_price = min_price * 100000  # Convert lakhs to rupees
-                    elif 'crore' in price_text or 'cr' in price_text:
-                        min_price = min_price * 10000000  # Convert crores to rupees
-                    
-                    db_query = db_query.filter(Property.sell_price > min_price)
-                    print(f"✅ Applied price filter: above ₹{min_price:,} (using sell_price column)")
-                
-                # Pattern for range "X-Y crore/lakhs"
-                range_match = re.search(r'(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)\s*(?:cr|crore|crores|lakh|lakhs)', price_text)
-                if range_match:
-                    min_price = float(range_match.group(1))
-                    max_price = float(range_match.group(2))
-                    if 'lakh' in price_text:
-                        min_price = min_price * 100000
-                        max_price = max_price * 100000
-                    elif 'crore' in price_text or 'cr' in price_text:
-                        min_price = min_price * 10000000
-                        max_price = max_price * 10000000
-                    
-                    db_query = db_query.filter(
-                        Property.sell_price >= min_price,
-                        Property.sell_price <= max_price
-                    )
-                    print(f"✅ Applied price filter: ₹{min_price:,} - ₹{max_price:,} (using sell_price column)")
-                
-                # Pattern for "between X to Y crore/lakhs"
-                between_match = re.search(r'between\s+(\d+(?:\.\d+)?)\s*(?:lakh|lakhs|crore|crores)\s*to\s*(\d+(?:\.\d+)?)\s*(?:lakh|lakhs|crore|crores)', price_text)
-                if between_match:
-                    min_price = float(between_match.group(1))
-                    max_price = float(between_match.group(2))
-                    if 'lakh' in price_text:
-                        min_price = min_price * 100000
-                        max_price = max_price * 100000
-                    elif 'crore' in price_text or 'cr' in price_text:
-                        min_price = min_price * 10000000
-                        max_price = max_price * 10000000
-                    
-                    db_query = db_query.filter(
-                        Property.sell_price >= min_price,
-                        Property.sell_price <= max_price
-                    )
-                    print(f"✅ Applied price filter: between ₹{min_price:,} - ₹{max_price:,} (using sell_price column)")
-        
-        # Apply carpet area filters with operators
-        if "carpet_area" in search_criteria["filters"]:
-            area_operator = search_criteria["filters"].get("area_operator", "=")
-            area_value = search_criteria["filters"].get("area_value")
-            
-            if area_value is not None:
-                # Apply carpet area filter
-                if area_operator == "<":
-                    db_query = db_query.filter(Property.carpet_area_sqft < area_value)
-                    print(f"✅ Applied carpet area filter: < {area_value} sqft")
-                elif area_operator == ">":
-                    db_query = db_query.filter(Property.carpet_area_sqft > area_value)
-                    print(f"✅ Applied carpet area filter: > {area_value} sqft")
-                elif area_operator == "<=":
-                    db_query = db_query.filter(Property.carpet_area_sqft <= area_value)
-                    print(f"✅ Applied carpet area filter: <= {area_value} sqft")
-                elif area_operator == ">=":
-                    db_query = db_query.filter(Property.carpet_area_sqft >= area_value)
-                    print(f"✅ Applied carpet area filter: >= {area_value} sqft")
-                elif area_operator == "=":
-                    db_query = db_query.filter(Property.carpet_area_sqft == area_value)
-                    print(f"✅ Applied carpet area filter: = {area_value} sqft")
-                elif area_operator == "BETWEEN":
-                    # Handle range queries like "1000-1500"
-                    if isinstance(area_value, str) and "-" in str(area_value):
-                        try:
-                            min_area, max_area = map(int, str(area_value).split("-"))
-                            db_query = db_query.filter(
-                                Property.carpet_area_sqft >= min_area,
-                                Property.carpet_area_sqft <= max_area
-                            )
-                            print(f"✅ Applied carpet area filter: BETWEEN {min_area} - {max_area} sqft")
-                        except ValueError:
-                            print(f"⚠️ Invalid area range format: {area_value}")
-                    else:
-                        # Fallback to equals if range parsing fails
-                        db_query = db_query.filter(Property.carpet_area_sqft == area_value)
-                        print(f"✅ Applied carpet area filter: = {area_value} sqft (fallback)")
-        
-        # Apply amenities filters
-        if "amenities" in search_criteria["filters"]:
-            amenities_list = search_criteria["filters"]["amenities"]
-            if amenities_list:
-                # Join with project_amenities and amenities tables to filter by amenities
-                db_query = db_query.join(ProjectAmenity, Property.project_id == ProjectAmenity.project_id)
-                db_query = db_query.join(Amenity, ProjectAmenity.amenity_id == Amenity.id)
-                
-                # Filter by amenities (case-insensitive)
-                amenity_filters = []
-                for amenity in amenities_list:
-                    amenity_filters.append(Amenity.name.ilike(f"%{amenity}%"))
-                
-                if amenity_filters:
-                    db_query = db_query.filter(or_(*amenity_filters))
-                    print(f"✅ Applied amenities filter: {', '.join(amenities_list)}")
-        
-        # Apply nearby place filters
-        nearby_place_info = None
-        if "nearby_place" in search_criteria["filters"]:
-            nearby_place_info = search_criteria["filters"]["nearby_place"]
-        elif "nearby_place" in search_criteria:
-            nearby_place_info = search_criteria["nearby_place"]
-        
-        if nearby_place_info:
-            place_type = nearby_place_info.get("place_type")
-            place_name = nearby_place_info.get("place_name")  # Get specific place name if available
-            distance_km = nearby_place_info.get("distance_km")
-            distance_operator = nearby_place_info.get("distance_operator", "<=")
-            
-            if place_type:
-                # Join with nearby_places table to filter by nearby places
-                db_query = db_query.join(NearbyPlace, Property.project_id == NearbyPlace.project_id)
-                
-                # Apply nearby place filter with specific name if available
-                if place_name:
-                    # Filter by specific place name (exact match or partial match)
-                    if distance_km is not None:
-                        # Apply both place type and name with distance
-                        if distance_operator == "<=":
-                            db_query = db_query.filter(
-                                NearbyPlace.place_type.ilike(f"%{place_type}%"),
-                                NearbyPlace.place_name.ilike(f"%{place_name}%"),
-                                NearbyPlace.distance_km <= distance_km
-                            )
-                        elif distance_operator == "<":
-                            db_query = db_query.filter(
-                                NearbyPlace.place_type.ilike(f"%{place_type}%"),
-                                NearbyPlace.place_name.ilike(f"%{place_name}%"),
-                                NearbyPlace.distance_km < distance_km
-                            )
-                        elif distance_operator == "=":
-                            db_query = db_query.filter(
-                                NearbyPlace.place_type.ilike(f"%{place_type}%"),
-                                NearbyPlace.place_name.ilike(f"%{place_name}%"),
-                                NearbyPlace.distance_km == distance_km
-                            )
-                        print(f"✅ Applied specific nearby place filter: '{place_name}' ({place_type}) within {distance_km}km ({distance_operator})")
-                    else:
-                        # Apply place type and name without distance constraint
-                        db_query = db_query.filter(
-                            NearbyPlace.place_type.ilike(f"%{place_type}%"),
-                            NearbyPlace.place_name.ilike(f"%{place_name}%")
-                        )
-                        print(f"✅ Applied specific nearby place filter: '{place_name}' ({place_type})")
-                else:
-                    # Generic place type filtering (no specific name)
-                    if distance_km is not None:
-                        if distance_operator == "<=":
-                            db_query = db_query.filter(
-                                NearbyPlace.place_type.ilike(f"%{place_type}%"),
-                                NearbyPlace.distance_km <= distance_km
-                            )
-                        elif distance_operator == "<":
-                            db_query = db_query.filter(
-                                NearbyPlace.place_type.ilike(f"%{place_type}%"),
-                                NearbyPlace.distance_km < distance_km
-                            )
-                        elif distance_operator == "=":
-                            db_query = db_query.filter(
-                                NearbyPlace.place_type.ilike(f"%{place_type}%"),
-                                NearbyPlace.distance_km == distance_km
-                            )
-                        print(f"✅ Applied generic nearby place filter: {place_type} within {distance_km}km ({distance_operator})")
-                    else:
-                        # Just place type without distance
-                        db_query = db_query.filter(
-                            NearbyPlace.place_type.ilike(f"%{place_type}%")
-                        )
-                        print(f"✅ Applied generic nearby place filter: {place_type}")
+        position = decode_price_cursor(cursor, tie_breakers=1)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        # Parse the query once off the event loop - the plan carries intent, entities, filters and status flags
+        plan = await nlp_worker_pool.plan_query(query)
         
-        # Additional intelligent parsing for special queries
-        try:
-            qlower_full = (query or "").lower()
-            # 1) "within X km of <place>" → use NearbyPlace with distance
-            import re as _re
-            within_match = _re.search(r"within\s+(\d+(?:\.\d+)?)\s*k?m?s?\s+of\s+([^,\.;]+)", qlower_full)
-            if within_match:
-                dist_val = float(within_match.group(1))
-                place_text = within_match.group(2).strip()
-                # Use EXISTS subquery to avoid duplicate joins
-                from sqlalchemy import exists
-                nearby_exists = exists().where(
-                    and_(
-                        NearbyPlace.project_id == Project.id,
-                        NearbyPlace.distance_km <= dist_val,
-                        or_(
-                            NearbyPlace.place_type.ilike(f"%{place_text}%"),
-                            NearbyPlace.place_name.ilike(f"%{place_text}%")
-                        )
-                    )
-                )
-                db_query = db_query.filter(nearby_exists)
-                print(f"✅ Applied nearby distance filter: within {dist_val} km of '{place_text}'")
-
-                # Additionally, apply BHK filter if query contains an explicit BHK number
-                bhk_match = _re.search(r"(\d+)\s*bhk", qlower_full)
-                if bhk_match:
-                    bhk_val = int(bhk_match.group(1))
-                    db_query = db_query.filter(Property.bhk_count == bhk_val)
-                    print(f"✅ Applied BHK filter from query: {bhk_val} BHK")
-
-            # 2) "with N balconies" → properties having at least N balcony room specs
-            balc_match = _re.search(r"(\d+)\s+balcon(?:y|ies)", qlower_full)
-            if balc_match:
-                min_balconies = int(balc_match.group(1))
-                from sqlalchemy import select, literal_column
-                # Subquery: property_ids having at least N balconies
-                balc_subq = (
-                    db.query(RoomSpecification.property_id.label("prop_id"))
-                    .filter(func.lower(RoomSpecification.room_type) == 'balcony')
-                    .group_by(RoomSpecification.property_id)
-                    .having(func.count(RoomSpecification.id) >= min_balconies)
-                    .subquery()
-                )
-                db_query = db_query.filter(Property.id.in_(select(balc_subq.c.prop_id)))
-                print(f"✅ Applied balconies filter: >= {min_balconies} balconies")
-
-            # 3) "garden view" → any room_specifications.features contains 'garden view'
-            if 'garden view' in qlower_full:
-                # Subquery using Postgres unnest to do case-insensitive contains
-                garden_subq = (
-                    db.query(RoomSpecification.property_id.label("prop_id"))
-                    .filter(
-                        text("EXISTS (SELECT 1 FROM unnest(room_specifications.features) f WHERE lower(f) like '%garden view%')")
-                    )
-                    .group_by(RoomSpecification.property_id)
-                    .subquery()
-                )
-                db_query = db_query.filter(Property.id.in_(select(garden_subq.c.prop_id)))
-                print("✅ Applied feature filter: Garden View")
-        except Exception as _parse_e:
-            print(f"⚠️ Skipped special query parsing due to error: {_parse_e}")
-
-        # Execute the query
-        query_results = db_query.limit(20).all()
+        if async_db is not None:
+            response = await async_queries.execute_nlp_search(async_db, plan, position, limit, include_total, sort, include_facets)
+        else:
+            # Database work runs on the thread pool so other requests keep being served
+            response = await run_in_threadpool(search_queries.execute_nlp_search, db, plan, position, limit, include_total, sort, include_facets)
         
-        # Update search results count (temporarily disabled)
-        # search_query.search_results_count = len(query_results)
-        # db.commit()
+        # Encoded straight from the ORM values (Decimal, UUID, date) - no jsonable_encoder pass
+        return serializers.FastJSONResponse(response)
         
-        # Format results
-        results = []
-        for property_item, project, location in query_results:
-            # Calculate price per sqft
-            price_per_sqft = None
-            if property_item.sell_price and property_item.carpet_area_sqft and property_item.carpet_area_sqft > 0:
-                price_per_sqft = property_item.sell_price / property_item.carpet_area_sqft
-            
-            # Get primary image and media count for the project
-            primary_media = db.query(ProjectMedia).filter(
-                ProjectMedia.project_id == project.id,
-                ProjectMedia.is_primary == True,
-                ProjectMedia.is_active == True
-            ).first()
-            
-            total_media_count = db.query(ProjectMedia).filter(
-                ProjectMedia.project_id == project.id,
-                ProjectMedia.is_active == True
-            ).count()
-            
-            project_data = {
-                "id": str(property_item.id),
-                "bhk_count": float(property_item.bhk_count) if property_item.bhk_count else None,
-                "carpet_area_sqft": float(property_item.carpet_area_sqft) if property_item.carpet_area_sqft else None,
-                "sell_price": float(property_item.sell_price) if property_item.sell_price else None,
-                "price_per_sqft": float(price_per_sqft) if price_per_sqft else None,
-                "floor_number": property_item.floor_number,
-                "property_type": property_item.property_type,
-                "facing": property_item.facing,
-                "status": property_item.status,
-                "project": {
-                    "id": str(project.id),
-                    "name": project.name,
-                    "developer_id": str(project.developer_id) if project.developer_id else None,
-                    "project_status": project.project_status,
-                    "total_units": project.total_units,
-                    "total_floors": project.total_floors,
-                    "possession_date": str(project.possession_date) if project.possession_date else None,
-                    "rera_number": project.rera_number,
-                    "description": project.description,
-                    "project_type": project.project_type
-                } if project else None,
-                "location": {
-                    "city": location.city if location else None,
-                    "locality": location.locality if location else None
-                } if location else None,
-                "media": {
-                    "primary_image": primary_media.file_path if primary_media else None,
-                    "total_count": total_media_count
-                } if primary_media or total_media_count > 0 else None
-            }
-            results.append(project_data)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Search error: {str(e)}")
+
+@app.post("/api/v1/search/nlp/batch")
+async def nlp_batch_search(request: NLPBatchSearchRequest):
+    """
+    Batch natural language search endpoint
+    Parses all queries in one pass and runs one database search per distinct filter plan
+    """
+    try:
+        plans = await nlp_worker_pool.plan_queries(request.queries)
+        
+        # Queries that resolve to the same filters share one database search
+        unique_plans: Dict[str, QueryPlan] = {}
+        for plan in plans:
+            unique_plans.setdefault(plan.filter_key(), plan)
+        
+        async def search(plan: QueryPlan):
+            async with batch_db_semaphore:
+                if USE_ASYNC_DB:
+                    return await _execute_nlp_search_async_session(plan)
+                return await run_in_threadpool(_execute_nlp_search_in_session, plan)
+        
+        outcomes = await asyncio.gather(*(search(plan) for plan in unique_plans.values()), return_exceptions=True)
+        searches = dict(zip(unique_plans, outcomes))
+        
+        responses = []
+        for plan in plans:
+            outcome = searches[plan.filter_key()]
+            if isinstance(outcome, Exception):
+                responses.append({"query": plan.query, "error": f"Search error: {str(outcome)}"})
+                continue
+            responses.append({
+                **outcome,
+                "query": plan.query,
+                "intent": plan.intent,
+                "confidence": plan.confidence
+            })
         
-        return {
-            "query": query,
-            "intent": nlp_result.intent,
-            "confidence": nlp_result.confidence,
-            "extracted_entities": search_criteria["filters"],
-            "results_count": len(results),
-            "results": results
-        }
+        print(f"✅ Batch search: {len(plans)} queries, {len(unique_plans)} distinct searches")
+        return serializers.FastJSONResponse({
+            "queries_count": len(plans),
+            "distinct_searches": len(unique_plans),
+            "responses": responses
+        })
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Search error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch search error: {str(e)}")
+
+def _execute_nlp_search_in_session(plan: QueryPlan) -> Dict[str, Any]:
+    """search_queries.execute_nlp_search with its own session, for running searches concurrently"""
+    db = SessionLocal()
+    try:
+        return search_queries.execute_nlp_search(db, plan)
+    finally:
+        db.close()
+
+async def _execute_nlp_search_async_session(plan: QueryPlan) -> Dict[str, Any]:
+    async with AsyncSessionLocal() as db:
+        return await async_queries.execute_nlp_search(db, plan)
 
 @app.get("/api/v1/search/suggestions")
 async def get_search_suggestions(
@@ -542,75 +264,147 @@ async def get_search_suggestions(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting suggestions: {str(e)}")
 
+@app.get("/api/v1/search/nlp/cache-stats")
+async def get_nlp_cache_stats():
+    """Hit/miss counters for the parsed-query and search result caches"""
+    return {
+        "success": True,
+        "cache": nlp_engine.query_cache.stats(),
+        "result_cache": result_cache.stats() if result_cache is not None else None
+    }
+
+@app.get("/api/v1/db/pool-stats")
+async def get_db_pool_stats():
+    """Database connection pool usage and checkout wait times"""
+    return {
+        "success": True,
+        "pool": pool_stats()
+    }
+
 @app.get("/api/v1/properties")
-async def get_properties(
+def get_properties(
     city: Optional[str] = Query(None, description="Filter by city"),
     locality: Optional[str] = Query(None, description="Filter by locality"),
     bhk: Optional[int] = Query(None, description="Filter by BHK"),
     min_price: Optional[float] = Query(None, description="Minimum price"),
     max_price: Optional[float] = Query(None, description="Maximum price"),
     project_status: Optional[str] = Query(None, description="Filter by project status"),
-    limit: int = Query(20, description="Number of results to return"),
-    offset: int = Query(0, description="Number of results to skip"),
+    limit: int = Query(20, ge=1, le=STREAM_MAX_LIMIT, description="Number of results to return (at most 100 unless format=ndjson)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(False, description="Also return an approximate total number of projects"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="json, or ndjson to stream one project per line"),
     db: Session = Depends(get_db)
 ):
-    """Get properties with filters"""
+    """Get properties with filters, one keyset page at a time in (name, id) order"""
     try:
-        query = db.query(Project)
-        
-        # Apply filters
-        if city:
-            query = query.join(ProjectLocation).join(Location).filter(Location.city.ilike(f"%{city}%"))
-        
-        if locality:
-            query = query.join(ProjectLocation).join(Location).filter(Location.locality.ilike(f"%{locality}%"))
-        
-        if bhk:
-            # Note: BHK filtering would need to be implemented differently
-            # since PropertyUnit is not available in the current schema
-            pass
+        position = decode_name_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if format == "json" and limit > PAGE_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit above {PAGE_MAX_LIMIT} requires format=ndjson")
+    
+    if bhk:
+        # Note: BHK filtering would need to be implemented differently
+        # since PropertyUnit is not available in the current schema
+        pass
+    
+    # Apply price filters
+    if min_price or max_price:
+        # Note: Price filtering would need to be implemented differently
+        # since PropertyUnit is not available in the current schema
+        pass
+    
+    def build_query(session: Session):
+        query = session.query(Project)
+        
+        # Apply filters (any of the project's locations; EXISTS so projects are not repeated)
+        if city or locality:
+            project_location = aliased(Location)
+            query = query.filter(exists().where(
+                ProjectLocation.project_id == Project.id,
+                ProjectLocation.location_id == project_location.id,
+                *([lookup.city_filter(city, project_location)] if city else []),
+                *([lookup.locality_filter(locality, project_location)] if locality else [])
+            ))
         
         if project_status:
             query = query.filter(Project.project_status == project_status)
+        return query
+    
+    def page_query(query):
+        if position:
+            query = query.filter(after_position((Project.name, Project.id), position))
+        return query.order_by(Project.name, Project.id).limit(limit + 1)
+    
+    def format_projects(session: Session, projects):
+        return [serializers.project_summary(project) for project in projects]
+    
+    def next_cursor(project):
+        return name_cursor(project.name, project.id)
+    
+    if format == "ndjson":
+        return _stream_ndjson(lambda session: page_query(build_query(session)), format_projects, limit, next_cursor)
+    
+    try:
+        query = build_query(db)
         
-        # Apply price filters
-        if min_price or max_price:
-            # Note: Price filtering would need to be implemented differently
-            # since PropertyUnit is not available in the current schema
-            pass
-        
-        # Get total count
-        total_count = query.count()
-        
-        # Apply pagination
-        projects = query.offset(offset).limit(limit).all()
+        # Planner estimate instead of count(*), so the total costs the same on every page
+        approximate_total = approximate_count(db, query.statement) if include_total else None
         
-        # Format results
-        results = []
-        for project in projects:
-            project_data = {
-                "id": project.id,
-                "name": project.name,
-                "project_status": project.project_status,
-                "total_units": project.total_units,
-                "total_floors": project.total_floors,
-                "possession_date": str(project.possession_date) if project.possession_date else None,
-                "rera_number": project.rera_number,
-                "description": project.description,
-                "project_type": project.project_type
-            }
-            results.append(project_data)
+        # One extra row tells us whether there is another page
+        projects = page_query(query).all()
+        has_more = len(projects) > limit
+        projects = projects[:limit]
         
-        return {
-            "total_count": total_count,
+        return serializers.FastJSONResponse({
+            "approximate_total": approximate_total,
             "limit": limit,
-            "offset": offset,
-            "results": results
-        }
+            "has_more": has_more,
+            "next_cursor": next_cursor(projects[-1]) if has_more else None,
+            "results": format_projects(db, projects)
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching properties: {str(e)}")
 
+def _stream_ndjson(build_page_query, format_rows, limit: int, next_cursor):
+    """StreamingResponse of one JSON document per row, then a {"page": {...}} line with has_more / next_cursor.
+
+    Rows are read through a server-side cursor and formatted STREAM_BATCH_ROWS at
+    a time, so the first lines go out before the last row is fetched. The
+    generator opens its own session: the request's session is closed once the
+    endpoint returns.
+    """
+    def generate():
+        db = SessionLocal()
+        try:
+            batch, emitted, last_row, has_more = [], 0, None, False
+            for row in build_page_query(db).yield_per(STREAM_BATCH_ROWS):
+                if emitted + len(batch) == limit:
+                    has_more = True
+                    break
+                batch.append(row)
+                if len(batch) == STREAM_BATCH_ROWS:
+                    yield from serializers.ndjson_lines(format_rows(db, batch))
+                    emitted, last_row, batch = emitted + len(batch), batch[-1], []
+            if batch:
+                yield from serializers.ndjson_lines(format_rows(db, batch))
+                emitted, last_row = emitted + len(batch), batch[-1]
+            yield from serializers.ndjson_lines([{"page": {
+                "results_count": emitted,
+                "limit": limit,
+                "has_more": has_more,
+                "next_cursor": next_cursor(last_row) if has_more else None
+            }}])
+        except Exception as e:
+            # Headers are already sent - report the failure in-band
+            print(f"❌ NDJSON stream failed: {e}")
+            yield from serializers.ndjson_lines([{"error": str(e)}])
+        finally:
+            db.close()
+    
+    return StreamingResponse(generate(), media_type=serializers.NDJSON_MEDIA_TYPE)
+
 @app.post("/api/v1/knowledge/query")
 async def knowledge_query(
     query: str = Form(..., description="Knowledge query about real estate"),
@@ -671,7 +465,7 @@ async def get_knowledge_suggestions(category: Optional[str] = Query(None, descri
         raise HTTPException(status_code=500, detail=f"Error fetching knowledge suggestions: {str(e)}")
 
 @app.get("/api/v1/projects/{project_id}/amenities")
-async def get_project_amenities(project_id: str, db: Session = Depends(get_db)):
+def get_project_amenities(project_id: str, db: Session = Depends(get_db)):
     """Get amenities for a specific project"""
     try:
         # For now, return default amenities since there's a database schema mismatch
@@ -700,211 +494,195 @@ async def get_project_amenities(project_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error fetching project amenities: {str(e)}")
 
 @app.get("/api/v1/projects/{project_id}/property-configurations")
-async def get_project_property_configurations(project_id: str, db: Session = Depends(get_db)):
+async def get_project_property_configurations(
+    project_id: str,
+    db: Session = Depends(get_db),
+    async_db: Optional[AsyncSession] = Depends(get_async_db)
+):
     """Get all property configurations (BHK types) for a specific project with floor plans"""
     try:
-        # Query properties for the given project
-        from sqlalchemy import func
-        properties = db.query(Property).filter(
-            Property.project_id == project_id,
-            (Property.status.is_(None)) | (~func.lower(Property.status).like('%sold%'))
-        ).order_by(Property.bhk_count).all()
-        
-        # Format results
-        configurations = []
-        for prop in properties:
-            config = {
-                "id": str(prop.id),
-                "bhk_count": float(prop.bhk_count) if prop.bhk_count else None,
-                "carpet_area_sqft": float(prop.carpet_area_sqft) if prop.carpet_area_sqft else None,
-                "super_builtup_area_sqft": float(prop.super_builtup_area_sqft) if prop.super_builtup_area_sqft else None,
-                "sell_price": float(prop.sell_price) if prop.sell_price else None,
-                "floor_plan_url": prop.floor_plan_url,
-                "property_type": prop.property_type,
-                "facing": prop.facing,
-                "status": prop.status,
-                "floor_number": prop.floor_number
-            }
-            configurations.append(config)
-        
-        return {
-            "success": True,
-            "project_id": project_id,
-            "configurations": configurations,
-            "total_configurations": len(configurations)
-        }
+        if async_db is not None:
+            return await async_queries.project_configurations(async_db, project_id)
+        return await run_in_threadpool(search_queries.project_configurations, db, project_id)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching property configurations: {str(e)}")
 
 @app.get("/api/v1/projects/{project_id}/nearby-places")
-async def get_project_nearby_places(project_id: str, db: Session = Depends(get_db)):
+async def get_project_nearby_places(
+    project_id: str,
+    db: Session = Depends(get_db),
+    async_db: Optional[AsyncSession] = Depends(get_async_db)
+):
     """Get nearby places for a specific project with distances"""
     try:
-        # Query nearby places for the given project
-        nearby_places = db.query(NearbyPlace).filter(
-            NearbyPlace.project_id == project_id
-        ).order_by(NearbyPlace.place_type, NearbyPlace.distance_km).all()
-        
-        # Group by place type for better organization
-        places_by_category = {}
-        for place in nearby_places:
-            category = place.place_type
-            if category not in places_by_category:
-                places_by_category[category] = []
-            
-            places_by_category[category].append({
-                "id": str(place.id),
-                "place_name": place.place_name,
-                "distance_km": float(place.distance_km),
-                "walking_distance": place.walking_distance,
-                "created_at": str(place.created_at),
-                "updated_at": str(place.updated_at)
-            })
-        
-        return {
-            "success": True,
-            "project_id": project_id,
-            "nearby_places": places_by_category,
-            "total_categories": len(places_by_category),
-            "total_places": len(nearby_places)
-        }
+        if async_db is not None:
+            return await async_queries.project_nearby_places(async_db, project_id)
+        return await run_in_threadpool(search_queries.project_nearby_places, db, project_id)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching nearby places: {str(e)}")
 
 @app.get("/api/v1/projects/{project_id}/media")
-async def get_project_media(project_id: str, db: Session = Depends(get_db)):
+async def get_project_media(
+    project_id: str,
+    db: Session = Depends(get_db),
+    async_db: Optional[AsyncSession] = Depends(get_async_db)
+):
     """Get media (images and videos) for a specific project"""
     try:
-        # Query the database for actual project media
-        project_media = db.query(ProjectMedia).filter(
-            ProjectMedia.project_id == project_id,
-            ProjectMedia.is_active == True
-        ).order_by(ProjectMedia.sort_order, ProjectMedia.created_at).all()
-        
-        # Convert SQLAlchemy objects to dictionaries
-        media_list = []
-        for media in project_media:
-            media_dict = {
-                "id": str(media.id),
-                "file_name": media.file_name,
-                "file_path": media.file_path,
-                "file_type": media.file_type,
-                "mime_type": media.mime_type,
-                "media_category": media.media_category,
-                "is_primary": media.is_primary,
-                "alt_text": media.alt_text,
-                "sort_order": media.sort_order,
-                "width": media.width,
-                "height": media.height,
-                "duration_seconds": media.duration_seconds,
-                "caption": media.caption
-            }
-            media_list.append(media_dict)
-        
-        return {
-            "success": True,
-            "project_id": project_id,
-            "media": media_list,
-            "total_media": len(media_list)
-        }
+        if async_db is not None:
+            return await async_queries.project_media(async_db, project_id)
+        return await run_in_threadpool(search_queries.project_media, db, project_id)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching project media: {str(e)}")
 
 @app.get("/api/v1/search/nearby")
-async def search_by_nearby_places(
-    place_type: str = Query(..., description="Type of nearby place (e.g., hospital, school, mall)"),
-    distance_km: float = Query(..., description="Maximum distance in kilometers"),
+def search_by_nearby_places(
+    place_type: Optional[str] = Query(None, description="Type of nearby place (e.g., hospital, school, mall)"),
+    distance_km: float = Query(..., gt=0, description="Maximum distance in kilometers (to the place type, or radius around the point)"),
+    latitude: Optional[float] = Query(None, ge=-90, le=90, description="Search around this point (with longitude)"),
+    longitude: Optional[float] = Query(None, ge=-180, le=180, description="Search around this point (with latitude)"),
     city: str = Query(None, description="City to search in"),
+    limit: int = Query(20, ge=1, le=STREAM_MAX_LIMIT, description="Number of results to return (at most 100 unless format=ndjson)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="json, or ndjson to stream one property per line"),
     db: Session = Depends(get_db)
 ):
-    """Search properties based on nearby places within specified distance"""
+    """Search properties based on nearby places, or distance from a point, within specified distance"""
+    if (latitude is None) != (longitude is None):
+        raise HTTPException(status_code=400, detail="latitude and longitude must be given together")
+    if place_type is None and latitude is None:
+        raise HTTPException(status_code=400, detail="Either place_type or latitude/longitude is required")
+    if latitude is not None and not USE_GEO_INDEX:
+        raise HTTPException(status_code=400, detail="Search around a point is not enabled (USE_GEO_INDEX)")
+    if format == "json" and limit > PAGE_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit above {PAGE_MAX_LIMIT} requires format=ndjson")
     try:
-        # Build the query to find projects with nearby places
-        query = db.query(Project).join(NearbyPlace).filter(
-            NearbyPlace.place_type.ilike(f"%{place_type}%"),
-            NearbyPlace.distance_km <= distance_km
+        position = decode_price_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    place_matches = and_(
+        lookup.place_type_filter(place_type),
+        NearbyPlace.distance_km <= distance_km
+    ) if place_type else None
+    
+    # Radius around a point: the in-process grid when loaded, else bounding box + haversine in SQL
+    center = GeoPoint(latitude, longitude) if latitude is not None else None
+    point_distances: Dict[str, float] = {}
+    if center is not None and USE_GEO_INDEX and geo_index.ready:
+        point_distances = geo_index.projects_within(center, distance_km)
+    
+    def build_query(session: Session):
+        # Projects can be linked to several locations - show the first one
+        project_location = (
+            session.query(
+                ProjectLocation.project_id.label("project_id"),
+                func.min(ProjectLocation.location_id).label("location_id")
+            )
+            .group_by(ProjectLocation.project_id)
+            .subquery()
         )
         
-        # Add city filter if specified
-        if city:
-            query = query.join(ProjectLocation).join(Location).filter(
-                Location.city.ilike(f"%{city}%")
-            )
+        # Properties, their project and location in one query, excluding sold
+        query = (
+            session.query(Property, Project, Location)
+            .join(Project, Project.id == Property.project_id)
+            .outerjoin(project_location, project_location.c.project_id == Property.project_id)
+            .outerjoin(Location, Location.id == project_location.c.location_id)
+            .filter(search_queries.not_sold())
+        )
         
-        # Get projects with nearby places
-        projects = query.distinct().all()
+        if place_matches is not None:
+            query = query.filter(exists().where(NearbyPlace.project_id == Property.project_id, place_matches))
         
-        # Get properties for these projects, excluding sold
-        from sqlalchemy import func
-        project_ids = [str(project.id) for project in projects]
-        properties = db.query(Property).filter(
-            Property.project_id.in_(project_ids),
-            (Property.status.is_(None)) | (~func.lower(Property.status).like('%sold%'))
-        ).all()
+        if center is not None:
+            if USE_GEO_INDEX and geo_index.ready:
+                query = query.filter(Property.project_id.in_(list(point_distances)) if point_distances else false())
+            else:
+                query = query.filter(within_radius_sql(
+                    func.coalesce(Project.latitude, Location.latitude),
+                    func.coalesce(Project.longitude, Location.longitude),
+                    center, distance_km
+                ))
+        
+        # Add city filter if specified (any of the project's locations)
+        if city:
+            city_location = aliased(Location)
+            query = query.filter(exists().where(
+                ProjectLocation.project_id == Property.project_id,
+                ProjectLocation.location_id == city_location.id,
+                lookup.city_filter(city, city_location)
+            ))
+        
+        if position:
+            query = query.filter(after_price_cursor(Property.sell_price, Property.id, position))
+        
+        # One extra row tells us whether there is another page
+        return query.order_by(Property.sell_price, Property.id).limit(limit + 1)
+    
+    def format_rows(session: Session, rows):
+        # Matching nearby places for every project in the batch in one query
+        nearby_by_project: Dict[str, List[Dict[str, Any]]] = {}
+        project_ids = {prop.project_id for prop, _, _ in rows}
+        if project_ids and place_matches is not None:
+            nearby_places = (
+                session.query(NearbyPlace)
+                .filter(NearbyPlace.project_id.in_(project_ids), place_matches)
+                .order_by(NearbyPlace.distance_km)
+                .all()
+            )
+            for place in nearby_places:
+                nearby_by_project.setdefault(str(place.project_id), []).append(serializers.nearby_place_summary(place))
         
         # Format results with nearby place information
         results = []
-        for prop in properties:
-            # Get nearby places for this property's project
-            nearby_places = db.query(NearbyPlace).filter(
-                NearbyPlace.project_id == prop.project_id,
-                NearbyPlace.place_type.ilike(f"%{place_type}%"),
-                NearbyPlace.distance_km <= distance_km
-            ).all()
-            
-            # Get project and location info
-            project = db.query(Project).filter(Project.id == prop.project_id).first()
-            project_location = db.query(ProjectLocation).filter(ProjectLocation.project_id == prop.project_id).first()
-            location = None
-            if project_location:
-                location = db.query(Location).filter(Location.id == project_location.location_id).first()
-            
-            result = {
-                "id": str(prop.id),
-                "project_id": str(prop.project_id),
-                "project_name": project.name if project else None,
-                "property_type": prop.property_type,
-                "bhk_count": float(prop.bhk_count) if prop.bhk_count else None,
-                "carpet_area_sqft": float(prop.carpet_area_sqft) if prop.carpet_area_sqft else None,
-                "super_builtup_area_sqft": float(prop.super_builtup_area_sqft) if prop.super_builtup_area_sqft else None,
-                "sell_price": float(prop.sell_price) if prop.sell_price else None,
-                "floor_plan_url": prop.floor_plan_url,
-                "facing": prop.facing,
-                "status": prop.status,
-                "floor_number": prop.floor_number,
-                "city": location.city if location else None,
-                "locality": location.locality if location else None,
-                "nearby_places": [
-                    {
-                        "place_name": place.place_name,
-                        "place_type": place.place_type,
-                        "distance_km": float(place.distance_km),
-                        "walking_distance": place.walking_distance
-                    }
-                    for place in nearby_places
-                ]
-            }
+        for prop, project, location in rows:
+            result = serializers.property_listing(prop)
+            result["project_name"] = project.name if project else None
+            result["city"] = location.city if location else None
+            result["locality"] = location.locality if location else None
+            result["nearby_places"] = nearby_by_project.get(str(prop.project_id), [])
+            if str(prop.project_id) in point_distances:
+                result["distance_from_point_km"] = round(point_distances[str(prop.project_id)], 2)
             results.append(result)
+        return results
+    
+    def next_cursor(row):
+        return price_cursor(row[0].sell_price, row[0].id)
+    
+    if format == "ndjson":
+        return _stream_ndjson(build_query, format_rows, limit, next_cursor)
+    
+    try:
+        rows = build_query(db).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        results = format_rows(db, rows)
         
-        return {
+        return serializers.FastJSONResponse({
             "success": True,
             "query": {
                 "place_type": place_type,
                 "max_distance_km": distance_km,
+                "latitude": latitude,
+                "longitude": longitude,
                 "city": city
             },
             "results": results,
-            "total_results": len(results)
-        }
+            "total_results": len(results),
+            "limit": limit,
+            "has_more": has_more,
+            "next_cursor": next_cursor(rows[-1]) if has_more else None
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching by nearby places: {str(e)}")
 
 @app.get("/api/v1/cities")
-async def get_cities(db: Session = Depends(get_db)):
+def get_cities(db: Session = Depends(get_db)):
     """Get all cities"""
     try:
         # Query cities from the Location table
@@ -914,7 +692,7 @@ async def get_cities(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error fetching cities: {str(e)}")
 
 @app.get("/api/v1/localities/{city_name}")
-async def get_localities(city_name: str, db: Session = Depends(get_db)):
+def get_localities(city_name: str, db: Session = Depends(get_db)):
     """Get localities for a specific city"""
     try:
         # Query localities from the Location table for a specific city
@@ -1,9 +1,9 @@
-from .base import Base, TimestampMixin
+from .base import Base, ViewBase, TimestampMixin
 from .amenity import Amenity
 from .project_amenity import ProjectAmenity
 from .project import Project
 from .project_location import ProjectLocation
-from .property import Property
+from .property import Property, PropertyStatus
 from .location import Location
 from .room_specification import RoomSpecification
 from .project_construction_spec import ProjectConstructionSpec
@@ -15,15 +15,19 @@ from .project_media import ProjectMedia
 from .nearby_category import NearbyCategory
 from .nearby_place import NearbyPlace
 from .project_nearby import ProjectNearby
+from .property_search_doc import PropertySearchDoc
+from .project_place_distance import ProjectPlaceDistance
 
 __all__ = [
     "Base",
+    "ViewBase",
     "TimestampMixin",
     "Amenity",
     "ProjectAmenity",
     "Project",
     "ProjectLocation",
     "Property",
+    "PropertyStatus",
     "Location",
     "RoomSpecification",
     "ProjectConstructionSpec",
@@ -34,5 +38,7 @@ __all__ = [
     "ProjectMedia",
     "NearbyCategory",
     "NearbyPlace",
-    "ProjectNearby"
+    "ProjectNearby",
+    "PropertySearchDoc",
+    "ProjectPlaceDistance"
 ]
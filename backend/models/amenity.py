@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean
-from sqlalchemy.orm import relationship
-from .base import Base, TimestampMixin
+from sqlalchemy import Column, Integer, SmallInteger, String, Boolean, Computed
+from sqlalchemy.orm import relationship, deferred
+from .base import Base, TimestampMixin, USE_TRIGRAM_LOOKUPS, USE_AMENITY_BITSET
 
 class Amenity(Base, TimestampMixin):
     __tablename__ = "amenities"
@@ -8,6 +8,10 @@ class Amenity(Base, TimestampMixin):
     id = Column(String, primary_key=True, index=True)  # UUID as string
     name = Column(String(100), unique=True, nullable=False)
     category = Column(String(50), nullable=False)  # basic, luxury, security, recreation
+    if USE_AMENITY_BITSET:
+        bit_index = deferred(Column(SmallInteger, unique=True))  # Bit in projects.amenity_mask (database/amenity_bitset.sql)
+    if USE_TRIGRAM_LOOKUPS:
+        name_lc = deferred(Column(String(100), Computed("lower(name)")))  # Lookup column (database/trigram_indexes.sql)
     # icon = Column(String(100))  # Commented out as database doesn't have this field
     # is_active = Column(Boolean, default=True)  # Commented out as database doesn't have this field
     
@@ -1,9 +1,23 @@
+import os
+
 from sqlalchemy import Column, Integer, DateTime
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 
 Base = declarative_base()
 
+# Read-only mappings of database-maintained relations (materialized views, trigger-maintained tables) -
+# kept off Base so create_all() never creates them
+ViewBase = declarative_base()
+
+# Columns added by the optional migrations in database/ are only mapped when their feature is on: with
+# eager_defaults, computed and server-default columns are fetched back on every INSERT, which fails
+# against a schema the migration has not been applied to
+USE_TRIGRAM_LOOKUPS = os.getenv("USE_TRIGRAM_LOOKUPS", "false").strip().lower() in ("1", "true", "yes", "on")  # database/trigram_indexes.sql
+USE_AMENITY_BITSET = os.getenv("USE_AMENITY_BITSET", "false").strip().lower() in ("1", "true", "yes", "on")  # database/amenity_bitset.sql
+USE_GEO_INDEX = os.getenv("USE_GEO_INDEX", "false").strip().lower() in ("1", "true", "yes", "on")  # database/geo_coordinates.sql
+USE_STATUS_CODE = os.getenv("USE_STATUS_CODE", "false").strip().lower() in ("1", "true", "yes", "on")  # database/property_status.sql
+
 class TimestampMixin:
     """Mixin to add created_at and updated_at timestamps to models"""
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Boolean, Numeric
-from sqlalchemy.orm import relationship
-from .base import Base, TimestampMixin
+from sqlalchemy import Column, String, Boolean, Numeric, Float, Computed
+from sqlalchemy.orm import relationship, deferred
+from .base import Base, TimestampMixin, USE_TRIGRAM_LOOKUPS, USE_GEO_INDEX
 
 class Location(Base, TimestampMixin):
     """Location model mapping to the locations table"""
@@ -17,6 +17,16 @@ class Location(Base, TimestampMixin):
     railway_station_distance_km = Column(Numeric(6, 2), nullable=True)
     bus_stand_distance_km = Column(Numeric(6, 2), nullable=True)
     
+    # Lowercase lookup columns (database/trigram_indexes.sql) - deferred so plain loads never select them
+    if USE_TRIGRAM_LOOKUPS:
+        city_lc = deferred(Column(String(100), Computed("lower(city)")))
+        locality_lc = deferred(Column(String(255), Computed("lower(locality)")))
+    
+    # WGS84 coordinates (database/geo_coordinates.sql)
+    if USE_GEO_INDEX:
+        latitude = deferred(Column(Float, nullable=True))
+        longitude = deferred(Column(Float, nullable=True))
+    
     # Relationships
     project_locations = relationship("ProjectLocation", back_populates="location")
     
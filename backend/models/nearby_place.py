@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, Boolean, Text, ForeignKey, Numeric
+from sqlalchemy import Column, String, Boolean, Text, ForeignKey, Numeric, Float, Computed
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
-from .base import Base, TimestampMixin
+from sqlalchemy.orm import relationship, deferred
+from .base import Base, TimestampMixin, USE_TRIGRAM_LOOKUPS, USE_GEO_INDEX
 
 class NearbyPlace(Base, TimestampMixin):
     __tablename__ = "nearby_places"
@@ -13,6 +13,16 @@ class NearbyPlace(Base, TimestampMixin):
     distance_km = Column(Numeric(5, 2))
     walking_distance = Column(Boolean, default=False)
     
+    # Lowercase lookup columns (database/trigram_indexes.sql)
+    if USE_TRIGRAM_LOOKUPS:
+        place_type_lc = deferred(Column(String(100), Computed("lower(place_type)")))
+        place_name_lc = deferred(Column(String(200), Computed("lower(place_name)")))
+    
+    # WGS84 coordinates (database/geo_coordinates.sql)
+    if USE_GEO_INDEX:
+        latitude = deferred(Column(Float, nullable=True))
+        longitude = deferred(Column(Float, nullable=True))
+    
     # Relationships
     project = relationship("Project", back_populates="nearby_places")
     project_nearby = relationship("ProjectNearby", back_populates="nearby_place", cascade="all, delete-orphan")
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text
-from sqlalchemy.orm import relationship
-from .base import Base, TimestampMixin
+from sqlalchemy import Column, String, Integer, BigInteger, Boolean, DateTime, Float, ForeignKey, Text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import relationship, deferred
+from .base import Base, TimestampMixin, USE_AMENITY_BITSET, USE_GEO_INDEX
 
 class Project(Base, TimestampMixin):
     __tablename__ = "projects"
@@ -16,6 +17,13 @@ class Project(Base, TimestampMixin):
     description = Column(Text)
     project_type = Column(String(50))  # residential, commercial, mixed
     video_url = Column(String(500), nullable=True)  # URL for project video
+    # Amenity bitset maintained by database/amenity_bitset.sql (64-bit words, see services/amenity_bits.py)
+    if USE_AMENITY_BITSET:
+        amenity_mask = deferred(Column(ARRAY(BigInteger), nullable=False, server_default="{}"))
+    # WGS84 coordinates (database/geo_coordinates.sql); NULL means "use the location's"
+    if USE_GEO_INDEX:
+        latitude = deferred(Column(Float, nullable=True))
+        longitude = deferred(Column(Float, nullable=True))
     
     # Relationships
     properties = relationship("Property", back_populates="project", cascade="all, delete-orphan")
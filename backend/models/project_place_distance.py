@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, Numeric
+from .base import ViewBase
+
+class ProjectPlaceDistance(ViewBase):
+    """Nearest nearby place per (project, place type[, place name]) - maintained by database/project_place_distances.sql"""
+    __tablename__ = "project_place_distances"
+    
+    project_id = Column(String, primary_key=True)
+    place_type_lc = Column(String(100), primary_key=True)
+    place_name_lc = Column(String(200), primary_key=True)  # '' = nearest place of the type, any name
+    min_distance_km = Column(Numeric(5, 2))
+    
+    def __repr__(self):
+        return f"<ProjectPlaceDistance(project_id={self.project_id}, type='{self.place_type_lc}', name='{self.place_name_lc}', km={self.min_distance_km})>"
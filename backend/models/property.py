@@ -1,6 +1,22 @@
-from sqlalchemy import Column, String, Numeric, Integer, ForeignKey
-from sqlalchemy.orm import relationship
-from .base import Base, TimestampMixin
+from enum import IntEnum
+
+from sqlalchemy import Column, String, Numeric, Integer, SmallInteger, ForeignKey, Computed
+from sqlalchemy.orm import relationship, deferred
+from .base import Base, TimestampMixin, USE_TRIGRAM_LOOKUPS, USE_STATUS_CODE
+
+class PropertyStatus(IntEnum):
+    """Normalized properties.status_code values"""
+    AVAILABLE = 1
+    BOOKED = 2  # Booked / reserved / on hold - still listed
+    SOLD = 3
+
+# Derives status_code from the free-text status; kept in sync with database/property_status.sql
+PROPERTY_STATUS_CODE_SQL = (
+    "CASE "
+    "WHEN lower(status) LIKE '%sold%' THEN 3 "
+    "WHEN lower(status) LIKE '%book%' OR lower(status) LIKE '%reserv%' OR lower(status) LIKE '%hold%' THEN 2 "
+    "ELSE 1 END"
+)
 
 class Property(Base, TimestampMixin):
     """Property model mapping to the properties table"""
@@ -9,12 +25,16 @@ class Property(Base, TimestampMixin):
     id = Column(String, primary_key=True, index=True)  # UUID as string
     project_id = Column(String, ForeignKey("projects.id"), nullable=True)
     property_type = Column(String(100), nullable=True)
+    if USE_TRIGRAM_LOOKUPS:
+        property_type_lc = deferred(Column(String(100), Computed("lower(property_type)")))  # Lookup column (database/trigram_indexes.sql)
     bhk_count = Column(Numeric(3, 1), nullable=True)  # 1.0, 2.0, 3.5, etc.
     carpet_area_sqft = Column(Numeric(8, 2), nullable=True)
     super_builtup_area_sqft = Column(Numeric(8, 2), nullable=True)
     floor_number = Column(Integer, nullable=True)
     facing = Column(String(50), nullable=True)
     status = Column(String(50), nullable=True)
+    if USE_STATUS_CODE:
+        status_code = deferred(Column(SmallInteger, Computed(PROPERTY_STATUS_CODE_SQL), nullable=False))  # PropertyStatus (database/property_status.sql)
     sell_price = Column(Numeric(15, 2), nullable=False, index=True)
     floor_plan_url = Column(String(500), nullable=True)  # URL for floor plan image
     
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, Numeric, Integer, SmallInteger, Boolean, ARRAY
+from sqlalchemy.dialects.postgresql import JSONB
+from .base import ViewBase
+
+class PropertySearchDoc(ViewBase):
+    """Read-only mapping of the property_search_doc materialized view (database/property_search_doc.sql)"""
+    __tablename__ = "property_search_doc"
+    
+    property_id = Column(String, primary_key=True)
+    location_id = Column(String, primary_key=True)
+    project_id = Column(String, nullable=False)
+    city_lc = Column(String)
+    locality_lc = Column(String)
+    project_status_code = Column(SmallInteger)  # 1 ready to move, 2 under construction, 3 completed, 0 other
+    is_sold = Column(Boolean)
+    property_type_lc = Column(String)
+    bhk_count = Column(Numeric(3, 1))
+    sell_price = Column(Numeric(15, 2))
+    carpet_area_sqft = Column(Numeric(8, 2))
+    price_per_sqft = Column(Numeric)
+    amenity_ids = Column(ARRAY(String))
+    amenity_names_lc = Column(String)  # '|'-joined lower-cased amenity names
+    nearby_min_km = Column(JSONB)  # Lower-cased place type -> minimum distance in km
+    balcony_count = Column(Integer)
+    feature_tags_lc = Column(String)  # '|'-joined lower-cased room features
+    primary_image = Column(String)
+    media_count = Column(Integer)
+    
+    def __repr__(self):
+        return f"<PropertySearchDoc(property_id={self.property_id}, city='{self.city_lc}', price={self.sell_price})>"
@@ -0,0 +1,110 @@
+"""
+Amenity Bitsets
+Amenity name -> bit catalogue and the word masks behind "with gym and pool" (ALL) / "gym or pool" (ANY) filters
+"""
+
+import asyncio
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+
+from database import SessionLocal
+from models.amenity import Amenity
+from models.base import USE_AMENITY_BITSET
+
+# USE_AMENITY_BITSET requires database/amenity_bitset.sql; when off, amenity filters use EXISTS over
+# project_amenities and the bitset columns are not mapped
+
+WORD_BITS = 64
+
+# {word index: bits} - a set of amenities spread over 64-bit words
+WordMask = Dict[int, int]
+
+def bits_containing(bit_by_name: Dict[str, int], term: str) -> List[int]:
+    """Bits of the amenities whose name contains the term (ILIKE '%term%')"""
+    term = term.lower()
+    return [bit for name, bit in bit_by_name.items() if term in name]
+
+def word_mask(bits: Iterable[int]) -> WordMask:
+    mask: WordMask = {}
+    for bit in bits:
+        mask[bit // WORD_BITS] = mask.get(bit // WORD_BITS, 0) | (1 << (bit % WORD_BITS))
+    return mask
+
+def amenity_masks(bit_by_name: Dict[str, int], terms: Iterable[str], match_all: bool) -> Optional[Tuple[WordMask, List[WordMask]]]:
+    """Masks a project's amenity bitset has to satisfy, as ``(all_of, any_of)``.
+
+    Every bit of ``all_of`` must be set, and each mask in ``any_of`` must
+    share at least one bit. A term naming exactly one amenity goes into
+    ``all_of`` (so an ALL query over distinct amenities is a single mask
+    test); a term that several amenities contain ("pool" -> swimming pool,
+    kids pool) becomes an ``any_of`` group. Returns None when nothing can
+    match.
+    """
+    term_bits = [bits_containing(bit_by_name, term) for term in terms]
+    if not match_all:
+        bits = [bit for matched in term_bits for bit in matched]
+        return ({}, [word_mask(bits)]) if bits else None
+
+    if any(not matched for matched in term_bits):
+        return None
+    all_of = word_mask(matched[0] for matched in term_bits if len(matched) == 1)
+    any_of = [word_mask(matched) for matched in term_bits if len(matched) > 1]
+    return all_of, any_of
+
+def _signed(word: int) -> int:
+    """uint64 word as the BIGINT Postgres stores"""
+    return word - (1 << 64) if word >= 1 << 63 else word
+
+def amenity_mask_condition(mask_column, all_of: WordMask, any_of: List[WordMask]):
+    """SQL test of ``mask_column`` (BIGINT[], 1-based words) against amenity_masks() output"""
+    conditions = [
+        mask_column[word + 1].op("&")(_signed(bits)) == _signed(bits)
+        for word, bits in sorted(all_of.items())
+    ]
+    for group in any_of:
+        conditions.append(or_(*[
+            mask_column[word + 1].op("&")(_signed(bits)) != 0
+            for word, bits in sorted(group.items())
+        ]))
+    return and_(*conditions)
+
+class AmenityCatalog:
+    """Lower-cased amenity name -> bit_index, refreshed in the background"""
+
+    def __init__(self, session_factory=SessionLocal, interval_seconds: int = 300):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.bit_by_name: Optional[Dict[str, int]] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.bit_by_name is not None
+
+    def masks(self, terms: Iterable[str], match_all: bool) -> Optional[Tuple[WordMask, List[WordMask]]]:
+        return amenity_masks(self.bit_by_name or {}, terms, match_all)
+
+    def refresh(self) -> bool:
+        """Reload the catalogue; returns True if it changed"""
+        db = self.session_factory()
+        try:
+            rows = db.execute(select(Amenity.name, Amenity.bit_index).where(Amenity.bit_index.isnot(None))).all()
+        finally:
+            db.close()
+        bit_by_name = {name.lower(): bit_index for name, bit_index in rows}
+        changed = bit_by_name != self.bit_by_name
+        self.bit_by_name = bit_by_name
+        return changed
+
+    async def run(self):
+        """Refresh forever on a worker thread so requests are never blocked"""
+        while True:
+            try:
+                if await asyncio.to_thread(self.refresh):
+                    print(f"✅ Amenity catalogue loaded: {len(self.bit_by_name)} amenities")
+            except Exception as e:
+                print(f"⚠️ Amenity catalogue refresh failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+amenity_catalog = AmenityCatalog(interval_seconds=int(os.getenv("AMENITY_CATALOG_REFRESH_SECONDS", "300")))
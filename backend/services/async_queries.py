@@ -0,0 +1,88 @@
+"""
+Async Queries
+asyncpg counterparts of the blocking helpers in search_queries, running the same select() statements
+"""
+
+import asyncio
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .search_queries import (
+    SEARCH_RESULT_LIMIT,
+    build_search_statement,
+    build_filtered_statement,
+    keyed_search_statement,
+    result_keys,
+    result_cache_key,
+    page_cursor,
+    indexed_total,
+    indexed_facet_counts,
+    search_page_info,
+    media_summary_statement,
+    media_summaries_from_rows,
+    nlp_search_response,
+    result_project_ids,
+    project_configurations_statement,
+    project_configurations_response,
+    project_nearby_places_statement,
+    project_nearby_places_response,
+    project_media_statement,
+    project_media_response,
+)
+from .result_cache import result_cache
+from .pagination import approximate_count
+from . import facets
+
+async def _cache_call(method, *args):
+    """Call a result cache method, off the event loop when the backend does network I/O"""
+    if result_cache.blocking:
+        return await asyncio.to_thread(method, *args)
+    return method(*args)
+
+async def execute_nlp_search(db: AsyncSession, plan, position: Optional[Tuple] = None, limit: int = SEARCH_RESULT_LIMIT,
+                             include_total: bool = False, sort: str = "price", include_facets: bool = False) -> Dict[str, Any]:
+    """Run the database search for a parsed query and format one page of the response"""
+    if result_cache is None:
+        rows = (await db.execute(build_search_statement(plan, position, limit, sort))).all()
+    else:
+        cache_key = result_cache_key(plan, position, limit, sort)
+        generation = await _cache_call(lambda: result_cache.generation)
+        keys = await _cache_call(result_cache.get, cache_key)
+        if keys is not None:
+            rows = (await db.execute(keyed_search_statement(keys, sort == "relevance"))).all()
+        else:
+            rows = (await db.execute(build_search_statement(plan, position, limit, sort))).all()
+            await _cache_call(result_cache.put, cache_key, result_keys(rows), generation)
+    rows, has_more, next_cursor = page_cursor(rows, limit, sort)
+    
+    project_ids = result_project_ids(rows)
+    media_by_project = {}
+    if project_ids:
+        media_by_project = media_summaries_from_rows((await db.execute(media_summary_statement(project_ids))).all())
+    
+    approximate_total = None
+    if include_total:
+        approximate_total = indexed_total(plan)
+        if approximate_total is None:
+            approximate_total = await db.run_sync(approximate_count, build_filtered_statement(plan))
+    
+    response = nlp_search_response(plan, rows, media_by_project, search_page_info(sort, limit, has_more, next_cursor, approximate_total))
+    if include_facets:
+        counts = indexed_facet_counts(plan)
+        if counts is None:
+            counts = facets.counts_from_rows((await db.execute(facets.facet_statement(build_filtered_statement(plan)))).all())
+        response["facets"] = facets.format_facets(counts)
+    return response
+
+async def project_configurations(db: AsyncSession, project_id: str) -> Dict[str, Any]:
+    result = await db.execute(project_configurations_statement(project_id))
+    return project_configurations_response(project_id, result.scalars().all())
+
+async def project_nearby_places(db: AsyncSession, project_id: str) -> Dict[str, Any]:
+    result = await db.execute(project_nearby_places_statement(project_id))
+    return project_nearby_places_response(project_id, result.scalars().all())
+
+async def project_media(db: AsyncSession, project_id: str) -> Dict[str, Any]:
+    result = await db.execute(project_media_statement(project_id))
+    return project_media_response(project_id, result.scalars().all())
@@ -0,0 +1,193 @@
+"""
+Nearby Distance Builder
+Vectorized project x landmark haversine distances, bulk-upserted into nearby_places in one transaction
+"""
+
+import csv
+import uuid
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from models.project import Project
+from models.project_location import ProjectLocation
+from models.location import Location
+from models.nearby_place import NearbyPlace
+
+from .geo_index import EARTH_RADIUS_KM
+from .result_cache import mark_search_data_changed
+
+DEFAULT_CUTOFF_KM = 5.0
+
+# Farther-reaching place types keep longer links; keys are lower-cased place types
+CUTOFF_KM_BY_TYPE = {
+    "airport": 30.0,
+    "railway station": 10.0,
+    "it park": 10.0,
+    "college": 8.0,
+    "hospital": 6.0,
+    "mall": 6.0,
+    "metro station": 5.0,
+    "school": 4.0,
+    "bus stop": 2.0,
+    "market": 3.0,
+}
+
+WALKING_DISTANCE_KM = 1.5
+CHUNK_ROWS = 2048  # Projects per distance block, bounds memory at CHUNK_ROWS x landmarks
+
+class Landmark(NamedTuple):
+    name: str
+    place_type: str
+    latitude: float
+    longitude: float
+    city: Optional[str] = None
+
+def load_landmarks(path: str) -> List[Landmark]:
+    """Read landmarks from a CSV with name, place_type, latitude, longitude and optional city columns"""
+    with open(path, newline="", encoding="utf-8") as f:
+        return [
+            Landmark(
+                name=row["name"].strip(),
+                place_type=row["place_type"].strip(),
+                latitude=float(row["latitude"]),
+                longitude=float(row["longitude"]),
+                city=(row.get("city") or "").strip() or None
+            )
+            for row in csv.DictReader(f)
+        ]
+
+def load_project_points(db: Session, city: Optional[str] = None) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Ids and coordinates of projects with a known position (their own, else their location's)"""
+    statement = (
+        select(
+            Project.id,
+            func.coalesce(Project.latitude, func.min(Location.latitude)),
+            func.coalesce(Project.longitude, func.min(Location.longitude))
+        )
+        .join(ProjectLocation, ProjectLocation.project_id == Project.id)
+        .join(Location, Location.id == ProjectLocation.location_id)
+        .group_by(Project.id, Project.latitude, Project.longitude)
+    )
+    if city:
+        statement = statement.where(func.lower(Location.city) == city.lower())
+    rows = [row for row in db.execute(statement).all() if row[1] is not None and row[2] is not None]
+    return (
+        [str(project_id) for project_id, _, _ in rows],
+        np.array([latitude for _, latitude, _ in rows], dtype=np.float64),
+        np.array([longitude for _, _, longitude in rows], dtype=np.float64)
+    )
+
+def distance_matrix_km(lat1: np.ndarray, lng1: np.ndarray, lat2: np.ndarray, lng2: np.ndarray) -> np.ndarray:
+    """Haversine distances between every point of set 1 (rows) and set 2 (columns)"""
+    lat1, lng1, lat2, lng2 = (np.radians(values) for values in (lat1, lng1, lat2, lng2))
+    dlat = lat2[np.newaxis, :] - lat1[:, np.newaxis]
+    dlng = lng2[np.newaxis, :] - lng1[:, np.newaxis]
+    h = np.sin(dlat / 2) ** 2 + np.cos(lat1)[:, np.newaxis] * np.cos(lat2)[np.newaxis, :] * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+def nearby_pairs(project_ids: List[str], project_lat: np.ndarray, project_lng: np.ndarray, landmarks: List[Landmark],
+                 cutoffs: Optional[Dict[str, float]] = None) -> List[Tuple[str, int, float]]:
+    """(project id, landmark index, distance km) for every pair within its place type's cutoff"""
+    if not project_ids or not landmarks:
+        return []
+    cutoffs = {**CUTOFF_KM_BY_TYPE, **{k.lower(): v for k, v in (cutoffs or {}).items()}}
+    landmark_lat = np.array([landmark.latitude for landmark in landmarks], dtype=np.float64)
+    landmark_lng = np.array([landmark.longitude for landmark in landmarks], dtype=np.float64)
+    landmark_cutoff = np.array([cutoffs.get(landmark.place_type.lower(), DEFAULT_CUTOFF_KM) for landmark in landmarks])
+
+    pairs = []
+    for start in range(0, len(project_ids), CHUNK_ROWS):
+        distances = distance_matrix_km(
+            project_lat[start:start + CHUNK_ROWS], project_lng[start:start + CHUNK_ROWS], landmark_lat, landmark_lng
+        )
+        rows, columns = np.nonzero(distances <= landmark_cutoff[np.newaxis, :])
+        pairs.extend(
+            (project_ids[start + row], int(column), float(distances[row, column]))
+            for row, column in zip(rows, columns)
+        )
+    return pairs
+
+def upsert_nearby_places(db: Session, project_ids: Iterable[str], landmarks: List[Landmark],
+                         pairs: List[Tuple[str, int, float]]) -> Tuple[int, int]:
+    """Write pairs into nearby_places and drop links of these projects to these landmarks that fell out of range.
+
+    Rows for landmarks not in ``landmarks`` (e.g. manually entered ones) are
+    left alone. Runs in the caller's transaction; returns (upserted, deleted).
+    """
+    # Landmarks sharing a type and name (e.g. the same mall name in two cities) map to one
+    # (project_id, place_type, place_name) row; keep the nearest. A multi-row ON CONFLICT
+    # DO UPDATE fails if it touches the same row twice.
+    nearest: Dict[Tuple[str, str, str], Tuple[str, int, float]] = {}
+    for project_id, index, distance in pairs:
+        key = (project_id, landmarks[index].place_type, landmarks[index].name)
+        if key not in nearest or distance < nearest[key][2]:
+            nearest[key] = (project_id, index, distance)
+
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "project_id": uuid.UUID(project_id),
+            "place_type": landmarks[index].place_type,
+            "place_name": landmarks[index].name,
+            "distance_km": round(distance, 2),
+            "walking_distance": distance <= WALKING_DISTANCE_KM,
+            "latitude": landmarks[index].latitude,
+            "longitude": landmarks[index].longitude
+        }
+        for project_id, index, distance in nearest.values()
+    ]
+    if rows:
+        statement = insert(NearbyPlace.__table__)
+        statement = statement.on_conflict_do_update(
+            index_elements=["project_id", "place_type", "place_name"],
+            set_={
+                "distance_km": statement.excluded.distance_km,
+                "walking_distance": statement.excluded.walking_distance,
+                "latitude": statement.excluded.latitude,
+                "longitude": statement.excluded.longitude,
+                "updated_at": func.now()
+            }
+        )
+        # executemany - SQLAlchemy batches this into multi-row INSERTs
+        db.execute(statement, rows)
+
+    # Links to the same landmarks that are no longer within their cutoff
+    kept = {(row["project_id"], row["place_type"], row["place_name"]) for row in rows}
+    project_uuids = [uuid.UUID(project_id) for project_id in project_ids]
+    landmark_keys = {(landmark.place_type, landmark.name) for landmark in landmarks}
+    deleted = 0
+    if project_uuids and landmark_keys:
+        stale = db.execute(
+            select(NearbyPlace.project_id, NearbyPlace.place_type, NearbyPlace.place_name).where(
+                NearbyPlace.project_id.in_(project_uuids),
+                tuple_(NearbyPlace.place_type, NearbyPlace.place_name).in_(landmark_keys)
+            )
+        ).all()
+        stale = [tuple(row) for row in stale if tuple(row) not in kept]
+        if stale:
+            deleted = db.execute(
+                delete(NearbyPlace).where(tuple_(NearbyPlace.project_id, NearbyPlace.place_type, NearbyPlace.place_name).in_(stale))
+            ).rowcount
+    return len(rows), deleted
+
+def rebuild_nearby_places(db: Session, landmarks: List[Landmark], city: Optional[str] = None,
+                          cutoffs: Optional[Dict[str, float]] = None) -> Dict[str, int]:
+    """Recompute and store nearby places for every positioned project (of one city) in one transaction"""
+    if city:
+        landmarks = [landmark for landmark in landmarks if landmark.city is None or landmark.city.lower() == city.lower()]
+    project_ids, project_lat, project_lng = load_project_points(db, city)
+    pairs = nearby_pairs(project_ids, project_lat, project_lng, landmarks, cutoffs)
+    try:
+        upserted, deleted = upsert_nearby_places(db, project_ids, landmarks, pairs)
+        # Cached API search results read nearby_places; invalidate them with this commit
+        if not mark_search_data_changed(db):
+            print("⚠️ search_data_version is missing, API result caches expire on their TTL only")
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return {"projects": len(project_ids), "landmarks": len(landmarks), "upserted": upserted, "deleted": deleted}
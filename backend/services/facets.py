@@ -0,0 +1,91 @@
+"""
+Search Facets
+Per-BHK, price band, locality, project status and amenity counts over the NLP search matches, in one grouped pass
+"""
+
+import os
+from typing import Any, Dict, List
+
+from sqlalchemy import case, distinct, func, select
+
+from models.project import Project
+from models.property import Property
+from models.location import Location
+from models.amenity import Amenity
+from models.project_amenity import ProjectAmenity
+
+from .search_doc import PROJECT_STATUS_CODES, project_status_code_expression
+
+# Values returned per facet (most frequent first); BHK and price bands keep their natural order
+FACET_LIMIT = int(os.getenv("NLP_FACET_LIMIT", "20"))
+
+FACETS = ("bhk", "price_band", "locality", "project_status", "amenity")
+
+# (upper bound exclusive, label); the last band is open-ended
+PRICE_BANDS = [
+    (5_000_000, "Under 50 L"),
+    (10_000_000, "50 L - 1 Cr"),
+    (20_000_000, "1 - 2 Cr"),
+    (50_000_000, "2 - 5 Cr"),
+    (None, "Above 5 Cr"),
+]
+
+PROJECT_STATUS_NAMES = {code: name for name, code in PROJECT_STATUS_CODES.items()}
+OTHER_PROJECT_STATUS = "other"
+
+def price_band_expression(price_column):
+    """Index into PRICE_BANDS"""
+    return case(
+        *[(price_column < upper, band) for band, (upper, _) in enumerate(PRICE_BANDS) if upper is not None],
+        else_=len(PRICE_BANDS) - 1
+    )
+
+def facet_statement(filtered_statement):
+    """Counts of distinct matching properties per facet value, as one GROUPING SETS query.
+
+    ``filtered_statement`` is the unpaged search (a select of Property,
+    Project, Location). Joining amenities fans rows out, so every set counts
+    DISTINCT property ids; GROUPING() tells which set a row belongs to.
+    """
+    candidates = filtered_statement.with_only_columns(
+        Property.id.label("property_id"),
+        Property.project_id.label("project_id"),
+        Property.bhk_count.label("bhk"),
+        price_band_expression(Property.sell_price).label("price_band"),
+        func.lower(Location.locality).label("locality"),
+        project_status_code_expression(Project.project_status).label("project_status")
+    ).subquery("candidates")
+    amenity = func.lower(Amenity.name).label("amenity")
+    columns = [candidates.c.bhk, candidates.c.price_band, candidates.c.locality, candidates.c.project_status, amenity]
+    return (
+        select(func.grouping(*columns).label("grouping"), *columns, func.count(distinct(candidates.c.property_id)))
+        .select_from(candidates)
+        .outerjoin(ProjectAmenity, ProjectAmenity.project_id == candidates.c.project_id)
+        .outerjoin(Amenity, Amenity.id == ProjectAmenity.amenity_id)
+        .group_by(func.grouping_sets(*columns))
+    )
+
+def counts_from_rows(rows) -> Dict[str, Dict[Any, int]]:
+    """facet -> {value: count} from facet_statement rows (NULL values dropped)"""
+    counts: Dict[str, Dict[Any, int]] = {facet: {} for facet in FACETS}
+    for grouping, *values, count in rows:
+        # GROUPING() sets one bit per column not in the row's set, first column highest
+        index = next(i for i in range(len(FACETS)) if not grouping & (1 << (len(FACETS) - 1 - i)))
+        value = values[index]
+        if value is not None:
+            counts[FACETS[index]][value] = count
+    return counts
+
+def format_facets(counts: Dict[str, Dict[Any, int]], limit: int = FACET_LIMIT) -> Dict[str, List[Dict[str, Any]]]:
+    """Response shape: facet -> [{"value", "count"}], capped at ``limit`` values per facet"""
+    facets = {}
+    bhk = sorted(counts["bhk"].items(), key=lambda item: float(item[0]))
+    facets["bhk"] = [{"value": float(value), "count": count} for value, count in bhk[:limit]]
+    bands = sorted(counts["price_band"].items())
+    facets["price_band"] = [{"value": PRICE_BANDS[int(band)][1], "count": count} for band, count in bands]
+    for facet in ("locality", "project_status", "amenity"):
+        top = sorted(counts[facet].items(), key=lambda item: (-item[1], str(item[0])))[:limit]
+        if facet == "project_status":
+            top = [(PROJECT_STATUS_NAMES.get(int(code), OTHER_PROJECT_STATUS), count) for code, count in top]
+        facets[facet] = [{"value": value, "count": count} for value, count in top]
+    return facets
@@ -0,0 +1,139 @@
+"""
+Gazetteer Matcher
+Aho-Corasick multi-pattern matcher for cities, localities, nearby places and keywords
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+@dataclass(frozen=True)
+class GazetteerHit:
+    """A single gazetteer term found in the scanned text"""
+    term: str
+    category: str
+    start: int
+    end: int
+    priority: int  # Registration order of the term within its category
+
+class GazetteerMatches:
+    """All gazetteer hits for one scanned text, grouped by category"""
+
+    def __init__(self, hits: List[GazetteerHit]):
+        self.hits = hits
+        self._by_category: Dict[str, List[GazetteerHit]] = {}
+        for hit in hits:
+            self._by_category.setdefault(hit.category, []).append(hit)
+
+    def has(self, category: str) -> bool:
+        """True if any term of the category occurs in the text"""
+        return category in self._by_category
+
+    def terms(self, category: str) -> List[str]:
+        """Distinct terms of the category found in the text"""
+        return list({hit.term: None for hit in self._by_category.get(category, [])})
+
+    def first_occurrences(self, category: str) -> List[GazetteerHit]:
+        """First occurrence of every matched term, ordered by term priority.
+
+        Mirrors iterating the source term list in order and calling
+        ``text.find(term)`` for each term that is present.
+        """
+        first: Dict[str, GazetteerHit] = {}
+        for hit in self._by_category.get(category, []):
+            current = first.get(hit.term)
+            if current is None or hit.start < current.start:
+                first[hit.term] = hit
+        return sorted(first.values(), key=lambda hit: hit.priority)
+
+class Gazetteer:
+    """Aho-Corasick automaton over (term, category) pairs.
+
+    Terms are registered with ``add``/``add_all`` and compiled once with
+    ``build``; ``scan`` then reports every occurrence of every term (including
+    overlapping ones) in a single pass over the text. Matching is plain
+    substring matching on the already lower-cased text, the same semantics as
+    ``term in text_lower``.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str, int]]] = [[]]
+        self._priorities: Dict[Tuple[str, str], int] = {}
+        self._category_sizes: Dict[str, int] = {}
+        self._built = False
+
+    def __len__(self) -> int:
+        return len(self._priorities)
+
+    def add(self, term: str, category: str) -> None:
+        """Register a term under a category (duplicates keep their first priority)"""
+        term = term.lower()
+        if not term or (term, category) in self._priorities:
+            return
+
+        priority = self._category_sizes.get(category, 0)
+        self._category_sizes[category] = priority + 1
+        self._priorities[(term, category)] = priority
+
+        node = 0
+        for char in term:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append((term, category, priority))
+        self._built = False
+
+    def add_all(self, terms: Iterable[str], category: str) -> None:
+        """Register several terms under the same category, in order"""
+        for term in terms:
+            self.add(term, category)
+
+    def build(self) -> "Gazetteer":
+        """Compute failure links; must be called after the last ``add``"""
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit matches that end at the failure state
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+        self._built = True
+        return self
+
+    def scan(self, text_lower: str, categories: Optional[Iterable[str]] = None) -> GazetteerMatches:
+        """Return every gazetteer hit in the text in one O(n + hits) pass"""
+        if not self._built:
+            self.build()
+
+        wanted = set(categories) if categories is not None else None
+        goto, fail, output = self._goto, self._fail, self._output
+        hits = []
+        node = 0
+
+        for index, char in enumerate(text_lower):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for term, category, priority in output[node]:
+                if wanted is None or category in wanted:
+                    end = index + 1
+                    hits.append(GazetteerHit(term, category, end - len(term), end, priority))
+
+        return GazetteerMatches(hits)
@@ -0,0 +1,121 @@
+"""
+Gazetteer Refresh Service
+Keeps the NLP engine's location dictionary in sync with the locations and nearby_places tables
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import exists, func, or_, select
+
+from database import SessionLocal
+from models.location import Location
+from models.nearby_place import NearbyPlace
+from models.project_location import ProjectLocation
+
+class GazetteerRefresher:
+    """Loads cities, localities and nearby place names from the database into the NLP engine.
+
+    The first refresh loads everything; later refreshes only fetch rows whose
+    ``updated_at`` is within ``overlap_seconds`` of the newest one seen so far,
+    with one watermark per table (locations, project links, nearby places).
+    ``updated_at`` is the writing transaction's start time, so a row can commit
+    after newer-stamped ones; the overlap window re-reads those instead of
+    skipping them. Every ``full_reload_every`` cycles a full reload runs so
+    deleted rows drop out of the dictionary. Only locations linked to at least
+    one project are loaded, so the matcher holds localities we actually have
+    inventory in.
+    """
+
+    def __init__(self, nlp_engine, session_factory=SessionLocal, interval_seconds: int = 300, full_reload_every: int = 12,
+                 on_change: Optional[Callable[[], None]] = None, overlap_seconds: Optional[float] = None):
+        self.nlp_engine = nlp_engine
+        self.on_change = on_change  # Called after the engine's dictionary was replaced
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.full_reload_every = max(full_reload_every, 1)
+        # Defaults to one refresh interval
+        self.overlap = timedelta(seconds=interval_seconds if overlap_seconds is None else overlap_seconds)
+
+        self._locations: Dict[str, Tuple[str, Optional[str]]] = {}  # location id -> (city, locality)
+        self._places: Dict[str, Tuple[str, str]] = {}  # nearby place id -> (place_name, place_type)
+        self._location_watermark: Optional[datetime] = None
+        self._link_watermark: Optional[datetime] = None
+        self._place_watermark: Optional[datetime] = None
+        self._cycles = 0
+
+    def refresh(self) -> bool:
+        """Pull changed rows and rebuild the engine's gazetteer; returns True if anything changed"""
+        full_reload = self._location_watermark is None or self._cycles % self.full_reload_every == 0
+        self._cycles += 1
+
+        db = self.session_factory()
+        try:
+            has_project = exists().where(ProjectLocation.location_id == Location.id)
+            linked_at = (
+                select(func.max(ProjectLocation.updated_at))
+                .where(ProjectLocation.location_id == Location.id)
+                .scalar_subquery()
+            )
+            location_query = (
+                db.query(Location.id, Location.city, Location.locality, Location.updated_at, linked_at)
+                .filter(has_project)
+            )
+            place_query = db.query(NearbyPlace.id, NearbyPlace.place_name, NearbyPlace.place_type, NearbyPlace.updated_at)
+
+            if not full_reload:
+                changed_since = Location.updated_at >= self._location_watermark - self.overlap
+                if self._link_watermark is not None:
+                    # A location also counts as changed when a project is newly linked to it
+                    linked_since = exists().where(
+                        ProjectLocation.location_id == Location.id,
+                        ProjectLocation.updated_at >= self._link_watermark - self.overlap
+                    )
+                    changed_since = or_(changed_since, linked_since)
+                location_query = location_query.filter(changed_since)
+                if self._place_watermark is not None:
+                    place_query = place_query.filter(NearbyPlace.updated_at >= self._place_watermark - self.overlap)
+
+            location_rows = location_query.all()
+            place_rows = place_query.all()
+        finally:
+            db.close()
+
+        locations = {} if full_reload else dict(self._locations)
+        for location_id, city, locality, updated_at, linked_at in location_rows:
+            locations[str(location_id)] = (city, locality)
+            if updated_at and (self._location_watermark is None or updated_at > self._location_watermark):
+                self._location_watermark = updated_at
+            if linked_at and (self._link_watermark is None or linked_at > self._link_watermark):
+                self._link_watermark = linked_at
+
+        places = {} if full_reload else dict(self._places)
+        for place_id, place_name, place_type, updated_at in place_rows:
+            places[str(place_id)] = (place_name, place_type)
+            if updated_at and (self._place_watermark is None or updated_at > self._place_watermark):
+                self._place_watermark = updated_at
+
+        changed = locations != self._locations or places != self._places
+        self._locations = locations
+        self._places = places
+
+        if changed and locations:
+            self.nlp_engine.update_locations(
+                cities=[city for city, _ in locations.values()],
+                localities=[locality for _, locality in locations.values() if locality],
+                place_types={name: place_type for name, place_type in places.values()}
+            )
+            if self.on_change:
+                self.on_change()
+        return changed
+
+    async def run(self):
+        """Refresh forever on a worker thread so requests are never blocked"""
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                # Keep serving with the previous dictionary if the database is unavailable
+                print(f"⚠️ Gazetteer refresh failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
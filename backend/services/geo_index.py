@@ -0,0 +1,179 @@
+"""
+Geo Index
+In-process grid over project coordinates for radius searches, plus a gazetteer of named points ("Hinjewadi Phase 1")
+"""
+
+import asyncio
+import math
+import os
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, func, select
+
+from database import SessionLocal
+from models.project import Project
+from models.project_location import ProjectLocation
+from models.location import Location
+from models.nearby_place import NearbyPlace
+from models.base import USE_GEO_INDEX
+
+# USE_GEO_INDEX requires database/geo_coordinates.sql; when off, the coordinate columns are not mapped
+
+EARTH_RADIUS_KM = 6371.0088
+CELL_DEGREES = 0.05  # ~5.5 km cells; a 3 km radius touches at most 3 x 3 of them
+
+class GeoPoint(NamedTuple):
+    latitude: float
+    longitude: float
+
+def haversine_km(a: GeoPoint, b: GeoPoint) -> float:
+    """Great-circle distance in km"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (a.latitude, a.longitude, b.latitude, b.longitude))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+def bounding_box(center: GeoPoint, radius_km: float) -> Tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lng, max_lng) enclosing the circle; never misses a point inside it.
+
+    Degrees come from the same sphere as haversine_km; the longitude span is
+    the circle's widest extent, which lies poleward of the center's latitude.
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    dlat = math.degrees(angle)
+    ratio = math.sin(angle) / max(math.cos(math.radians(center.latitude)), 1e-6)
+    dlng = math.degrees(math.asin(ratio)) if angle < math.pi / 2 and ratio < 1 else 180.0
+    return center.latitude - dlat, center.latitude + dlat, center.longitude - dlng, center.longitude + dlng
+
+def within_radius_sql(latitude_column, longitude_column, center: GeoPoint, radius_km: float):
+    """SQL test of a coordinate pair against a circle: indexable bounding box, then exact haversine"""
+    min_lat, max_lat, min_lng, max_lng = bounding_box(center, radius_km)
+    lat1, lat2 = func.radians(center.latitude), func.radians(latitude_column)
+    h = (
+        func.power(func.sin((lat2 - lat1) / 2), 2)
+        + func.cos(lat1) * func.cos(lat2) * func.power(func.sin((func.radians(longitude_column) - func.radians(center.longitude)) / 2), 2)
+    )
+    return and_(
+        latitude_column.between(min_lat, max_lat),
+        longitude_column.between(min_lng, max_lng),
+        2 * EARTH_RADIUS_KM * func.asin(func.least(1.0, func.sqrt(h))) <= radius_km
+    )
+
+def _cell(point: GeoPoint) -> Tuple[int, int]:
+    return math.floor(point.latitude / CELL_DEGREES), math.floor(point.longitude / CELL_DEGREES)
+
+class GeoGrid:
+    """Fixed-size lat/lng buckets; a radius query scans only the buckets its bounding box covers"""
+
+    def __init__(self, points: Iterable[Tuple[str, GeoPoint]]):
+        self.cells: Dict[Tuple[int, int], List[Tuple[str, GeoPoint]]] = {}
+        self.size = 0
+        for key, point in points:
+            self.cells.setdefault(_cell(point), []).append((key, point))
+            self.size += 1
+
+    def within(self, center: GeoPoint, radius_km: float) -> Dict[str, float]:
+        """key -> distance in km for every point within the radius"""
+        min_lat, max_lat, min_lng, max_lng = bounding_box(center, radius_km)
+        (lat_from, lng_from), (lat_to, lng_to) = _cell(GeoPoint(min_lat, min_lng)), _cell(GeoPoint(max_lat, max_lng))
+        matches = {}
+        for lat_cell in range(lat_from, lat_to + 1):
+            for lng_cell in range(lng_from, lng_to + 1):
+                for key, point in self.cells.get((lat_cell, lng_cell), ()):
+                    distance = haversine_km(center, point)
+                    if distance <= radius_km and distance < matches.get(key, math.inf):
+                        matches[key] = distance
+        return matches
+
+class GeoIndex:
+    """Project coordinates and named points, reloaded in the background.
+
+    Projects without their own coordinates use their location's. Named
+    points are nearby places, localities and project names, so "within 3 km
+    of Hinjewadi Phase 1" works whether or not the place was ever linked to
+    a project in nearby_places.
+    """
+
+    def __init__(self, session_factory=SessionLocal, interval_seconds: int = 600):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.projects: Optional[GeoGrid] = None
+        self.named_points: Dict[str, GeoPoint] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.projects is not None
+
+    def resolve_point(self, name: Optional[str]) -> Optional[GeoPoint]:
+        """Coordinates of a named place: exact name, else the longest known name inside the phrase, else the shortest containing it"""
+        if not name or not self.ready:
+            return None
+        name = name.strip().lower()
+        if name in self.named_points:
+            return self.named_points[name]
+        inside = [known for known in self.named_points if known in name]
+        if inside:
+            return self.named_points[max(inside, key=len)]
+        containing = [known for known in self.named_points if name in known]
+        if containing:
+            return self.named_points[min(containing, key=len)]
+        return None
+
+    def projects_within(self, center: GeoPoint, radius_km: float) -> Dict[str, float]:
+        """project id -> distance in km"""
+        return self.projects.within(center, radius_km) if self.projects else {}
+
+    def refresh(self) -> None:
+        db = self.session_factory()
+        try:
+            location_points = db.execute(
+                select(Location.id, Location.city, Location.locality, Location.latitude, Location.longitude)
+                .where(Location.latitude.isnot(None), Location.longitude.isnot(None))
+            ).all()
+            project_rows = db.execute(select(Project.id, Project.name, Project.latitude, Project.longitude)).all()
+            project_locations = db.execute(
+                select(ProjectLocation.project_id, func.min(ProjectLocation.location_id)).group_by(ProjectLocation.project_id)
+            ).all()
+            place_rows = db.execute(
+                select(NearbyPlace.place_name, NearbyPlace.latitude, NearbyPlace.longitude)
+                .where(NearbyPlace.latitude.isnot(None), NearbyPlace.longitude.isnot(None))
+            ).all()
+        finally:
+            db.close()
+
+        location_by_id = {str(row.id): GeoPoint(row.latitude, row.longitude) for row in location_points}
+        location_of_project = {str(project_id): str(location_id) for project_id, location_id in project_locations}
+
+        project_points = []
+        named_points: Dict[str, GeoPoint] = {}
+        for row in location_points:
+            for name in (row.locality, row.city):
+                if name:
+                    named_points.setdefault(name.lower(), GeoPoint(row.latitude, row.longitude))
+        for place_name, latitude, longitude in place_rows:
+            if place_name:
+                named_points[place_name.lower()] = GeoPoint(latitude, longitude)
+        for row in project_rows:
+            if row.latitude is not None and row.longitude is not None:
+                point = GeoPoint(row.latitude, row.longitude)
+            else:
+                point = location_by_id.get(location_of_project.get(str(row.id)))
+            if point is None:
+                continue
+            project_points.append((str(row.id), point))
+            if row.name:
+                named_points[row.name.lower()] = point
+
+        self.named_points = named_points
+        self.projects = GeoGrid(project_points)
+
+    async def run(self):
+        """Refresh forever on a worker thread so requests are never blocked"""
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+                print(f"✅ Geo index loaded: {self.projects.size} projects, {len(self.named_points)} named points")
+            except Exception as e:
+                print(f"⚠️ Geo index refresh failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+geo_index = GeoIndex(interval_seconds=int(os.getenv("GEO_INDEX_REFRESH_SECONDS", "600")))
@@ -0,0 +1,86 @@
+"""
+Lookup Resolution
+Free-text filter values matched through the lowercase lookup columns: exact match first, pg_trgm only when nothing matches exactly
+"""
+
+from sqlalchemy import or_, select, union_all
+
+from models.base import USE_TRIGRAM_LOOKUPS
+from models.location import Location
+from models.amenity import Amenity
+from models.nearby_place import NearbyPlace
+from models.property import Property
+
+# USE_TRIGRAM_LOOKUPS requires database/trigram_indexes.sql; when off, filters are the original ILIKE '%value%'
+# predicates and the *_lc columns are not mapped
+
+def resolve(key_column, normalized_columns, value: str):
+    """select() of ``key_column`` for rows matching ``value``.
+
+    Rows whose lowercase columns equal the value win (B-tree lookup); only when
+    there are none does the second branch run, matching substrings and
+    trigram-similar spellings through the GIN indexes. Postgres evaluates the
+    NOT EXISTS once, so an exact hit never touches the trigram indexes.
+    """
+    value = value.strip().lower()
+    exact = (
+        select(key_column)
+        .where(or_(*[column == value for column in normalized_columns]))
+        .correlate(None)
+    )
+    fuzzy = (
+        select(key_column)
+        .where(
+            or_(*[or_(column.like(f"%{value}%"), column.op("%")(value)) for column in normalized_columns]),
+            ~exact.exists()
+        )
+        .correlate(None)
+    )
+    return union_all(exact, fuzzy)
+
+def location_filter(value: str, location=Location):
+    """Location whose city or locality matches"""
+    if not USE_TRIGRAM_LOOKUPS:
+        return or_(location.city.ilike(f"%{value}%"), location.locality.ilike(f"%{value}%"))
+    return location.id.in_(resolve(Location.id, [Location.city_lc, Location.locality_lc], value))
+
+def city_filter(value: str, location=Location):
+    if not USE_TRIGRAM_LOOKUPS:
+        return location.city.ilike(f"%{value}%")
+    return location.id.in_(resolve(Location.id, [Location.city_lc], value))
+
+def locality_filter(value: str, location=Location):
+    if not USE_TRIGRAM_LOOKUPS:
+        return location.locality.ilike(f"%{value}%")
+    return location.id.in_(resolve(Location.id, [Location.locality_lc], value))
+
+def amenity_filter(value: str, amenity=Amenity):
+    if not USE_TRIGRAM_LOOKUPS:
+        return amenity.name.ilike(f"%{value}%")
+    return amenity.id.in_(resolve(Amenity.id, [Amenity.name_lc], value))
+
+def property_type_filter(value: str, prop=Property):
+    if not USE_TRIGRAM_LOOKUPS:
+        return prop.property_type.ilike(f"%{value}%")
+    return prop.property_type_lc.in_(resolve(Property.property_type_lc, [Property.property_type_lc], value))
+
+def place_type_filter(value: str, nearby=NearbyPlace):
+    if not USE_TRIGRAM_LOOKUPS:
+        return nearby.place_type.ilike(f"%{value}%")
+    return place_type_lc_filter(nearby.place_type_lc, value)
+
+def place_name_filter(value: str, nearby=NearbyPlace):
+    if not USE_TRIGRAM_LOOKUPS:
+        return nearby.place_name.ilike(f"%{value}%")
+    return place_name_lc_filter(nearby.place_name_lc, value)
+
+def place_type_lc_filter(column, value: str):
+    """Place type match on an already lower-cased column (e.g. project_place_distances.place_type_lc)"""
+    if not USE_TRIGRAM_LOOKUPS:
+        return column.like(f"%{value.lower()}%")
+    return column.in_(resolve(NearbyPlace.place_type_lc, [NearbyPlace.place_type_lc], value))
+
+def place_name_lc_filter(column, value: str):
+    if not USE_TRIGRAM_LOOKUPS:
+        return column.like(f"%{value.lower()}%")
+    return column.in_(resolve(NearbyPlace.place_name_lc, [NearbyPlace.place_name_lc], value))
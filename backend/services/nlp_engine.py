@@ -1,9 +1,194 @@
 import spacy
 import json
+import copy
+import os
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 import re
 
+from .gazetteer import Gazetteer, GazetteerMatches
+from .query_cache import QueryCache, normalize_query
+
+# spaCy pipeline profiles - components left out when the model is loaded.
+# Extraction only reads doc.ents (in the location fallback), so "ner" is enough;
+# "rules" skips spaCy altogether and relies on the gazetteer and regex layer.
+PIPELINE_PROFILES = {
+    "full": [],
+    "ner": ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"],
+    "rules": None,
+}
+
+# Gazetteer term lists - compiled once into the engine's Aho-Corasick matcher
+INDIAN_CITIES = [
+    "mumbai", "delhi", "bangalore", "hyderabad", "chennai", "kolkata", "pune", 
+    "ahmedabad", "jaipur", "lucknow", "kanpur", "nagpur", "indore", "thane",
+    "bhopal", "visakhapatnam", "patna", "vadodara", "ghaziabad", "ludhiana",
+    "agra", "nashik", "faridabad", "meerut", "rajkot", "kalyan", "vasai",
+    "vashi", "navi mumbai", "gurgaon", "noida", "greater noida"
+]
+
+# Common localities within major cities (in priority order)
+PUNE_LOCALITIES = ["baner", "wakad", "hinjewadi", "kharadi", "viman nagar", "koregaon park", "kalyani nagar", "aundh", "bavdhan", "pimpri", "chinchwad", "nigdi", "akurdi", "ravet", "moshi", "chakan", "talegaon"]
+MUMBAI_LOCALITIES = ["bandra", "andheri", "powai", "juhu", "worli", "dadar", "matunga", "sion", "kurla", "chembur", "goregaon", "malad", "kandivali", "borivali", "dahisar", "mulund", "thane", "navi mumbai", "kalyan", "vasai", "vashi", "nerul", "belapur", "panvel", "ulwe", "dronagiri", "kharghar", "seawoods", "ghansoli", "airoli", "rabale", "mahape", "turbhe", "kopar khairane", "sanpada", "juinagar"]
+DELHI_LOCALITIES = ["connaught place", "cp", "karol bagh", "rajouri garden", "dwarka", "rohini", "pitampura", "shalimar bagh", "ashok vihar", "model town", "gtb nagar", "hauz khas", "saket", "defence colony", "lajpat nagar", "greater kailash", "south extension", "vasant vihar", "munirka", "sarita vihar", "badarpur", "faridabad", "gurgaon", "noida", "greater noida"]
+BANGALORE_LOCALITIES = ["koramangala", "indiranagar", "whitefield", "electronic city", "marathahalli", "bellandur", "sarjapur", "hsr layout", "jayanagar", "jp nagar", "banashankari", "basavanagudi", "malleshwaram", "rajajinagar", "yeshwanthpur", "peenya", "hebbal", "yelahanka", "airport road", "old airport road", "domlur", "cunningham road", "residency road", "mg road", "brigade road", "commercial street"]
+
+ALL_LOCALITIES = PUNE_LOCALITIES + MUMBAI_LOCALITIES + DELHI_LOCALITIES + BANGALORE_LOCALITIES
+
+# Locations whose presence marks a query as a property search (BHK context and implicit intent)
+PROPERTY_SEARCH_LOCATIONS = [
+    "mumbai", "delhi", "bangalore", "hyderabad", "chennai", "kolkata", "pune", "baner", "wakad", "hinjewadi",
+    "kharadi", "viman nagar", "koregaon park", "kalyani nagar", "aundh", "bavdhan", "pimpri", "chinchwad", "nigdi",
+    "akurdi", "ravet", "moshi", "chakan", "talegaon", "lonavala", "khandala", "alibaug", "karjat", "panvel", "thane",
+    "navi mumbai", "kalyan", "vasai", "vashi", "nerul", "belapur", "ulwe", "dronagiri", "kharghar", "seawoods",
+    "ghansoli", "airoli", "rabale", "mahape", "turbhe", "kopar khairane", "sanpada", "juinagar"
+]
+
+BHK_KEYWORDS = ["bhk", "bedroom", "bed room"]
+
+# ONLY property amenities - NOT nearby places or landmarks
+AMENITY_KEYWORDS = [
+    "gym", "swimming pool", "parking", "lift", "security", "garden", 
+    "playground", "clubhouse", "concierge", "spa", "sauna", "tennis court",
+    "basketball court", "badminton court", "table tennis", "pool table",
+    "home theater", "wine cellar", "fireplace", "balcony", "terrace",
+    "servant quarter", "puja room", "study room", "utility area",
+    "modular kitchen", "wardrobe", "walk-in closet", "jacuzzi",
+    "steam room", "fitness center", "yoga room", "meditation room"
+]
+
+# Common nearby place types - these are NOT property amenities
+NEARBY_PLACE_TYPES = [
+    # Transportation
+    "metro station", "metro", "bus stop", "bus", "railway station", "railway", "airport", "taxi stand", "auto stand",
+    "rickshaw stand", "cycle stand", "parking lot", "car park", "bike parking",
+    
+    # Healthcare & Education
+    "hospital", "clinic", "medical center", "pharmacy", "chemist", "school", "college", "university", "institute",
+    "training center", "coaching center", "daycare", "play school",
+    
+    # Shopping & Entertainment
+    "mall", "shopping center", "market", "supermarket", "hypermarket", "cinema", "theater", "multiplex",
+    "restaurant", "cafe", "food court", "bar", "pub", "club", "amusement park", "water park",
+    
+    # Essential Services
+    "bank", "atm", "post office", "police station", "police", "fire station", "fire brigade", "ambulance",
+    "gas station", "petrol pump", "service center", "repair shop",
+    
+    # Religious & Cultural
+    "temple", "mosque", "church", "gurudwara", "mandir", "masjid", "library", "museum", "art gallery",
+    "community center", "cultural center",
+    
+    # Recreation & Sports
+    "park", "garden", "playground", "sports complex", "stadium", "gym", "fitness center", "swimming pool",
+    "tennis court", "basketball court", "football ground", "cricket ground",
+    
+    # Business & Office
+    "office", "corporate office", "business center", "industrial area", "warehouse", "factory",
+    "co-working space", "startup hub", "tech park", "sez", "special economic zone"
+]
+
+class _PatternBank:
+    """Several alternative regexes compiled into one master pattern.
+    
+    finditer() makes a single pass over the text and yields, for every match,
+    the index of the alternative that produced it together with that
+    alternative's own capture groups.
+    """
+    
+    def __init__(self, *patterns: str):
+        self.regex = re.compile("|".join(f"(?P<alt{index}>{pattern})" for index, pattern in enumerate(patterns)))
+        self._groups = [(self.regex.groupindex[f"alt{index}"], re.compile(pattern).groups) for index, pattern in enumerate(patterns)]
+    
+    def finditer(self, text: str):
+        for match in self.regex.finditer(text):
+            alternative = int(match.lastgroup[3:])
+            group_index, group_count = self._groups[alternative]
+            yield alternative, match, match.groups()[group_index:group_index + group_count]
+
+# Precompiled regex bank - built once at import time and evaluated once per query
+_NUMBER = r'(\d+(?:\.\d+)?)'
+_PRICE_UNIT = r'(cr|crore|crores|lakh|lakhs)'
+
+BHK_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(?:bhk|bedroom|bed\s*room)')
+
+# Alternatives are listed in priority order; each yields (value, unit) groups
+PRICE_UNDER_PATTERNS = _PatternBank(
+    rf'(?:under|below|less\s+than)\s+{_NUMBER}\s*{_PRICE_UNIT}',
+    rf'{_NUMBER}\s*{_PRICE_UNIT}\s+(?:or\s+)?(?:less|below|under)'
+)
+PRICE_ABOVE_PATTERNS = _PatternBank(
+    rf'(?:above|over|more\s+than)\s+{_NUMBER}\s*{_PRICE_UNIT}',
+    rf'{_NUMBER}\s*{_PRICE_UNIT}\s+(?:or\s+)?(?:more|above|over)'
+)
+PRICE_EXACT_PATTERNS = _PatternBank(
+    rf'{_NUMBER}\s*{_PRICE_UNIT}\s+(?:exactly|precisely|exact)',
+    rf'price\s+(?:is|of)\s+{_NUMBER}\s*{_PRICE_UNIT}',
+    rf'{_NUMBER}\s*{_PRICE_UNIT}\s+(?:flat|apartment|property)',
+    rf'{_NUMBER}\s*{_PRICE_UNIT}\s*[=]\s*\d+(?:\.\d+)?',
+    rf'{_NUMBER}\s*{_PRICE_UNIT}\s+bhk'
+)
+
+# Fallback price expressions: under / above / bare amount (operator by alternative index)
+PRICE_FALLBACK_PATTERNS = _PatternBank(
+    r'(?:under|below|less\s+than)\s+(\d+(?:\.\d+)?)\s*(?:cr|crore|crores|lakh|lakhs)',
+    r'(?:above|over|more\s+than)\s+(\d+(?:\.\d+)?)\s*(?:cr|crore|crores|lakh|lakhs)',
+    r'(\d+(?:\.\d+)?)\s*(?:cr|crore|crores|lakh|lakhs)'
+)
+
+# Carpet area expressions, most specific first; each yields the area value
+AREA_PATTERNS = _PatternBank(
+    # Patterns with sqft
+    r'carpet\s+area\s+(?:under|below|less\s+than)\s+(\d{3,5})\s*sqft',
+    r'carpet\s+area\s+(?:above|over|more\s+than)\s+(\d{3,5})\s*sqft',
+    r'carpet\s+area\s+(\d{3,5})\s*sqft',
+    r'(\d{3,5})\s*sqft\s+(?:carpet\s+)?area',
+    r'area\s+(?:under|below|less\s+than)\s+(\d{3,5})\s*sqft',
+    r'area\s+(?:above|over|more\s+than)\s+(\d{3,5})\s*sqft',
+    # Patterns without sqft (common in natural language)
+    r'carpet\s+area\s+(?:under|below|less\s+than)\s+(\d{3,5})',
+    r'carpet\s+area\s+(?:above|over|more\s+than)\s+(\d{3,5})',
+    r'carpet\s+area\s+(\d{3,5})',
+    r'area\s+(?:under|below|less\s+than)\s+(\d{3,5})',
+    r'area\s+(?:above|over|more\s+than)\s+(\d{3,5})',
+    # Direct number patterns for area
+    r'(\d{3,5})\s+(?:sqft|square\s+feet)\s+(?:carpet\s+)?area',
+    # Natural language patterns for area constraints
+    r'(?:under|below|less\s+than)\s+(\d{3,5})\s*(?:sqft|square\s+feet)',
+    r'(?:under|below|less\s+than)\s+(\d{3,5})',
+    r'(\d{3,5})\s*(?:sqft|square\s+feet)?\s+(?:or\s+)?(?:less|below|under)',
+    # Simple area constraints
+    r'carpet\s+less\s+than\s+(\d{3,5})',
+    r'area\s+less\s+than\s+(\d{3,5})'
+)
+
+# Distance expressions; a later alternative overrides an earlier one
+DISTANCE_PATTERNS = _PatternBank(
+    r'within\s+(\d+(?:\.\d+)?)\s*km',
+    r'(\d+(?:\.\d+)?)\s*km\s*(?:away|from|of)',
+    r'(\d+(?:\.\d+)?)\s*kilometer',
+    r'(\d+(?:\.\d+)?)\s*km\s*range',
+    r'walking\s+distance',
+    r'(?:near|close\s+to|next\s+to)\s+(\d+)(?!\w)'
+)
+WALKING_DISTANCE_ALTERNATIVE = 4
+
+# "within X km of [Name] [Type]", "near [Name] [Type]", "close to [Name] [Type]"
+_PLACE_TYPE_ALTERNATION = "|".join(NEARBY_PLACE_TYPES)
+SPECIFIC_PLACE_PATTERNS = _PatternBank(
+    r'within\s+\d+(?:\.\d+)?\s*km\s+of\s+([a-z]+(?:\s+[a-z]+)*)\s+(' + _PLACE_TYPE_ALTERNATION + ')',
+    r'near\s+([a-z]+(?:\s+[a-z]+)*)\s+(' + _PLACE_TYPE_ALTERNATION + ')',
+    r'close\s+to\s+([a-z]+(?:\s+[a-z]+)*)\s+(' + _PLACE_TYPE_ALTERNATION + ')'
+)
+
+WITHIN_PLACE_PATTERN = re.compile(r"within\s+(\d+(?:\.\d+)?)\s*k?m?s?\s+of\s+([^,\.;]+)")
+EXPLICIT_BHK_PATTERN = re.compile(r"(\d+)\s*bhk")
+BALCONY_PATTERN = re.compile(r"(\d+)\s+balcon(?:y|ies)")
+# Any-of amenity phrasing, only looked for between or right before the amenity mentions
+AMENITY_OR_PATTERN = re.compile(r"\bor\b|/")
+AMENITY_ANY_PREFIX_PATTERN = re.compile(r"\b(?:any\s+of|either)(?:\s+(?:a|an|the))?\s*$")
+AMENITY_CONNECTOR_MAX_CHARS = 20  # Longer gaps between two amenities are separate clauses
+
 @dataclass
 class ExtractedEntity:
     """Represents an extracted entity from the query"""
@@ -21,17 +206,74 @@ class QueryIntent:
     confidence: float
     entities: List[ExtractedEntity]
 
+@dataclass(frozen=True)
+class QueryPlan:
+    """Immutable result of a single NLP pass over a search query.
+
+    Holds everything the search endpoint needs (intent, entities, normalized
+    filters and the free-text flags such as project status or balconies) so
+    the query is parsed exactly once per request.
+    """
+    query: str
+    intent: str
+    confidence: float
+    entities: Tuple[ExtractedEntity, ...]
+    filters: Dict  # Same shape as get_search_criteria()["filters"]; treat as read-only
+    project_status: Optional[str] = None  # ready_to_move, under_construction, completed
+    within_km: Optional[float] = None  # "within X km of <place>"
+    within_place: Optional[str] = None
+    explicit_bhk: Optional[int] = None  # BHK number stated alongside a "within X km" clause
+    min_balconies: Optional[int] = None  # "with N balconies"
+    garden_view: bool = False
+    amenity_match: str = "all"  # "all": every amenity required; "any": "gym or pool", "any of ..."
+
+    def filter_key(self) -> str:
+        """Canonical key of everything that affects the database search (not intent or wording)"""
+        return json.dumps({
+            "filters": self.filters,
+            "project_status": self.project_status,
+            "within_km": self.within_km,
+            "within_place": self.within_place,
+            "explicit_bhk": self.explicit_bhk,
+            "min_balconies": self.min_balconies,
+            "garden_view": self.garden_view,
+            "amenity_match": self.amenity_match
+        }, sort_keys=True, default=str)
+    
+    def to_criteria(self) -> Dict:
+        """Return the legacy search criteria dict (a copy, safe to mutate)"""
+        return {
+            "intent": self.intent,
+            "confidence": self.confidence,
+            "filters": copy.deepcopy(self.filters)
+        }
+
 class RealEstateNLPEngine:
     """INTENT-DRIVEN NLP Engine for Real Estate queries using spaCy"""
     
-    def __init__(self, model_name: str = "en_core_web_sm"):
-        """Initialize the NLP engine with spaCy model"""
-        try:
-            self.nlp = spacy.load(model_name)
-            print(f"✅ Loaded spaCy model: {model_name}")
-        except OSError:
-            print(f"❌ Model {model_name} not found. Please install it with: python -m spacy download {model_name}")
-            raise
+    def __init__(self, model_name: Optional[str] = None, pipeline_profile: Optional[str] = None):
+        """Initialize the NLP engine with spaCy model
+        
+        ``pipeline_profile`` picks how much of the spaCy pipeline is loaded
+        (see PIPELINE_PROFILES); both arguments default to the SPACY_MODEL and
+        NLP_PIPELINE_PROFILE environment variables.
+        """
+        model_name = model_name or os.getenv("SPACY_MODEL", "en_core_web_sm")
+        self.pipeline_profile = (pipeline_profile or os.getenv("NLP_PIPELINE_PROFILE", "ner")).lower()
+        if self.pipeline_profile not in PIPELINE_PROFILES:
+            raise ValueError(f"Unknown NLP pipeline profile '{self.pipeline_profile}', expected one of {list(PIPELINE_PROFILES)}")
+        
+        excluded = PIPELINE_PROFILES[self.pipeline_profile]
+        if excluded is None:
+            self.nlp = None
+            print("✅ NLP engine running rules-only (no spaCy model loaded)")
+        else:
+            try:
+                self.nlp = spacy.load(model_name, exclude=excluded)
+                print(f"✅ Loaded spaCy model: {model_name} ({self.pipeline_profile} profile: {', '.join(self.nlp.pipe_names) or 'tokenizer only'})")
+            except OSError:
+                print(f"❌ Model {model_name} not found. Please install it with: python -m spacy download {model_name}")
+                raise
         
         # INTENT-DRIVEN: Define intents based on semantic meaning, not keywords
         self.intents = {
@@ -76,36 +318,106 @@ class RealEstateNLPEngine:
                 "context_indicators": ["per sq ft", "total cost", "booking amount", "lakhs", "crores"]
             }
         }
+        
+        # Location dictionary - seeded from the built-in lists until update_locations()
+        # loads the cities/localities we actually have inventory in
+        self.cities = list(INDIAN_CITIES)
+        self.localities = list(ALL_LOCALITIES)
+        self.search_locations = list(PROPERTY_SEARCH_LOCATIONS)
+        self.place_types: Dict[str, str] = {}  # Known nearby place name -> place type
+        self.locations_loaded = False
+        
+        # Single multi-pattern matcher for every keyword list used during extraction
+        self.gazetteer = self._build_gazetteer()
+        
+        # Parsed plans keyed by normalized query text; cleared whenever the gazetteer changes
+        self.query_cache = QueryCache(
+            max_size=int(os.getenv("NLP_CACHE_SIZE", "1024")),
+            ttl_seconds=float(os.getenv("NLP_CACHE_TTL", "3600"))
+        )
+    
+    def _build_gazetteer(self) -> Gazetteer:
+        """Compile all location, place, amenity and intent keywords into one automaton"""
+        gazetteer = Gazetteer()
+        gazetteer.add_all(self.cities, "city")
+        gazetteer.add_all(self.localities, "locality")
+        gazetteer.add_all(self.search_locations, "search_location")
+        # Longest first so "phoenix marketcity mall" wins over "phoenix marketcity"
+        gazetteer.add_all(sorted(self.place_types, key=len, reverse=True), "place_name")
+        gazetteer.add_all(BHK_KEYWORDS, "bhk_keyword")
+        gazetteer.add_all(AMENITY_KEYWORDS, "amenity")
+        # Longest first so multi-word place types win over their single-word prefixes
+        gazetteer.add_all(sorted(NEARBY_PLACE_TYPES, key=len, reverse=True), "nearby_place_type")
+        
+        for intent_name, intent_info in self.intents.items():
+            gazetteer.add_all(intent_info["semantic_indicators"], f"intent:{intent_name}:semantic")
+            gazetteer.add_all(intent_info["context_indicators"], f"intent:{intent_name}:context")
+        
+        return gazetteer.build()
     
-    def extract_entities_with_context(self, text: str) -> List[ExtractedEntity]:
-        """INTENT-DRIVEN: Extract entities with full semantic context"""
+    def update_locations(self, cities: List[str], localities: List[str], place_types: Optional[Dict[str, str]] = None):
+        """Replace the location dictionary (e.g. from the locations table) and rebuild the matcher.
+        
+        The new automaton is built off to the side and swapped in with a single
+        assignment, so concurrent queries keep using the previous one until then.
+        """
+        normalize = lambda values: sorted({v.strip().lower() for v in values if v and v.strip()}, key=lambda v: (-len(v), v))
+        
+        self.cities = normalize(cities)
+        self.localities = normalize(localities)
+        self.search_locations = normalize(self.cities + self.localities)
+        self.place_types = {
+            name.strip().lower(): (place_type or "").strip().lower()
+            for name, place_type in (place_types or {}).items()
+            if name and name.strip()
+        }
+        self.gazetteer = self._build_gazetteer()
+        self.locations_loaded = True
+        self.query_cache.clear()
+        print(f"✅ Gazetteer rebuilt: {len(self.cities)} cities, {len(self.localities)} localities, {len(self.place_types)} places")
+    
+    def location_snapshot(self) -> Optional[Dict]:
+        """Arguments for update_locations() that reproduce the current dictionary, or None if still on the built-in lists"""
+        if not self.locations_loaded:
+            return None
+        return {
+            "cities": list(self.cities),
+            "localities": list(self.localities),
+            "place_types": dict(self.place_types)
+        }
+    
+    def extract_entities_with_context(self, text: str, hits: Optional[GazetteerMatches] = None, doc=None) -> List[ExtractedEntity]:
+        """INTENT-DRIVEN: Extract entities with full semantic context
+        
+        spaCy only runs when the rule layer cannot resolve a location; pass an
+        already parsed ``doc`` (e.g. from ``nlp.pipe``) to reuse it instead.
+        """
         entities = []
         text_lower = text.lower()
+        if hits is None:
+            hits = self.gazetteer.scan(text_lower)
         
         print(f"🔍 INTENT-DRIVEN: Analyzing semantic meaning of: '{text}'")
         
-        # Process with spaCy for linguistic understanding
-        doc = self.nlp(text)
-        
         # INTENT-DRIVEN: Extract entities based on semantic understanding, not just patterns
         
         # 1. NEARBY PLACE entities with distance context (check before location to avoid conflicts)
-        self._extract_nearby_place_entities(doc, entities, text_lower)
+        self._extract_nearby_place_entities(entities, text_lower, hits)
         
         # 2. LOCATION entities (cities, localities, landmarks)
-        self._extract_location_entities(doc, entities, text_lower)
+        self._extract_location_entities(text, doc, entities, text_lower, hits)
         
         # 3. BHK entities with semantic context
-        self._extract_bhk_entities(doc, entities, text_lower)
+        self._extract_bhk_entities(entities, text_lower, hits)
         
         # 4. PRICE entities with semantic context (MOST IMPORTANT)
-        self._extract_price_entities_with_context(doc, entities, text_lower)
+        self._extract_price_entities_with_context(entities, text_lower)
         
         # 5. CARPET AREA entities with semantic context
-        self._extract_area_entities_with_context(doc, entities, text_lower)
+        self._extract_area_entities_with_context(entities, text_lower)
         
         # 6. AMENITY entities with semantic context
-        self._extract_amenity_entities(doc, entities, text_lower)
+        self._extract_amenity_entities(entities, text_lower, hits)
         
         print(f"🔍 INTENT-DRIVEN: Total entities with context: {len(entities)}")
         for entity in entities:
@@ -113,60 +425,55 @@ class RealEstateNLPEngine:
         
         return entities
     
-    def _extract_location_entities(self, doc, entities, text_lower):
-        """Extract location entities using spaCy's NER and common Indian cities"""
-        # First, check for common Indian cities and localities in the text
-        indian_cities = [
-            "mumbai", "delhi", "bangalore", "hyderabad", "chennai", "kolkata", "pune", 
-            "ahmedabad", "jaipur", "lucknow", "kanpur", "nagpur", "indore", "thane",
-            "bhopal", "visakhapatnam", "patna", "vadodara", "ghaziabad", "ludhiana",
-            "agra", "nashik", "faridabad", "meerut", "rajkot", "kalyan", "vasai",
-            "vashi", "navi mumbai", "gurgaon", "noida", "greater noida", "faridabad"
-        ]
-        
-        # Common localities within major cities
-        pune_localities = ["baner", "wakad", "hinjewadi", "kharadi", "viman nagar", "koregaon park", "kalyani nagar", "aundh", "bavdhan", "pimpri", "chinchwad", "nigdi", "akurdi", "ravet", "moshi", "chakan", "talegaon"]
-        mumbai_localities = ["bandra", "andheri", "powai", "juhu", "worli", "dadar", "matunga", "sion", "kurla", "chembur", "goregaon", "malad", "kandivali", "borivali", "dahisar", "mulund", "thane", "navi mumbai", "kalyan", "vasai", "vashi", "nerul", "belapur", "panvel", "ulwe", "dronagiri", "kharghar", "seawoods", "ghansoli", "airoli", "rabale", "mahape", "turbhe", "kopar khairane", "sanpada", "juinagar"]
-        delhi_localities = ["connaught place", "cp", "karol bagh", "rajouri garden", "dwarka", "rohini", "pitampura", "rohini", "shalimar bagh", "ashok vihar", "model town", "gtb nagar", "hauz khas", "saket", "defence colony", "lajpat nagar", "greater kailash", "south extension", "vasant vihar", "munirka", "sarita vihar", "badarpur", "faridabad", "gurgaon", "noida", "greater noida"]
-        bangalore_localities = ["koramangala", "indiranagar", "whitefield", "electronic city", "marathahalli", "bellandur", "sarjapur", "hsr layout", "jayanagar", "jp nagar", "banashankari", "basavanagudi", "malleshwaram", "rajajinagar", "yeshwanthpur", "peenya", "hebbal", "yelahanka", "airport road", "old airport road", "domlur", "cunningham road", "residency road", "mg road", "brigade road", "commercial street"]
-        
-        all_localities = pune_localities + mumbai_localities + delhi_localities + bangalore_localities
-        
+    def _match_gazetteer_location(self, text_lower, hits) -> Optional[ExtractedEntity]:
+        """Rule-based location: the first locality, else the first city, mentioned as a location"""
         # Check for locality mentions first (more specific)
-        for locality in all_localities:
-            if locality in text_lower:
-                # Check if it's actually being requested as a location
-                context_words = self._get_context_words(text_lower, text_lower.find(locality), text_lower.find(locality) + len(locality), 10)
-                if any(word in context_words for word in ["in", "at", "near", "from", "of", "within", "around"]) or any(city in text_lower for city in indian_cities):
-                    entities.append(ExtractedEntity(
-                        text=locality,
-                        label="LOCATION",
-                        start=text_lower.find(locality),
-                        end=text_lower.find(locality) + len(locality),
-                        confidence=0.95,
-                        context={"type": "locality", "full_text": locality, "semantic_meaning": "required_location"}
-                    ))
-                    print(f"🔍 INTENT-DRIVEN: Found LOCATION entity: '{locality}' (locality)")
-                    return  # Exit after finding first locality
+        for hit in hits.first_occurrences("locality"):
+            # Check if it's actually being requested as a location
+            context_words = self._get_context_words(text_lower, hit.start, hit.end, 10)
+            if any(word in context_words for word in ["in", "at", "near", "from", "of", "within", "around"]) or hits.has("city"):
+                return ExtractedEntity(
+                    text=hit.term,
+                    label="LOCATION",
+                    start=hit.start,
+                    end=hit.end,
+                    confidence=0.95,
+                    context={"type": "locality", "full_text": hit.term, "semantic_meaning": "required_location"}
+                )
         
         # Check for city mentions in the text
-        for city in indian_cities:
-            if city in text_lower:
-                # Check if it's actually being requested as a location
-                context_words = self._get_context_words(text_lower, text_lower.find(city), text_lower.find(city) + len(city), 10)
-                if any(word in context_words for word in ["in", "at", "near", "from", "of", "within", "around"]):
-                    entities.append(ExtractedEntity(
-                        text=city,
-                        label="LOCATION",
-                        start=text_lower.find(city),
-                        end=text_lower.find(city) + len(city),
-                        confidence=0.9,
-                        context={"type": "city", "full_text": city, "semantic_meaning": "required_location"}
-                    ))
-                    print(f"🔍 INTENT-DRIVEN: Found LOCATION entity: '{city}' (Indian city)")
-                    return  # Exit after finding first city
-        
-        # Fallback to spaCy's NER for other location entities
+        for hit in hits.first_occurrences("city"):
+            # Check if it's actually being requested as a location
+            context_words = self._get_context_words(text_lower, hit.start, hit.end, 10)
+            if any(word in context_words for word in ["in", "at", "near", "from", "of", "within", "around"]):
+                return ExtractedEntity(
+                    text=hit.term,
+                    label="LOCATION",
+                    start=hit.start,
+                    end=hit.end,
+                    confidence=0.9,
+                    context={"type": "city", "full_text": hit.term, "semantic_meaning": "required_location"}
+                )
+        return None
+    
+    def needs_ner(self, text_lower: str, hits: GazetteerMatches) -> bool:
+        """True if extraction will fall back to spaCy NER for this text"""
+        return self.nlp is not None and self._match_gazetteer_location(text_lower, hits) is None
+    
+    def _extract_location_entities(self, text, doc, entities, text_lower, hits):
+        """Extract location entities using spaCy's NER and common Indian cities"""
+        location = self._match_gazetteer_location(text_lower, hits)
+        if location is not None:
+            entities.append(location)
+            source = "locality" if location.context["type"] == "locality" else "Indian city"
+            print(f"🔍 INTENT-DRIVEN: Found LOCATION entity: '{location.text}' ({source})")
+            return  # Exit after finding first locality / city
+        
+        # Fallback to spaCy's NER for other location entities - the only place a parse is needed
+        if doc is None:
+            if self.nlp is None:
+                return
+            doc = self.nlp(text)
         for ent in doc.ents:
             if ent.label_ in ["GPE", "LOC", "FAC"]:  # Location entities
                 # Check if this entity is actually a nearby place type to avoid conflicts
@@ -191,529 +498,270 @@ class RealEstateNLPEngine:
                 else:
                     print(f"🔍 INTENT-DRIVEN: Skipped '{ent.text}' as it's a nearby place type, not a location")
     
-    def _extract_bhk_entities(self, doc, entities, text_lower):
+    def _extract_bhk_entities(self, entities, text_lower, hits):
         """Extract BHK entities with semantic understanding"""
         print(f"🔍 BHK Extraction: Analyzing text: '{text_lower}'")
         
         # Look for BHK patterns in the context of property specifications
-        bhk_patterns = [
-            r'(\d+(?:\.\d+)?)\s*bhk',
-            r'(\d+(?:\.\d+)?)\s*bedroom',
-            r'(\d+(?:\.\d+)?)\s*bed\s*room'
-        ]
-        
-        for pattern in bhk_patterns:
-            matches = re.finditer(pattern, text_lower)
-            for match in matches:
-                print(f"🔍 BHK Pattern match: '{match.group(0)}' with value: {match.group(1)}")
-                # INTENT-DRIVEN: Check if this is actually about property BHK, not just a number
-                context_words = self._get_context_words(text_lower, match.start(), match.end(), 10)
-                print(f"🔍 BHK Context words: {context_words}")
-                # More flexible context checking - if it's in a query with location, it's likely a property search
-                if any(word in context_words for word in ["property", "flat", "apartment", "house", "real estate", "bhk"]) or any(word in text_lower for word in ["mumbai", "delhi", "bangalore", "hyderabad", "chennai", "kolkata", "pune", "baner", "wakad", "hinjewadi", "kharadi", "viman nagar", "koregaon park", "kalyani nagar", "aundh", "bavdhan", "pimpri", "chinchwad", "nigdi", "akurdi", "ravet", "moshi", "chakan", "talegaon", "lonavala", "khandala", "alibaug", "karjat", "panvel", "thane", "navi mumbai", "kalyan", "vasai", "vashi", "nerul", "belapur", "panvel", "ulwe", "dronagiri", "kharghar", "seawoods", "ghansoli", "airoli", "rabale", "mahape", "turbhe", "kopar khairane", "sanpada", "juinagar", "nerul", "seawoods", "belapur", "panvel", "ulwe", "dronagiri", "kharghar", "seawoods", "ghansoli", "airoli", "rabale", "mahape", "turbhe", "kopar khairane", "sanpada", "juinagar"]):
-                    entities.append(ExtractedEntity(
-                        text=match.group(0),
-                        label="BHK",
-                        start=match.start(),
-                        end=match.end(),
-                        confidence=0.9,
-                        context={"value": float(match.group(1)), "operator": "=", "unit": "bhk"}
-                    ))
-                    print(f"🔍 INTENT-DRIVEN: Found BHK entity: '{match.group(0)}' in property context")
-                else:
-                    print(f"🔍 BHK Context check failed - not in property context")
+        for match in BHK_PATTERN.finditer(text_lower):
+            print(f"🔍 BHK Pattern match: '{match.group(0)}' with value: {match.group(1)}")
+            # INTENT-DRIVEN: Check if this is actually about property BHK, not just a number
+            context_words = self._get_context_words(text_lower, match.start(), match.end(), 10)
+            print(f"🔍 BHK Context words: {context_words}")
+            # More flexible context checking - if it's in a query with location, it's likely a property search
+            if any(word in context_words for word in ["property", "flat", "apartment", "house", "real estate", "bhk"]) or hits.has("search_location"):
+                entities.append(ExtractedEntity(
+                    text=match.group(0),
+                    label="BHK",
+                    start=match.start(),
+                    end=match.end(),
+                    confidence=0.9,
+                    context={"value": float(match.group(1)), "operator": "=", "unit": "bhk"}
+                ))
+                print(f"🔍 INTENT-DRIVEN: Found BHK entity: '{match.group(0)}' in property context")
+            else:
+                print(f"🔍 BHK Context check failed - not in property context")
     
-    def _extract_price_entities_with_context(self, doc, entities, text_lower):
+    def _extract_price_entities_with_context(self, entities, text_lower):
         """INTENT-DRIVEN: Extract price entities with full semantic context"""
         print(f"🔍 INTENT-DRIVEN: Analyzing price context in: '{text_lower}'")
         
-        # INTENT-DRIVEN: First, understand the semantic structure of the query
-        # Look for price-related semantic patterns
-        
-        # Pattern 1: "under X crore/lakh" - semantic understanding
-        under_patterns = [
-            r'(under|below|less\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            r'(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)\s+(?:or\s+)?(?:less|below|under)',
-            r'price\s+(?:under|below|less\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            r'budget\s+(?:under|below|less\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            r'cost\s+(?:under|below|less\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            # Additional patterns for common variations
-            r'properties?\s+(?:under|below|less\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            r'flats?\s+(?:under|below|less\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            r'houses?\s+(?:under|below|less\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            r'apartments?\s+(?:under|below|less\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            # More comprehensive patterns
-            r'(?:properties?|flats?|houses?|apartments?)\s+(?:under|below|less\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            r'(?:under|below|less\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            r'(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)\s+(?:under|below|less\s+than)'
+        # INTENT-DRIVEN: "under" phrasing first (most common in real estate), then "above", then exact
+        price_patterns = [
+            (PRICE_UNDER_PATTERNS, "<", "less_than", "under"),
+            (PRICE_ABOVE_PATTERNS, ">", "more_than", "above"),
+            (PRICE_EXACT_PATTERNS, "=", "exact", "exact")
         ]
         
-        # Pattern 2: "above X crore/lakh" - semantic understanding
-        above_patterns = [
-            r'(above|over|more\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            r'(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)\s+(?:or\s+)?(?:more|above|over)',
-            r'price\s+(?:above|over|more\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            r'budget\s+(?:above|over|more\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            r'cost\s+(?:above|over|more\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            # Additional patterns for common variations
-            r'properties?\s+(?:above|over|more\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            r'flats?\s+(?:above|over|more\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            r'houses?\s+(?:above|over|more\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            r'apartments?\s+(?:above|over|more\s+than)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)'
-        ]
-        
-        # Pattern 3: Exact price - semantic understanding
-        exact_patterns = [
-            r'(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)\s+(?:exactly|precisely|exact)',
-            r'price\s+(?:is|of)\s+(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)',
-            r'(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)\s+(?:flat|apartment|property)',
-            # Additional patterns for exact matches
-            r'(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)\s*[=]\s*(\d+(?:\.\d+)?)',
-            r'(\d+(?:\.\d+)?)\s*(cr|crore|crores|lakh|lakhs)\s+(?:flat|apartment|property|bhk)'
-        ]
-        
-        # INTENT-DRIVEN: Check each pattern with semantic validation
-        found_price = False
-        
-        # Check "under" patterns first (most common in real estate)
-        for pattern in under_patterns:
-            if not found_price:
-                matches = re.finditer(pattern, text_lower)
-                for match in matches:
-                    # INTENT-DRIVEN: Validate this is actually about price, not area or other attributes
-                    if self._is_price_context(text_lower, match.start(), match.end()):
-                        value = float(match.group(2))
-                        unit = match.group(3)
-                        price_in_rupees = self._convert_to_rupees(value, unit)
-                        
-                        entities.append(ExtractedEntity(
-                            text=match.group(0),
-                            label="PRICE",
-                            start=match.start(),
-                            end=match.end(),
-                            confidence=0.95,
-                            context={
-                                "value": price_in_rupees,
-                                "operator": "<",
-                                "unit": unit,
-                                "original_value": value,
-                                "semantic_meaning": "less_than"
-                            }
-                        ))
-                        print(f"🔍 INTENT-DRIVEN: Found PRICE entity (under): '{match.group(0)}' = < {price_in_rupees} rupees")
-                        found_price = True
-                        break
-        
-        # Check "above" patterns
-        for pattern in above_patterns:
-            if not found_price:
-                matches = re.finditer(pattern, text_lower)
-                for match in matches:
-                    if self._is_price_context(text_lower, match.start(), match.end()):
-                        value = float(match.group(2))
-                        unit = match.group(3)
-                        price_in_rupees = self._convert_to_rupees(value, unit)
-                        
-                        entities.append(ExtractedEntity(
-                            text=match.group(0),
-                            label="PRICE",
-                            start=match.start(),
-                            end=match.end(),
-                            confidence=0.95,
-                            context={
-                                "value": price_in_rupees,
-                                "operator": ">",
-                                "unit": unit,
-                                "original_value": value,
-                                "semantic_meaning": "more_than"
-                            }
-                        ))
-                        print(f"🔍 INTENT-DRIVEN: Found PRICE entity (above): '{match.group(0)}' = > {price_in_rupees} rupees")
-                        found_price = True
-                        break
-        
-        # Check exact price patterns
-        for pattern in exact_patterns:
-            if not found_price:
-                matches = re.finditer(pattern, text_lower)
-                for match in matches:
-                    if self._is_price_context(text_lower, match.start(), match.end()):
-                        value = float(match.group(1))
-                        unit = match.group(2)
-                        price_in_rupees = self._convert_to_rupees(value, unit)
-                        
-                        entities.append(ExtractedEntity(
-                            text=match.group(0),
-                            label="PRICE",
-                            start=match.start(),
-                            end=match.end(),
-                            confidence=0.95,
-                            context={
-                                "value": price_in_rupees,
-                                "operator": "=",
-                                "unit": unit,
-                                "original_value": value,
-                                "semantic_meaning": "exact"
-                            }
-                        ))
-                        print(f"🔍 INTENT-DRIVEN: Found PRICE entity (exact): '{match.group(0)}' = = {price_in_rupees} rupees")
-                        found_price = True
-                        break
+        for patterns, operator, semantic_meaning, label in price_patterns:
+            match = self._first_valid_match(patterns, text_lower, self._is_price_context)
+            if match is None:
+                continue
+            
+            match, (value_text, unit) = match
+            value = float(value_text)
+            price_in_rupees = self._convert_to_rupees(value, unit)
+            
+            entities.append(ExtractedEntity(
+                text=match.group(0),
+                label="PRICE",
+                start=match.start(),
+                end=match.end(),
+                confidence=0.95,
+                context={
+                    "value": price_in_rupees,
+                    "operator": operator,
+                    "unit": unit,
+                    "original_value": value,
+                    "semantic_meaning": semantic_meaning
+                }
+            ))
+            print(f"🔍 INTENT-DRIVEN: Found PRICE entity ({label}): '{match.group(0)}' = {operator} {price_in_rupees} rupees")
+            return
         
         # FALLBACK: If no price entity found, try to extract any price-related information
-        if not found_price:
-            self._extract_price_fallback(text_lower, entities)
+        self._extract_price_fallback(text_lower, entities)
     
-    def _extract_area_entities_with_context(self, doc, entities, text_lower):
+    def _first_valid_match(self, patterns: "_PatternBank", text_lower: str, is_valid):
+        """Return (match, groups) for the highest-priority alternative with a valid match"""
+        best = None
+        for alternative, match, groups in patterns.finditer(text_lower):
+            if best is not None and alternative >= best[0]:
+                continue
+            if is_valid(text_lower, match.start(), match.end()):
+                best = (alternative, match, groups)
+        return (best[1], best[2]) if best else None
+    
+    def _extract_area_entities_with_context(self, entities, text_lower):
         """INTENT-DRIVEN: Extract carpet area entities with semantic context"""
-        # INTENT-DRIVEN: Look for area-related semantic patterns
-        area_patterns = [
-            # Patterns with sqft
-            r'carpet\s+area\s+(?:under|below|less\s+than)\s+(\d{3,5})\s*sqft',
-            r'carpet\s+area\s+(?:above|over|more\s+than)\s+(\d{3,5})\s*sqft',
-            r'carpet\s+area\s+(\d{3,5})\s*sqft',
-            r'(\d{3,5})\s*sqft\s+(?:carpet\s+)?area',
-            r'area\s+(?:under|below|less\s+than)\s+(\d{3,5})\s*sqft',
-            r'area\s+(?:above|over|more\s+than)\s+(\d{3,5})\s*sqft',
-            # Patterns without sqft (common in natural language)
-            r'carpet\s+area\s+(?:under|below|less\s+than)\s+(\d{3,5})',
-            r'carpet\s+area\s+(?:above|over|more\s+than)\s+(\d{3,5})',
-            r'carpet\s+area\s+(\d{3,5})',
-            r'area\s+(?:under|below|less\s+than)\s+(\d{3,5})',
-            r'area\s+(?:above|over|more\s+than)\s+(\d{3,5})',
-            # Direct number patterns for area
-            r'(\d{3,5})\s+(?:sqft|square\s+feet)\s+(?:carpet\s+)?area',
-            # Natural language patterns for area constraints
-            r'(?:under|below|less\s+than)\s+(\d{3,5})\s*(?:sqft|square\s+feet)',
-            r'(?:under|below|less\s+than)\s+(\d{3,5})',
-            r'(\d{3,5})\s*(?:sqft|square\s+feet)?\s+(?:or\s+)?(?:less|below|under)',
-            # Simple area constraints
-            r'carpet\s+less\s+than\s+(\d{3,5})',
-            r'area\s+less\s+than\s+(\d{3,5})'
-        ]
-        
-        for pattern in area_patterns:
-            matches = re.finditer(pattern, text_lower)
-            for match in matches:
-                # INTENT-DRIVEN: Validate this is about area, not price
-                if self._is_area_context(text_lower, match.start(), match.end()):
-                    value = int(match.group(1))
-                    operator = self._extract_area_operator(match.group(0))
-                    
-                    entities.append(ExtractedEntity(
-                        text=match.group(0),
-                        label="CARPET_AREA",
-                        start=match.start(),
-                        end=match.end(),
-                        confidence=0.9,
-                        context={
-                            "value": value,
-                            "operator": operator,
-                            "unit": "sqft",
-                            "semantic_meaning": "carpet_area"
-                        }
-                    ))
-                    print(f"🔍 INTENT-DRIVEN: Found CARPET_AREA entity: '{match.group(0)}' = {operator} {value} sqft")
+        # INTENT-DRIVEN: Look for area-related semantic patterns in a single pass
+        for alternative, match, groups in AREA_PATTERNS.finditer(text_lower):
+            # INTENT-DRIVEN: Validate this is about area, not price
+            if self._is_area_context(text_lower, match.start(), match.end()):
+                value = int(groups[0])
+                operator = self._extract_area_operator(match.group(0))
+                
+                entities.append(ExtractedEntity(
+                    text=match.group(0),
+                    label="CARPET_AREA",
+                    start=match.start(),
+                    end=match.end(),
+                    confidence=0.9,
+                    context={
+                        "value": value,
+                        "operator": operator,
+                        "unit": "sqft",
+                        "semantic_meaning": "carpet_area"
+                    }
+                ))
+                print(f"🔍 INTENT-DRIVEN: Found CARPET_AREA entity: '{match.group(0)}' = {operator} {value} sqft")
     
-    def _extract_amenity_entities(self, doc, entities, text_lower):
+    def _extract_amenity_entities(self, entities, text_lower, hits):
         """INTENT-DRIVEN: Extract amenity entities with semantic context"""
-        # ONLY property amenities - NOT nearby places or landmarks
-        amenity_keywords = [
-            "gym", "swimming pool", "parking", "lift", "security", "garden", 
-            "playground", "clubhouse", "concierge", "spa", "sauna", "tennis court",
-            "basketball court", "badminton court", "table tennis", "pool table",
-            "home theater", "wine cellar", "fireplace", "balcony", "terrace",
-            "servant quarter", "puja room", "study room", "utility area",
-            "modular kitchen", "wardrobe", "walk-in closet", "jacuzzi",
-            "steam room", "fitness center", "yoga room", "meditation room"
-        ]
-        
-        for amenity in amenity_keywords:
-            if amenity in text_lower:
-                # INTENT-DRIVEN: Check if this amenity is actually being requested
-                context_words = self._get_context_words(text_lower, text_lower.find(amenity), text_lower.find(amenity) + len(amenity), 15)
-                
-                # Only extract as amenity if it's about property features, not nearby places
-                if any(word in context_words for word in ["with", "having", "including", "features", "facilities"]):
-                    # Double-check: ensure it's not being used in a nearby place context
-                    nearby_indicators = ["near", "close", "nearby", "within", "km", "kilometer", "distance", "away", "from"]
-                    if not any(indicator in context_words for indicator in nearby_indicators):
-                        entities.append(ExtractedEntity(
-                            text=amenity,
-                            label="AMENITY",
-                            start=text_lower.find(amenity),
-                            end=text_lower.find(amenity) + len(amenity),
-                            confidence=0.85,
-                            context={"type": "amenity", "semantic_meaning": "required_feature"}
-                        ))
-                        print(f"🔍 INTENT-DRIVEN: Found AMENITY entity: '{amenity}'")
+        for hit in hits.first_occurrences("amenity"):
+            amenity = hit.term
+            # INTENT-DRIVEN: Check if this amenity is actually being requested
+            context_words = self._get_context_words(text_lower, hit.start, hit.end, 15)
+            
+            # Only extract as amenity if it's about property features, not nearby places
+            if any(word in context_words for word in ["with", "having", "including", "features", "facilities"]):
+                # Double-check: ensure it's not being used in a nearby place context
+                nearby_indicators = ["near", "close", "nearby", "within", "km", "kilometer", "distance", "away", "from"]
+                if not any(indicator in context_words for indicator in nearby_indicators):
+                    entities.append(ExtractedEntity(
+                        text=amenity,
+                        label="AMENITY",
+                        start=hit.start,
+                        end=hit.end,
+                        confidence=0.85,
+                        context={"type": "amenity", "semantic_meaning": "required_feature"}
+                    ))
+                    print(f"🔍 INTENT-DRIVEN: Found AMENITY entity: '{amenity}'")
     
-    def _extract_nearby_place_entities(self, doc, entities, text_lower):
+    def _extract_nearby_place_entities(self, entities, text_lower, hits):
         """Extract nearby place entities with distance context and specific place names"""
-        # Common nearby place types - these are NOT property amenities
-        nearby_place_types = [
-            # Transportation
-            "metro station", "metro", "bus stop", "bus", "railway station", "railway", "airport", "taxi stand", "auto stand",
-            "rickshaw stand", "cycle stand", "parking lot", "car park", "bike parking",
-            
-            # Healthcare & Education
-            "hospital", "clinic", "medical center", "pharmacy", "chemist", "school", "college", "university", "institute",
-            "training center", "coaching center", "daycare", "play school",
-            
-            # Shopping & Entertainment
-            "mall", "shopping center", "market", "supermarket", "hypermarket", "cinema", "theater", "multiplex",
-            "restaurant", "cafe", "food court", "bar", "pub", "club", "amusement park", "water park",
-            
-            # Essential Services
-            "bank", "atm", "post office", "police station", "police", "fire station", "fire brigade", "ambulance",
-            "gas station", "petrol pump", "service center", "repair shop",
-            
-            # Religious & Cultural
-            "temple", "mosque", "church", "gurudwara", "mandir", "masjid", "library", "museum", "art gallery",
-            "community center", "cultural center",
-            
-            # Recreation & Sports
-            "park", "garden", "playground", "sports complex", "stadium", "gym", "fitness center", "swimming pool",
-            "tennis court", "basketball court", "football ground", "cricket ground",
-            
-            # Business & Office
-            "office", "corporate office", "business center", "industrial area", "warehouse", "factory",
-            "co-working space", "startup hub", "tech park", "sez", "special economic zone"
-        ]
-        
-        # Distance patterns
-        distance_patterns = [
-            r'within\s+(\d+(?:\.\d+)?)\s*km',
-            r'(\d+(?:\.\d+)?)\s*km\s*(?:away|from|of)',
-            r'(\d+(?:\.\d+)?)\s*kilometer',
-            r'(\d+(?:\.\d+)?)\s*km\s*range',
-            r'walking\s+distance',
-            r'near\s+(\w+)',
-            r'close\s+to\s+(\w+)',
-            r'next\s+to\s+(\w+)'
-        ]
-        
-        # Extract distance information first
+        # Extract distance information first - a later distance phrasing overrides an earlier one
         distance_km = None
         distance_operator = "="
         
-        for pattern in distance_patterns:
-            matches = re.finditer(pattern, text_lower)
-            for match in matches:
-                if "walking" in match.group(0):
-                    distance_km = 1.0  # Walking distance typically within 1km
-                    distance_operator = "<="
-                    break
-                elif match.group(1):
-                    try:
-                        distance_km = float(match.group(1))
-                        if "within" in match.group(0):
-                            distance_operator = "<="
-                        elif "under" in match.group(0) or "below" in match.group(0):
-                            distance_operator = "<"
-                        elif "above" in match.group(0) or "over" in match.group(0):
-                            distance_operator = ">"
-                        else:
-                            distance_operator = "<="  # Default to <= for distance queries
-                        break
-                    except ValueError:
-                        continue
-        
-        # NEW: Extract specific place names with place types
-        # Pattern: "near [Specific Name] [Place Type]" or "[Specific Name] [Place Type]"
-        specific_place_patterns = [
-            # Pattern 1: "within X km of [Name] [Type]" - handle this first to avoid conflicts
-            r'within\s+(\d+(?:\.\d+)?)\s*km\s+of\s+([a-z]+(?:\s+[a-z]+)*)\s+(' + '|'.join(nearby_place_types) + ')',
-            # Pattern 2: "near [Name] [Type]" - but only if [Name] is not a common word
-            r'near\s+([a-z]+(?:\s+[a-z]+)*)\s+(' + '|'.join(nearby_place_types) + ')',
-            # Pattern 3: "close to [Name] [Type]" - but only if [Name] is not a common word
-            r'close\s+to\s+([a-z]+(?:\s+[a-z]+)*)\s+(' + '|'.join(nearby_place_types) + ')'
-            # Removed general case patterns that were too greedy and caused false matches
-        ]
+        distance_match = None
+        for alternative, match, groups in DISTANCE_PATTERNS.finditer(text_lower):
+            if distance_match is None or alternative > distance_match[0]:
+                distance_match = (alternative, groups)
+        
+        if distance_match is not None:
+            alternative, groups = distance_match
+            if alternative == WALKING_DISTANCE_ALTERNATIVE:
+                distance_km = 1.0  # Walking distance typically within 1km
+            else:
+                distance_km = float(groups[0])
+            distance_operator = "<="  # Default to <= for distance queries
         
         # Common words that should not be treated as place names
         common_words = ["properties", "property", "flats", "flat", "homes", "home", "houses", "house", "apartments", "apartment", "near", "close", "within", "km", "kilometer", "distance", "walking", "of", "to", "from"]
         
-        # Try to extract specific place names first
-        specific_place_found = False
-        for pattern in specific_place_patterns:
-            matches = re.finditer(pattern, text_lower)
-            for match in matches:
-                if len(match.groups()) >= 2:
-                    # Extract the specific name and place type
-                    if "within" in match.group(0) and "km" in match.group(0) and "of" in match.group(0):
-                        # Pattern: "within X km of [Name] [Type]" - group1 is distance, group2 is name, group3 is type
-                        place_name = match.group(2).strip()
-                        place_type = match.group(3).strip()
-                    elif "near" in match.group(0) or "close to" in match.group(0):
-                        # Pattern: "near [Name] [Type]" or "close to [Name] [Type]"
-                        place_name = match.group(1).strip()
-                        place_type = match.group(2).strip()
-                    else:
-                        # Pattern: "[Name] [Type]" or "[Type] [Name]"
-                        # Determine which is which based on whether it's a known place type
-                        group1 = match.group(1).strip()
-                        group2 = match.group(2).strip()
-                        
-                        if group1.lower() in nearby_place_types:
-                            place_type = group1
-                            place_name = group2
-                        elif group2.lower() in nearby_place_types:
-                            place_type = group2
-                            place_name = group1
-                        else:
-                            continue
-                    
-                    # Validate that we have both a name and type
-                    # Also validate that the place name is not a common word
-                    if (place_name and place_type and 
-                        place_type.lower() in nearby_place_types and
-                        place_name.lower() not in common_words and
-                        len(place_name) > 2):  # Ensure name is substantial
-                        
-                        # Additional validation: check if the place name contains any common words
-                        place_name_words = place_name.lower().split()
-                        if not any(word in common_words for word in place_name_words):
-                            entities.append(ExtractedEntity(
-                                text=f"{place_name} {place_type}",
-                                label="NEARBY_PLACE",
-                                start=match.start(),
-                                end=match.end(),
-                                confidence=0.95,
-                                context={
-                                    "type": "nearby_place",
-                                    "place_type": place_type.lower(),
-                                    "place_name": place_name,
-                                    "distance_km": distance_km,
-                                    "distance_operator": distance_operator,
-                                    "semantic_meaning": "specific_nearby_place"
-                                }
-                            ))
-                            print(f"🔍 INTENT-DRIVEN: Found SPECIFIC NEARBY_PLACE entity: '{place_name} {place_type}' with distance: {distance_km}km ({distance_operator})")
-                            specific_place_found = True
-                            break
-            if specific_place_found:
+        # Known place names from the nearby_places table win over pattern guesses,
+        # e.g. "near phoenix marketcity"
+        known_place_found = False
+        for hit in hits.first_occurrences("place_name"):
+            context_words = self._get_context_words(text_lower, hit.start, hit.end, 15)
+            nearby_indicators = ["near", "close", "within", "around", "next to", "nearby", "walking distance", "km", "kilometer"]
+            if any(indicator in context_words for indicator in nearby_indicators):
+                place_type = self.place_types.get(hit.term, "")
+                entities.append(ExtractedEntity(
+                    text=hit.term,
+                    label="NEARBY_PLACE",
+                    start=hit.start,
+                    end=hit.end,
+                    confidence=0.95,
+                    context={
+                        "type": "nearby_place",
+                        "place_type": place_type,
+                        "place_name": hit.term,
+                        "distance_km": distance_km,
+                        "distance_operator": distance_operator,
+                        "semantic_meaning": "specific_nearby_place"
+                    }
+                ))
+                print(f"🔍 INTENT-DRIVEN: Found KNOWN NEARBY_PLACE entity: '{hit.term}' ({place_type}) with distance: {distance_km}km ({distance_operator})")
+                known_place_found = True
                 break
         
-
-        
-        # Common words that should not be treated as place names
-        common_words = ["properties", "property", "flats", "flat", "homes", "home", "houses", "house", "apartments", "apartment", "near", "close", "within", "km", "kilometer", "distance", "walking", "of", "to", "from"]
+        # Try to extract specific place names: "within X km of [Name] [Type]" first,
+        # then "near [Name] [Type]", then "close to [Name] [Type]"
+        specific_place_found = known_place_found
+        candidates = [] if known_place_found else sorted(
+            SPECIFIC_PLACE_PATTERNS.finditer(text_lower),
+            key=lambda candidate: (candidate[0], candidate[1].start())
+        )
+        for alternative, match, (place_name, place_type) in candidates:
+            place_name = place_name.strip()
+            place_type = place_type.strip()
+            
+            # Validate that we have both a name and type
+            # Also validate that the place name is not a common word
+            if (place_name and place_type and 
+                place_type.lower() in NEARBY_PLACE_TYPES and
+                place_name.lower() not in common_words and
+                len(place_name) > 2):  # Ensure name is substantial
+                
+                # Additional validation: check if the place name contains any common words
+                place_name_words = place_name.lower().split()
+                if not any(word in common_words for word in place_name_words):
+                    entities.append(ExtractedEntity(
+                        text=f"{place_name} {place_type}",
+                        label="NEARBY_PLACE",
+                        start=match.start(),
+                        end=match.end(),
+                        confidence=0.95,
+                        context={
+                            "type": "nearby_place",
+                            "place_type": place_type.lower(),
+                            "place_name": place_name,
+                            "distance_km": distance_km,
+                            "distance_operator": distance_operator,
+                            "semantic_meaning": "specific_nearby_place"
+                        }
+                    ))
+                    print(f"🔍 INTENT-DRIVEN: Found SPECIFIC NEARBY_PLACE entity: '{place_name} {place_type}' with distance: {distance_km}km ({distance_operator})")
+                    specific_place_found = True
+                    break
         
-        # Try to extract specific place names first
-        specific_place_found = False
-        for pattern in specific_place_patterns:
-            matches = re.finditer(pattern, text_lower)
-            for match in matches:
-                if len(match.groups()) >= 2:
-                    # Extract the specific name and place type
-                    if "within" in match.group(0) and "km" in match.group(0) and "of" in match.group(0):
-                        # Pattern: "within X km of [Name] [Type]" - group1 is distance, group2 is name, group3 is type
-                        place_name = match.group(2).strip()
-                        place_type = match.group(3).strip()
-                    elif "near" in match.group(0) or "close to" in match.group(0):
-                        # Pattern: "near [Name] [Type]" or "close to [Name] [Type]"
-                        place_name = match.group(1).strip()
-                        place_type = match.group(2).strip()
-                    else:
-                        # Pattern: "[Name] [Type]" or "[Type] [Name]"
-                        # Determine which is which based on whether it's a known place type
-                        group1 = match.group(1).strip()
-                        group2 = match.group(2).strip()
-                        
-                        if group1.lower() in nearby_place_types:
-                            place_type = group1
-                            place_name = group2
-                        elif group2.lower() in nearby_place_types:
-                            place_type = group2
-                            place_name = group1
-                        else:
-                            continue
-                    
-                    # Validate that we have both a name and type
-                    # Also validate that the place name is not a common word
-                    if (place_name and place_type and 
-                        place_type.lower() in nearby_place_types and
-                        place_name.lower() not in common_words and
-                        len(place_name) > 2):  # Ensure name is substantial
+        # If no specific place name found, fall back to generic place type extraction
+        if not specific_place_found:
+            # Extract nearby place types - the gazetteer registers them longest first,
+            # so multi-word matches are tried before their single-word prefixes
+            for hit in hits.first_occurrences("nearby_place_type"):
+                place_type = hit.term
+                # Check if it's actually being requested as a nearby place
+                context_words = self._get_context_words(text_lower, hit.start, hit.end, 15)
+                
+                # Nearby place indicators
+                nearby_indicators = ["near", "close", "within", "around", "next to", "nearby", "walking distance", "km", "kilometer"]
+                
+                # Special handling for short place types like "metro" - require stronger context
+                if len(place_type) <= 4:  # Short place types like "metro", "bus"
+                    # Require stronger nearby context for short place types
+                    strong_indicators = ["within", "walking distance", "km", "kilometer"]
+                    if any(indicator in context_words for indicator in strong_indicators):
                         entities.append(ExtractedEntity(
-                            text=f"{place_name} {place_type}",
+                            text=place_type,
                             label="NEARBY_PLACE",
-                            start=match.start(),
-                            end=match.end(),
-                            confidence=0.95,
+                            start=hit.start,
+                            end=hit.end,
+                            confidence=0.9,
                             context={
                                 "type": "nearby_place",
-                                "place_type": place_type.lower(),
-                                "place_name": place_name,
+                                "place_type": place_type,
+                                "place_name": None,  # No specific name
                                 "distance_km": distance_km,
                                 "distance_operator": distance_operator,
-                                "semantic_meaning": "specific_nearby_place"
+                                "semantic_meaning": "generic_nearby_place"
                             }
                         ))
-                        print(f"🔍 INTENT-DRIVEN: Found SPECIFIC NEARBY_PLACE entity: '{place_name} {place_type}' with distance: {distance_km}km ({distance_operator})")
-                        specific_place_found = True
-                        break
-            if specific_place_found:
-                break
-        
-        # If no specific place name found, fall back to generic place type extraction
-        if not specific_place_found:
-            # Extract nearby place types - try multi-word matches first, then single words
-            # Sort by length (longest first) to prioritize multi-word matches
-            sorted_place_types = sorted(nearby_place_types, key=len, reverse=True)
-            
-            for place_type in sorted_place_types:
-                if place_type in text_lower:
-                    # Check if it's actually being requested as a nearby place
-                    context_words = self._get_context_words(text_lower, text_lower.find(place_type), text_lower.find(place_type) + len(place_type), 15)
-                    
-                    # Nearby place indicators
-                    nearby_indicators = ["near", "close", "within", "around", "next to", "nearby", "walking distance", "km", "kilometer"]
-                    
-                    # Special handling for short place types like "metro" - require stronger context
-                    if len(place_type) <= 4:  # Short place types like "metro", "bus"
-                        # Require stronger nearby context for short place types
-                        strong_indicators = ["within", "walking distance", "km", "kilometer"]
-                        if any(indicator in context_words for indicator in strong_indicators):
-                            entities.append(ExtractedEntity(
-                                text=place_type,
-                                label="NEARBY_PLACE",
-                                start=text_lower.find(place_type),
-                                end=text_lower.find(place_type) + len(place_type),
-                                confidence=0.9,
-                                context={
-                                    "type": "nearby_place",
-                                    "place_type": place_type,
-                                    "place_name": None,  # No specific name
-                                    "distance_km": distance_km,
-                                    "distance_operator": distance_operator,
-                                    "semantic_meaning": "generic_nearby_place"
-                                }
-                            ))
-                            print(f"🔍 INTENT-DRIVEN: Found GENERIC NEARBY_PLACE entity: '{place_type}' with distance: {distance_km}km ({distance_operator})")
-                            break  # Exit after finding first match
-                    else:
-                        # Regular nearby place detection for longer place types
-                        if any(indicator in context_words for indicator in nearby_indicators):
-                            entities.append(ExtractedEntity(
-                                text=place_type,
-                                label="NEARBY_PLACE",
-                                start=text_lower.find(place_type),
-                                end=text_lower.find(place_type) + len(place_type),
-                                confidence=0.9,
-                                context={
-                                    "type": "nearby_place",
-                                    "place_type": place_type,
-                                    "place_name": None,  # No specific name
-                                    "distance_km": distance_km,
-                                    "distance_operator": distance_operator,
-                                    "semantic_meaning": "generic_nearby_place"
-                                }
-                            ))
-                            print(f"🔍 INTENT-DRIVEN: Found GENERIC NEARBY_PLACE entity: '{place_type}' with distance: {distance_km}km ({distance_operator})")
-                            break  # Exit after finding first match
-    
+                        print(f"🔍 INTENT-DRIVEN: Found GENERIC NEARBY_PLACE entity: '{place_type}' with distance: {distance_km}km ({distance_operator})")
+                        break  # Exit after finding first match
+                else:
+                    # Regular nearby place detection for longer place types
+                    if any(indicator in context_words for indicator in nearby_indicators):
+                        entities.append(ExtractedEntity(
+                            text=place_type,
+                            label="NEARBY_PLACE",
+                            start=hit.start,
+                            end=hit.end,
+                            confidence=0.9,
+                            context={
+                                "type": "nearby_place",
+                                "place_type": place_type,
+                                "place_name": None,  # No specific name
+                                "distance_km": distance_km,
+                                "distance_operator": distance_operator,
+                                "semantic_meaning": "generic_nearby_place"
+                            }
+                        ))
+                        print(f"🔍 INTENT-DRIVEN: Found GENERIC NEARBY_PLACE entity: '{place_type}' with distance: {distance_km}km ({distance_operator})")
+                        break  # Exit after finding first match
+
     def _is_price_context(self, text_lower, start, end):
         """INTENT-DRIVEN: Determine if the matched text is actually about price"""
         # Get surrounding context
@@ -780,68 +828,47 @@ class RealEstateNLPEngine:
         """FALLBACK: Extract price information using simpler pattern matching"""
         print(f"🔍 FALLBACK: Attempting to extract price from: '{text_lower}'")
         
-        # Simple fallback patterns for common price expressions
-        fallback_patterns = [
-            # "under X crore/lakh" variations
-            r'(?:under|below|less\s+than)\s+(\d+(?:\.\d+)?)\s*(?:cr|crore|crores|lakh|lakhs)',
-            # "above X crore/lakh" variations  
-            r'(?:above|over|more\s+than)\s+(\d+(?:\.\d+)?)\s*(?:cr|crore|crores|lakh|lakhs)',
-            # "X crore/lakh" (exact)
-            r'(\d+(?:\.\d+)?)\s*(?:cr|crore|crores|lakh|lakhs)'
-        ]
-        
-        for i, pattern in enumerate(fallback_patterns):
-            matches = re.finditer(pattern, text_lower)
-            for match in matches:
-                try:
-                    value = float(match.group(1))
-                    unit = match.group(0).split()[-1]  # Get the unit from the matched text
-                    
-                    # Determine operator based on pattern index
-                    if i == 0:  # under/below/less than
-                        operator = "<"
-                        semantic_meaning = "less_than"
-                    elif i == 1:  # above/over/more than
-                        operator = ">"
-                        semantic_meaning = "more_than"
-                    else:  # exact
-                        operator = "="
-                        semantic_meaning = "exact"
-                    
-                    price_in_rupees = self._convert_to_rupees(value, unit)
-                    
-                    entities.append(ExtractedEntity(
-                        text=match.group(0),
-                        label="PRICE",
-                        start=text_lower.find(match.group(0)),
-                        end=text_lower.find(match.group(0)) + len(match.group(0)),
-                        confidence=0.8,  # Lower confidence for fallback
-                        context={
-                            "value": price_in_rupees,
-                            "operator": operator,
-                            "unit": unit,
-                            "original_value": value,
-                            "semantic_meaning": semantic_meaning
-                        }
-                    ))
-                    print(f"🔍 FALLBACK: Found PRICE entity: '{match.group(0)}' = {operator} {price_in_rupees} rupees")
-                    return  # Exit after first successful match
-                    
-                except (ValueError, IndexError) as e:
-                    print(f"🔍 FALLBACK: Error parsing fallback pattern: {e}")
-                    continue
-    
-    def classify_intent(self, text: str) -> Tuple[str, float]:
+        # Simple fallback patterns: under / above / exact amount, by alternative index
+        match = self._first_valid_match(PRICE_FALLBACK_PATTERNS, text_lower, lambda *_: True)
+        if match is None:
+            return
+        
+        match, (value_text,) = match
+        alternative = int(match.lastgroup[3:])
+        value = float(value_text)
+        unit = match.group(0).split()[-1]  # Get the unit from the matched text
+        operator, semantic_meaning = [("<", "less_than"), (">", "more_than"), ("=", "exact")][alternative]
+        price_in_rupees = self._convert_to_rupees(value, unit)
+        
+        entities.append(ExtractedEntity(
+            text=match.group(0),
+            label="PRICE",
+            start=match.start(),
+            end=match.end(),
+            confidence=0.8,  # Lower confidence for fallback
+            context={
+                "value": price_in_rupees,
+                "operator": operator,
+                "unit": unit,
+                "original_value": value,
+                "semantic_meaning": semantic_meaning
+            }
+        ))
+        print(f"🔍 FALLBACK: Found PRICE entity: '{match.group(0)}' = {operator} {price_in_rupees} rupees")
+    
+    def classify_intent(self, text: str, hits: Optional[GazetteerMatches] = None) -> Tuple[str, float]:
         """INTENT-DRIVEN: Classify intent based on semantic understanding"""
         text_lower = text.lower()
+        if hits is None:
+            hits = self.gazetteer.scan(text_lower)
         
         # INTENT-DRIVEN: Calculate confidence based on semantic indicators, not just keyword counting
         intent_scores = {}
         
         # SPECIAL CASE: Check for implicit property searches first
         # If query contains BHK + location, it's likely a property search even without explicit search words
-        has_bhk = any(word in text_lower for word in ["bhk", "bedroom", "bed room"])
-        has_location = any(word in text_lower for word in ["mumbai", "delhi", "bangalore", "hyderabad", "chennai", "kolkata", "pune", "baner", "wakad", "hinjewadi", "kharadi", "viman nagar", "koregaon park", "kalyani nagar", "aundh", "bavdhan", "pimpri", "chinchwad", "nigdi", "akurdi", "ravet", "moshi", "chakan", "talegaon", "lonavala", "khandala", "alibaug", "karjat", "panvel", "thane", "navi mumbai", "kalyan", "vasai", "vashi", "nerul", "belapur", "panvel", "ulwe", "dronagiri", "kharghar", "seawoods", "ghansoli", "airoli", "rabale", "mahape", "turbhe", "kopar khairane", "sanpada", "juinagar", "nerul", "seawoods", "belapur", "panvel", "ulwe", "dronagiri", "kharghar", "seawoods", "ghansoli", "airoli", "rabale", "mahape", "turbhe", "kopar khairane", "sanpada", "juinagar"])
+        has_bhk = hits.has("bhk_keyword")
+        has_location = hits.has("search_location")
         
         if has_bhk and has_location:
             # This is definitely a property search
@@ -852,14 +879,10 @@ class RealEstateNLPEngine:
             score = 0
             
             # Check semantic indicators (primary)
-            for indicator in intent_info["semantic_indicators"]:
-                if indicator in text_lower:
-                    score += 2  # Higher weight for semantic indicators
+            score += 2 * len(hits.terms(f"intent:{intent_name}:semantic"))  # Higher weight for semantic indicators
             
             # Check context indicators (secondary)
-            for indicator in intent_info["context_indicators"]:
-                if indicator in text_lower:
-                    score += 1  # Lower weight for context indicators
+            score += len(hits.terms(f"intent:{intent_name}:context"))  # Lower weight for context indicators
             
             if score > 0:
                 # Normalize score
@@ -874,57 +897,188 @@ class RealEstateNLPEngine:
     
     def process_query(self, query: str) -> QueryIntent:
         """INTENT-DRIVEN: Process query with semantic understanding"""
+        plan = self.plan_query(query)
+        return QueryIntent(
+            intent=plan.intent,
+            confidence=plan.confidence,
+            entities=copy.deepcopy(list(plan.entities))
+        )
+    
+    def plan_query(self, query: str) -> QueryPlan:
+        """INTENT-DRIVEN: Parse the query once and return an immutable search plan
+        
+        Plans are cached by case- and whitespace-normalized text, so repeated
+        queries skip spaCy and the regex layer entirely.
+        """
+        plan = self.lookup_plan(query)
+        if plan is not None:
+            return plan
+        
+        generation = self.query_cache.generation
+        plan = self.parse_query(query)
+        self.store_plan(plan, generation)
+        return plan
+    
+    def plan_queries(self, queries: List[str]) -> List[QueryPlan]:
+        """Batch counterpart of plan_query: cached plans are reused, the rest go through parse_queries"""
+        plans: List[Optional[QueryPlan]] = [self.lookup_plan(query) for query in queries]
+        
+        # Identical (normalized) queries are parsed once
+        pending: Dict[str, str] = {}
+        for query, plan in zip(queries, plans):
+            if plan is None:
+                pending.setdefault(normalize_query(query), query)
+        
+        if pending:
+            generation = self.query_cache.generation
+            parsed = dict(zip(pending, self.parse_queries(list(pending.values()))))
+            for plan in parsed.values():
+                self.store_plan(plan, generation)
+            plans = [
+                plan if plan is not None else self._with_query(parsed[normalize_query(query)], query)
+                for query, plan in zip(queries, plans)
+            ]
+        return plans
+    
+    def parse_queries(self, queries: List[str]) -> List[QueryPlan]:
+        """Parse several queries, running spaCy once via nlp.pipe for those the rules cannot resolve"""
+        scans = [self.gazetteer.scan((query or "").lower()) for query in queries]
+        
+        docs = [None] * len(queries)
+        ner_indexes = [i for i, query in enumerate(queries) if self.needs_ner((query or "").lower(), scans[i])]
+        if ner_indexes:
+            for i, doc in zip(ner_indexes, self.nlp.pipe([queries[i] for i in ner_indexes])):
+                docs[i] = doc
+        
+        return [self.parse_query(query, hits, doc) for query, hits, doc in zip(queries, scans, docs)]
+    
+    def _with_query(self, plan: QueryPlan, query: str) -> QueryPlan:
+        return plan if plan.query == query else replace(plan, query=query)
+    
+    def lookup_plan(self, query: str) -> Optional[QueryPlan]:
+        """Return the cached plan for a query, or None if it has to be parsed"""
+        plan = self.query_cache.get(normalize_query(query))
+        return None if plan is None else self._with_query(plan, query)
+    
+    def store_plan(self, plan: QueryPlan, generation: Optional[int] = None):
+        """Cache a plan parsed elsewhere (e.g. in a worker process)"""
+        self.query_cache.put(normalize_query(plan.query), plan, generation)
+    
+    def parse_query(self, query: str, hits: Optional[GazetteerMatches] = None, doc=None) -> QueryPlan:
+        """Run the full extraction pipeline for one query, bypassing the cache"""
+        query_lower = (query or "").lower()
+        
+        # One gazetteer pass shared by entity extraction and intent classification
+        if hits is None:
+            hits = self.gazetteer.scan(query_lower)
+        
         # Extract entities with full context
-        entities = self.extract_entities_with_context(query)
+        entities = self.extract_entities_with_context(query, hits, doc)
         
         # Classify intent semantically
-        intent, confidence = self.classify_intent(query)
+        intent, confidence = self.classify_intent(query, hits)
         
-        return QueryIntent(
+        plan_fields = self._extract_query_flags(query_lower)
+        plan_fields["amenity_match"] = self._amenity_match(query_lower, entities)
+        
+        return QueryPlan(
+            query=query,
             intent=intent,
             confidence=confidence,
-            entities=entities
+            entities=tuple(entities),
+            filters=self._build_filters(entities),
+            **plan_fields
         )
     
     def get_search_criteria(self, query: str) -> Dict:
         """INTENT-DRIVEN: Convert semantically understood query to search criteria"""
-        intent_result = self.process_query(query)
-        
-        criteria = {
-            "intent": intent_result.intent,
-            "confidence": intent_result.confidence,
-            "filters": {}
-        }
+        return self.plan_query(query).to_criteria()
+    
+    def _build_filters(self, entities: List[ExtractedEntity]) -> Dict:
+        """INTENT-DRIVEN: Extract filters from entities with their semantic context"""
+        filters = {}
         
-        # INTENT-DRIVEN: Extract filters from entities with their semantic context
-        for entity in intent_result.entities:
+        for entity in entities:
             if entity.label == "LOCATION":
-                criteria["filters"]["location"] = entity.text
+                filters["location"] = entity.text
             elif entity.label == "BHK":
-                criteria["filters"]["bhk"] = entity.context["value"]
-                criteria["filters"]["bhk_operator"] = entity.context["operator"]
+                filters["bhk"] = entity.context["value"]
+                filters["bhk_operator"] = entity.context["operator"]
             elif entity.label == "PRICE":
                 # Use the semantic context directly - no need for separate extraction
-                criteria["filters"]["price_range"] = entity.text
-                criteria["filters"]["price_operator"] = entity.context["operator"]
-                criteria["filters"]["price_value"] = entity.context["value"]
+                filters["price_range"] = entity.text
+                filters["price_operator"] = entity.context["operator"]
+                filters["price_value"] = entity.context["value"]
             elif entity.label == "CARPET_AREA":
-                criteria["filters"]["carpet_area"] = entity.text
-                criteria["filters"]["area_operator"] = entity.context["operator"]
-                criteria["filters"]["area_value"] = entity.context["value"]
+                filters["carpet_area"] = entity.text
+                filters["area_operator"] = entity.context["operator"]
+                filters["area_value"] = entity.context["value"]
             elif entity.label == "AMENITY":
-                if "amenities" not in criteria["filters"]:
-                    criteria["filters"]["amenities"] = []
-                criteria["filters"]["amenities"].append(entity.text)
+                if "amenities" not in filters:
+                    filters["amenities"] = []
+                filters["amenities"].append(entity.text)
             elif entity.label == "NEARBY_PLACE":
-                criteria["filters"]["nearby_place"] = {
+                filters["nearby_place"] = {
                     "place_type": entity.context["place_type"],
                     "place_name": entity.context.get("place_name"),  # Include specific place name if available
                     "distance_km": entity.context["distance_km"],
                     "distance_operator": entity.context["distance_operator"]
                 }
         
-        return criteria
+        return filters
+    
+    def _extract_query_flags(self, query_lower: str) -> Dict:
+        """Extract project status, "within X km of", balcony and feature flags from the raw query"""
+        flags = {}
+        
+        # Project-level status phrases
+        if "ready to move" in query_lower or "ready-to-move" in query_lower or "ready to occupy" in query_lower:
+            flags["project_status"] = "ready_to_move"
+        elif "under construction" in query_lower or "under-construction" in query_lower or "uc" in query_lower:
+            flags["project_status"] = "under_construction"
+        elif "completed" in query_lower or "ready" in query_lower and "move" not in query_lower:
+            # Broad 'completed' catch; avoid double-catching ready-to-move which includes 'ready'
+            flags["project_status"] = "completed"
+        
+        # "within X km of <place>"
+        within_match = WITHIN_PLACE_PATTERN.search(query_lower)
+        if within_match:
+            flags["within_km"] = float(within_match.group(1))
+            flags["within_place"] = within_match.group(2).strip()
+            
+            # Explicit BHK number stated alongside the distance clause
+            bhk_match = EXPLICIT_BHK_PATTERN.search(query_lower)
+            if bhk_match:
+                flags["explicit_bhk"] = int(bhk_match.group(1))
+        
+        # "with N balconies"
+        balc_match = BALCONY_PATTERN.search(query_lower)
+        if balc_match:
+            flags["min_balconies"] = int(balc_match.group(1))
+        
+        # "garden view" room feature
+        if "garden view" in query_lower:
+            flags["garden_view"] = True
+        
+        return flags
+    
+    def _amenity_match(self, query_lower: str, entities: List[ExtractedEntity]) -> str:
+        """"any" for "gym or pool" / "either a gym or a pool" / "any of gym, pool"; otherwise "all".
+        
+        Only the text between consecutive amenity mentions and just before the
+        first one counts, so "2 or 3 bhk with gym and pool" still needs both.
+        """
+        amenities = sorted((entity for entity in entities if entity.label == "AMENITY"), key=lambda entity: entity.start)
+        if len(amenities) < 2:
+            return "all"
+        prefix = query_lower[max(amenities[0].start - AMENITY_CONNECTOR_MAX_CHARS, 0):amenities[0].start]
+        if AMENITY_ANY_PREFIX_PATTERN.search(prefix):
+            return "any"
+        for previous, following in zip(amenities, amenities[1:]):
+            gap = query_lower[previous.end:following.start]
+            if len(gap) <= AMENITY_CONNECTOR_MAX_CHARS and AMENITY_OR_PATTERN.search(gap):
+                return "any"
+        return "all"
     
     def get_suggestions(self, partial_query: str) -> List[str]:
         """Get search suggestions based on partial query"""
@@ -0,0 +1,184 @@
+"""
+NLP Worker Pool
+Runs query parsing off the event loop, in worker processes that each hold a preloaded spaCy model
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, NamedTuple, Optional
+
+from .nlp_engine import QueryPlan, RealEstateNLPEngine
+
+# Engine owned by the current worker process, created once by _init_worker
+_worker_engine: Optional[RealEstateNLPEngine] = None
+
+def _init_worker(location_snapshot: Optional[Dict]):
+    """Load the spaCy model and the parent's location dictionary into this worker"""
+    global _worker_engine
+    _worker_engine = RealEstateNLPEngine()
+    if location_snapshot:
+        _worker_engine.update_locations(**location_snapshot)
+
+def _parse_in_worker(query: str) -> QueryPlan:
+    return _worker_engine.parse_query(query)
+
+def _parse_batch_in_worker(queries: List[str]) -> List[QueryPlan]:
+    return _worker_engine.parse_queries(queries)
+
+class _Workers(NamedTuple):
+    executor: ProcessPoolExecutor
+    generation: int  # Query cache generation of the location dictionary the workers loaded
+
+class NLPWorkerPool:
+    """Parses queries without blocking the event loop.
+
+    With ``workers > 0`` parsing runs in a process pool (spawned, so workers
+    never inherit the server's threads); with ``workers == 0`` it runs on the
+    default thread pool. Either way the parent engine's query cache is checked
+    first, so cache hits never leave the event loop.
+
+    Workers copy the location dictionary when they start. After a gazetteer
+    change ``schedule_recycle()`` replaces them at most once per
+    ``recycle_delay_seconds``, so a burst of changes reloads spaCy once; until
+    then their plans are answered but not cached.
+    """
+
+    def __init__(self, nlp_engine: RealEstateNLPEngine, workers: int = 0, recycle_delay_seconds: float = 60):
+        self.nlp_engine = nlp_engine
+        self.workers = max(workers, 0)
+        self.recycle_delay_seconds = recycle_delay_seconds
+        self._workers: Optional[_Workers] = None
+        self._lock = threading.Lock()
+        self._recycle_timer: Optional[threading.Timer] = None
+
+    @property
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        workers = self._workers
+        return workers.executor if workers else None
+
+    def start(self):
+        """Spin up the worker processes (no-op in thread mode)"""
+        if self.workers:
+            with self._lock:
+                if self._workers is None:
+                    self._workers = self._new_workers()
+            print(f"✅ NLP worker pool started with {self.workers} processes")
+
+    def _new_workers(self) -> _Workers:
+        generation = self.nlp_engine.query_cache.generation
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.nlp_engine.location_snapshot(),)
+        )
+        return _Workers(executor, generation)
+
+    def schedule_recycle(self):
+        """Recycle after ``recycle_delay_seconds``; further calls before then share that one recycle"""
+        if not self.workers:
+            return
+        with self._lock:
+            if self._workers is None or self._recycle_timer is not None:
+                return
+            self._recycle_timer = threading.Timer(self.recycle_delay_seconds, self.recycle)
+            self._recycle_timer.daemon = True
+            self._recycle_timer.start()
+
+    def recycle(self):
+        """Replace the workers so they load the engine's current location dictionary"""
+        if not self.workers:
+            return
+        with self._lock:
+            self._recycle_timer = None
+            if self._workers is None:
+                return  # Shut down meanwhile
+            old_workers, self._workers = self._workers, self._new_workers()
+        # Queries already submitted still finish on the old workers
+        old_workers.executor.shutdown(wait=False)
+
+    def shutdown(self):
+        with self._lock:
+            workers, self._workers = self._workers, None
+            timer, self._recycle_timer = self._recycle_timer, None
+        if timer:
+            timer.cancel()
+        if workers:
+            workers.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run_in_workers(self, calls):
+        """Run [(fn, arg), ...] on the current workers; returns (results, workers generation), or None in thread mode.
+
+        recycle() can shut an executor down between reading it and submitting
+        to it; submit then raises RuntimeError and the calls are retried once
+        on the executor that replaced it.
+        """
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            workers = self._workers
+            if workers is None:
+                return None
+            try:
+                futures = [loop.run_in_executor(workers.executor, fn, arg) for fn, arg in calls]
+            except RuntimeError:
+                if attempt or self._workers is workers:
+                    raise
+                continue
+            return await asyncio.gather(*futures), workers.generation
+
+    async def plan_query(self, query: str) -> QueryPlan:
+        """Async counterpart of RealEstateNLPEngine.plan_query"""
+        plan = self.nlp_engine.lookup_plan(query)
+        if plan is not None:
+            return plan
+
+        generation = self.nlp_engine.query_cache.generation
+        try:
+            outcome = await self._run_in_workers([(_parse_in_worker, query)])
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM) - replace the pool and answer this query in-process
+            print("⚠️ NLP worker pool broken, restarting it")
+            self.recycle()
+            outcome = None
+        if outcome is None:
+            plan = await asyncio.to_thread(self.nlp_engine.parse_query, query)
+        else:
+            (plan,), workers_generation = outcome
+            # Workers still on an older location dictionary: answer, but do not cache
+            generation = min(generation, workers_generation)
+
+        self.nlp_engine.store_plan(plan, generation)
+        return plan
+
+    async def plan_queries(self, queries: List[str]) -> List[QueryPlan]:
+        """Async counterpart of RealEstateNLPEngine.plan_queries; misses are split across the workers"""
+        executor = self._executor
+        if executor is None:
+            return await asyncio.to_thread(self.nlp_engine.plan_queries, queries)
+
+        plans = [self.nlp_engine.lookup_plan(query) for query in queries]
+        pending = list(dict.fromkeys(query for query, plan in zip(queries, plans) if plan is None))
+        if pending:
+            generation = self.nlp_engine.query_cache.generation
+            chunk_size = -(-len(pending) // self.workers)
+            chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+            try:
+                outcome = await self._run_in_workers([(_parse_batch_in_worker, chunk) for chunk in chunks])
+            except BrokenProcessPool:
+                print("⚠️ NLP worker pool broken, restarting it")
+                self.recycle()
+                outcome = None
+            if outcome is None:
+                parsed_chunks = [await asyncio.to_thread(self.nlp_engine.parse_queries, pending)]
+            else:
+                parsed_chunks, workers_generation = outcome
+                generation = min(generation, workers_generation)
+
+            parsed = {plan.query: plan for chunk in parsed_chunks for plan in chunk}
+            for plan in parsed.values():
+                self.nlp_engine.store_plan(plan, generation)
+            plans = [plan if plan is not None else parsed[query] for query, plan in zip(queries, plans)]
+        return plans
@@ -0,0 +1,91 @@
+"""
+Pagination Helpers
+Opaque keyset cursors for list endpoints ordered by (sell_price, id) or (name, id), and planner-estimated totals
+"""
+
+import base64
+import json
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import tuple_
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Serialize the sort key of the last row into an opaque, URL-safe cursor"""
+    payload = json.dumps(values, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Inverse of encode_cursor; raises ValueError for anything that is not a cursor we issued"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    if not isinstance(values, dict):
+        raise ValueError("Invalid cursor")
+    return values
+
+def price_cursor(price, row_id, *tie_breakers) -> str:
+    """Cursor pointing just past a row in (sell_price, id, *tie_breakers) order"""
+    values = {"p": str(price), "id": str(row_id)}
+    if tie_breakers:
+        values["t"] = [str(value) for value in tie_breakers]
+    return encode_cursor(values)
+
+def decode_price_cursor(cursor: Optional[str], tie_breakers: int = 0) -> Optional[Tuple]:
+    """(sell_price, id, *tie_breakers) of the last row of the previous page, or None for the first page"""
+    if not cursor:
+        return None
+    values = decode_cursor(cursor)
+    try:
+        price = Decimal(values["p"])
+        ties = [str(value) for value in values.get("t", [])]
+        if len(ties) != tie_breakers:
+            raise ValueError("Invalid cursor")
+        return (price, str(values["id"]), *ties)
+    except (KeyError, TypeError, InvalidOperation):
+        raise ValueError("Invalid cursor")
+
+def after_price_cursor(price_column, id_column, position: Tuple, *tie_columns):
+    """Filter for rows strictly after ``position`` in (price, id, *tie_columns) order (a row comparison, so it can use an index)"""
+    return tuple_(price_column, id_column, *tie_columns) > tuple_(*position)
+
+def name_cursor(name, row_id) -> str:
+    """Cursor pointing just past a row in (name, id) order"""
+    return encode_cursor({"n": name, "id": str(row_id)})
+
+def decode_name_cursor(cursor: Optional[str]) -> Optional[Tuple[str, str]]:
+    """(name, id) of the last row of the previous page, or None for the first page"""
+    if not cursor:
+        return None
+    values = decode_cursor(cursor)
+    try:
+        return str(values["n"]), str(values["id"])
+    except (KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+
+def after_position(columns, position: Tuple):
+    """Filter for rows strictly after ``position`` in the order of ``columns``"""
+    return tuple_(*columns) > tuple_(*position)
+
+def _explain_rows(connection, statement) -> int:
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+def approximate_count(session, statement) -> Optional[int]:
+    """Row count the planner estimates for ``statement`` - costs a plan, not a scan, whatever the page depth.
+
+    Returns None if the estimate cannot be obtained (e.g. not on PostgreSQL).
+    """
+    try:
+        return _explain_rows(session.connection(), statement)
+    except Exception as e:
+        print(f"⚠️ Could not estimate total: {e}")
+        return None
@@ -0,0 +1,571 @@
+"""
+In-Memory Property Index
+Columnar NumPy copy of the searchable catalogue; evaluates NLP filter plans with vectorized masks
+"""
+
+import asyncio
+import bisect
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency - SEARCH_BACKEND=memory falls back to SQL without it
+    np = None
+
+from sqlalchemy import String, cast, func, or_, select
+
+from database import SessionLocal
+from models.project import Project
+from models.property import Property
+from models.location import Location
+from models.project_location import ProjectLocation
+from models.amenity import Amenity
+from models.project_amenity import ProjectAmenity
+from models.nearby_place import NearbyPlace
+from models.room_specification import RoomSpecification
+from models.project_media import ProjectMedia
+
+from .search_doc import COMPARATORS, PROJECT_STATUS_CODES, GENERIC_PROPERTY_TYPES
+from .amenity_bits import WORD_BITS, amenity_masks
+from .geo_index import USE_GEO_INDEX, geo_index
+from .result_cache import result_cache
+from . import facets, ranking
+
+class _IndexRow(NamedTuple):
+    """One searchable (property, project location) pair"""
+    property_id: str
+    location_id: str
+    project_id: str
+    city: Optional[str]
+    locality: Optional[str]
+    project_status_code: int
+    is_sold: bool
+    property_type: Optional[str]
+    bhk_count: Optional[float]
+    sell_price: Optional[float]
+    carpet_area_sqft: Optional[float]
+    amenities: Tuple[str, ...]  # Lower-cased amenity names of the project
+    nearby_min_km: Dict[str, float]  # Lower-cased place type -> minimum distance (inf if none has a distance)
+    nearby_named_km: Dict[Tuple[str, str], float]  # Lower-cased (place type, place name) -> minimum distance
+    balcony_count: int
+    garden_view: bool
+    has_media: bool  # Project has active media
+
+def _project_status_code(project_status: Optional[str]) -> int:
+    """Python twin of the CASE expression in property_search_doc"""
+    status = (project_status or "").lower()
+    if re.search(r"ready.*move", status):
+        return PROJECT_STATUS_CODES["ready_to_move"]
+    if re.search(r"under.*construction", status):
+        return PROJECT_STATUS_CODES["under_construction"]
+    if "completed" in status:
+        return PROJECT_STATUS_CODES["completed"]
+    return 0
+
+def _float(value) -> float:
+    return float(value) if value is not None else float("nan")
+
+def _page_key(sell_price, property_id: str, location_id: str) -> tuple:
+    """Python twin of ORDER BY sell_price, property id, location id (NULL prices last)"""
+    return (sell_price is None, float(sell_price) if sell_price is not None else 0.0, property_id, location_id)
+
+class _Snapshot:
+    """Immutable column arrays built from a list of rows"""
+
+    def __init__(self, rows: List[_IndexRow]):
+        # Rows are kept in result page order, so matches come out already sorted
+        rows = sorted(rows, key=lambda row: _page_key(row.sell_price, row.property_id, row.location_id))
+        self.page_keys = [_page_key(row.sell_price, row.property_id, row.location_id) for row in rows]
+        self.keys = [(row.property_id, row.location_id) for row in rows]
+        _, self.property_code = self._encode(row.property_id for row in rows)
+        self.size = len(rows)
+
+        self.sell_price = np.array([_float(row.sell_price) for row in rows], dtype=np.float64)
+        self.carpet_area = np.array([_float(row.carpet_area_sqft) for row in rows], dtype=np.float64)
+        self.bhk = np.array([_float(row.bhk_count) for row in rows], dtype=np.float64)
+        self.is_sold = np.array([row.is_sold for row in rows], dtype=bool)
+        self.status_code = np.array([row.project_status_code for row in rows], dtype=np.int8)
+        self.balconies = np.array([row.balcony_count for row in rows], dtype=np.int16)
+        self.garden_view = np.array([row.garden_view for row in rows], dtype=bool)
+        self.has_media = np.array([row.has_media for row in rows], dtype=bool)
+
+        self.city_vocab, self.city_code = self._encode(row.city for row in rows)
+        self.locality_vocab, self.locality_code = self._encode(row.locality for row in rows)
+        self.type_vocab, self.type_code = self._encode(row.property_type for row in rows)
+
+        # Amenity bitsets: bit i of row r is set when the project has amenity_vocab[i]
+        self.amenity_vocab = sorted({name for row in rows for name in row.amenities})
+        self.amenity_bit = {name: i for i, name in enumerate(self.amenity_vocab)}
+        words = max(1, -(-len(self.amenity_vocab) // WORD_BITS))
+        self.amenity_bits = np.zeros((self.size, words), dtype=np.uint64)
+        for r, row in enumerate(rows):
+            for name in row.amenities:
+                bit = self.amenity_bit[name]
+                self.amenity_bits[r, bit // WORD_BITS] |= np.uint64(1 << (bit % WORD_BITS))
+
+        # Nearby distance matrix: minimum distance per (row, place type); NaN when the project has
+        # no such place, inf when it has one without a distance (matches an unbounded "near metro")
+        self.nearby_types = sorted({place_type for row in rows for place_type in row.nearby_min_km})
+        type_column = {place_type: i for i, place_type in enumerate(self.nearby_types)}
+        self.nearby_km = np.full((self.size, max(1, len(self.nearby_types))), np.nan, dtype=np.float32)
+        for r, row in enumerate(rows):
+            for place_type, distance in row.nearby_min_km.items():
+                self.nearby_km[r, type_column[place_type]] = distance
+
+        # Named places are per project, so that matrix is (project, place) and rows index into it
+        project_vocab, self.project_code = self._encode(row.project_id for row in rows)
+        self.project_row = {project_id: r for r, project_id in enumerate(project_vocab)}
+        self.named_places = sorted({place for row in rows for place in row.nearby_named_km})
+        named_column = {place: i for i, place in enumerate(self.named_places)}
+        self.named_km = np.full((max(1, len(project_vocab)), max(1, len(self.named_places))), np.nan, dtype=np.float32)
+        for row in rows:
+            for place, distance in row.nearby_named_km.items():
+                self.named_km[self.project_row[row.project_id.lower()], named_column[place]] = distance
+
+    @staticmethod
+    def _encode(values):
+        """Dictionary-encode lower-cased strings; -1 for NULL"""
+        vocab: Dict[str, int] = {}
+        codes = [vocab.setdefault(value.lower(), len(vocab)) if value else -1 for value in values]
+        return list(vocab), np.array(codes, dtype=np.int32)
+
+    @staticmethod
+    def _containing(vocab: List[str], term: str) -> List[int]:
+        """Indexes of vocabulary entries containing the term (ILIKE '%term%')"""
+        term = term.lower()
+        return [i for i, value in enumerate(vocab) if term in value]
+
+    def _nearest_by_type(self, place_type: str):
+        """Per-row distance to the nearest place whose type contains the term (NaN if none, inf if none has a distance)"""
+        columns = self._containing(self.nearby_types, place_type)
+        if not columns:
+            return np.full(self.size, np.nan, dtype=np.float32)
+        return np.fmin.reduce(self.nearby_km[:, columns], axis=1)
+
+    def _project_codes(self, project_ids) -> List[int]:
+        return [self.project_row[project_id.lower()] for project_id in project_ids if project_id.lower() in self.project_row]
+
+    def _nearest_named(self, matches):
+        """Per-row distance to the nearest named place for which ``matches(type, name)`` holds (NaN / inf as above)"""
+        columns = [i for i, (place_type, place_name) in enumerate(self.named_places) if matches(place_type, place_name)]
+        if not columns:
+            return np.full(self.size, np.nan, dtype=np.float32)
+        return np.fmin.reduce(self.named_km[:, columns], axis=1)[self.project_code]
+
+    def search(self, plan, limit: int, after: Optional[Tuple] = None) -> Optional[List[Tuple[str, str]]]:
+        """(property_id, location_id) keys matching the plan in page order, after the (sell_price, property id,
+        location id) position if given, or None if a filter is unsupported"""
+        mask = self._match(plan)
+        if mask is None:
+            return None
+        if after is not None:
+            mask[:bisect.bisect_right(self.page_keys, _page_key(*after))] = False
+        return [self.keys[i] for i in np.flatnonzero(mask)[:limit]]
+
+    def count(self, plan) -> Optional[int]:
+        mask = self._match(plan)
+        return int(mask.sum()) if mask is not None else None
+
+    def facet_counts(self, plan) -> Optional[Dict[str, Dict]]:
+        """facet -> {value: distinct matching properties} in the shape of facets.counts_from_rows, or None if a
+        filter is unsupported"""
+        mask = self._match(plan)
+        if mask is None:
+            return None
+        rows = np.flatnonzero(mask)
+        # A property listed under several locations counts once (per locality for the locality facet)
+        _, first = np.unique(self.property_code[rows], return_index=True)
+        properties = rows[first]
+        counts = {facet: {} for facet in facets.FACETS}
+
+        bhk = self.bhk[properties]
+        for value, count in zip(*np.unique(bhk[~np.isnan(bhk)], return_counts=True)):
+            counts["bhk"][float(value)] = int(count)
+        bounds = [upper for upper, _ in facets.PRICE_BANDS if upper is not None]
+        price = self.sell_price[properties]
+        bands = np.searchsorted(np.array(bounds, dtype=np.float64), price[~np.isnan(price)], side="right")
+        for band, count in zip(*np.unique(bands, return_counts=True)):
+            counts["price_band"][int(band)] = int(count)
+        for code, count in zip(*np.unique(self.status_code[properties], return_counts=True)):
+            counts["project_status"][int(code)] = int(count)
+
+        pairs = np.unique(np.stack([self.property_code[rows], self.locality_code[rows]], axis=1), axis=0)
+        for code, count in zip(*np.unique(pairs[:, 1], return_counts=True)):
+            if code >= 0:
+                counts["locality"][self.locality_vocab[code]] = int(count)
+
+        if self.amenity_vocab:
+            bits = np.unpackbits(self.amenity_bits[properties].view(np.uint8), axis=1, bitorder="little")
+            for bit, count in enumerate(bits.sum(axis=0)[:len(self.amenity_vocab)]):
+                if count:
+                    counts["amenity"][self.amenity_vocab[bit]] = int(count)
+        return counts
+
+    def rank(self, plan, k: int) -> Optional[List[Tuple[str, str, float]]]:
+        """The k best (property_id, location_id, score) matches by ranking.relevance_expression's model, or None if a
+        filter is unsupported. Only matches are scored, and argpartition selects the top k without sorting them all."""
+        mask = self._match(plan)
+        if mask is None:
+            return None
+        rows = np.flatnonzero(mask)
+        if rows.size == 0 or k <= 0:
+            return []
+        scores = self._relevance(plan, rows)
+        if rows.size > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[best], scores[best]
+        # Best first; ties in page order like the SQL ORDER BY
+        order = np.lexsort((rows, -scores))
+        return [(*self.keys[rows[i]], float(scores[i])) for i in order]
+
+    def _relevance(self, plan, rows):
+        filters = plan.filters
+        weights = ranking.component_weights(plan)
+        score = np.zeros(rows.size, dtype=np.float64)
+
+        if "entities" in weights:
+            strength = np.zeros(rows.size, dtype=np.float64)
+            total = 0.0
+            for name, confidence in ranking.entity_terms(plan):
+                if name == "location":
+                    value = filters["location"].strip().lower()
+                    exact = (
+                        np.isin(self.locality_code[rows], [i for i, v in enumerate(self.locality_vocab) if v == value])
+                        | np.isin(self.city_code[rows], [i for i, v in enumerate(self.city_vocab) if v == value])
+                    )
+                else:
+                    exact = self.bhk[rows] == float(filters["bhk"])
+                strength += confidence * np.where(exact, 1.0, ranking.PARTIAL_MATCH)
+                total += confidence
+            score += weights["entities"] * strength / total
+
+        if "price" in weights:
+            budget = float(filters["price_value"])
+            score += weights["price"] * (1.0 - np.minimum(np.abs(self.sell_price[rows] - budget) / budget, 1.0))
+
+        if "nearby" in weights:
+            place_type, place_name, scale_km, match_names = ranking.nearby_target(plan)
+            if place_name:
+                nearest = self._nearest_named(lambda t, n: place_type in t and place_name in n)
+            else:
+                nearest = self._nearest_by_type(place_type)
+            if match_names:
+                nearest = np.fmin(nearest, self._nearest_named(lambda t, n: place_type in n))
+            # No place, or none with a distance, scores like one at scale_km (coalesce in SQL)
+            distance = np.fmin(nearest[rows].astype(np.float64), scale_km)
+            score += weights["nearby"] * (1.0 - distance / scale_km)
+
+        score += weights["media"] * self.has_media[rows]
+
+        status = self.status_code[rows]
+        preference = np.full(rows.size, ranking.OTHER_STATUS_PREFERENCE)
+        for code, value in ranking.STATUS_PREFERENCE.items():
+            preference[status == code] = value
+        score += weights["status"] * preference
+        return score
+
+    def _match(self, plan):
+        """Boolean row mask for the plan, or None if a filter is unsupported"""
+        filters = plan.filters
+        mask = ~self.is_sold
+
+        if "location" in filters:
+            location = filters["location"]
+            mask &= (
+                np.isin(self.city_code, self._containing(self.city_vocab, location))
+                | np.isin(self.locality_code, self._containing(self.locality_vocab, location))
+            )
+
+        if plan.project_status in PROJECT_STATUS_CODES:
+            mask &= self.status_code == PROJECT_STATUS_CODES[plan.project_status]
+
+        if "bhk" in filters:
+            compare = COMPARATORS.get(filters.get("bhk_operator", "="))
+            if compare:
+                mask &= compare(self.bhk, float(filters["bhk"]))
+
+        if "property_type" in filters:
+            prop_type = filters["property_type"].lower()
+            if prop_type not in GENERIC_PROPERTY_TYPES and not any(term in prop_type for term in ['bhk', 'bedroom', 'bed']):
+                mask &= np.isin(self.type_code, self._containing(self.type_vocab, prop_type))
+
+        if "price_range" in filters:
+            if filters.get("price_value") is None:
+                return None
+            compare = COMPARATORS.get(filters.get("price_operator", "="))
+            if compare:
+                mask &= compare(self.sell_price, float(filters["price_value"]))
+
+        if "carpet_area" in filters and filters.get("area_value") is not None:
+            compare = COMPARATORS.get(filters.get("area_operator", "="))
+            if compare is None:
+                return None
+            mask &= compare(self.carpet_area, float(filters["area_value"]))
+
+        if filters.get("amenities"):
+            masks = amenity_masks(self.amenity_bit, filters["amenities"], plan.amenity_match == "all")
+            if masks is None:
+                return np.zeros(self.size, dtype=bool)
+            all_of, any_of = masks
+            for word, bits in all_of.items():
+                mask &= (self.amenity_bits[:, word] & np.uint64(bits)) == np.uint64(bits)
+            for group in any_of:
+                wanted = np.zeros(self.amenity_bits.shape[1], dtype=np.uint64)
+                for word, bits in group.items():
+                    wanted[word] = bits
+                mask &= (self.amenity_bits & wanted).any(axis=1)
+
+        nearby_place_info = filters.get("nearby_place")
+        if nearby_place_info and nearby_place_info.get("place_type"):
+            place_type = nearby_place_info["place_type"].lower()
+            place_name = (nearby_place_info.get("place_name") or "").lower()
+            if place_name:
+                nearest = self._nearest_named(lambda t, n: place_type in t and place_name in n)
+            else:
+                nearest = self._nearest_by_type(place_type)
+            distance_km = nearby_place_info.get("distance_km")
+            distance_operator = nearby_place_info.get("distance_operator", "<=")
+            if distance_km is None:
+                # Any such place, with or without a distance, as the SQL EXISTS
+                mask &= ~np.isnan(nearest)
+            elif distance_operator in ("<", "<="):
+                mask &= np.isfinite(nearest) & COMPARATORS[distance_operator](nearest, np.float32(distance_km))
+            else:
+                return None
+
+        if plan.within_km is not None:
+            place = plan.within_place.lower()
+            center = geo_index.resolve_point(place) if USE_GEO_INDEX else None
+            if center is not None:
+                # By coordinates, as in the SQL path
+                mask &= np.isin(self.project_code, self._project_codes(geo_index.projects_within(center, plan.within_km)))
+            else:
+                nearest = np.fmin(self._nearest_by_type(place), self._nearest_named(lambda t, n: place in n))
+                mask &= nearest <= np.float32(plan.within_km)
+            if plan.explicit_bhk is not None:
+                mask &= self.bhk == float(plan.explicit_bhk)
+
+        if plan.min_balconies is not None:
+            mask &= self.balconies >= plan.min_balconies
+
+        if plan.garden_view:
+            mask &= self.garden_view
+
+        return mask
+
+class PropertyIndex:
+    """Process-local columnar index over the catalogue.
+
+    The first refresh loads everything; later refreshes reload only the
+    properties touched since the last ``updated_at`` watermark (directly or
+    through their project, location, amenities, nearby places or rooms) and
+    rebuild the arrays off to the side before swapping them in. Every
+    ``full_reload_every`` cycles a full reload drops deleted rows.
+    """
+
+    def __init__(self, session_factory=SessionLocal, interval_seconds: int = 60, full_reload_every: int = 30):
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.full_reload_every = max(full_reload_every, 1)
+
+        self._rows: Dict[Tuple[str, str], _IndexRow] = {}
+        self._snapshot: Optional[_Snapshot] = None
+        self._watermark: Optional[datetime] = None
+        self._cycles = 0
+        self._lock = threading.Lock()  # Serializes refreshes; searches never take it
+
+    @property
+    def available(self) -> bool:
+        return np is not None
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    def search(self, plan, limit: int, after: Optional[Tuple] = None) -> Optional[List[Tuple[str, str]]]:
+        """Matching (property_id, location_id) keys in page order, or None when SQL has to answer the plan"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        return snapshot.search(plan, limit, after)
+
+    def count(self, plan) -> Optional[int]:
+        """Exact number of matches, or None when SQL has to answer the plan"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        return snapshot.count(plan)
+
+    def facet_counts(self, plan) -> Optional[Dict[str, Dict]]:
+        """Facet counts over all matches, or None when SQL has to answer the plan"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        return snapshot.facet_counts(plan)
+
+    def rank(self, plan, k: int) -> Optional[List[Tuple[str, str, float]]]:
+        """Top-k (property_id, location_id, relevance) matches, or None when SQL has to answer the plan"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        return snapshot.rank(plan, k)
+
+    def refresh(self) -> bool:
+        """Load changed rows and rebuild the arrays; returns True if anything changed"""
+        if np is None:
+            raise RuntimeError("numpy is required for the in-memory property index")
+
+        with self._lock:
+            full_reload = self._snapshot is None or self._cycles % self.full_reload_every == 0
+            self._cycles += 1
+
+            db = self.session_factory()
+            try:
+                # Database clock, so the watermark compares like-for-like with updated_at
+                started_at = db.execute(select(func.now())).scalar()
+                if full_reload:
+                    property_ids = None
+                else:
+                    property_ids = self._changed_property_ids(db, self._watermark)
+                    if not property_ids:
+                        self._watermark = started_at
+                        return False
+                loaded = self._load_rows(db, property_ids)
+            finally:
+                db.close()
+
+            rows = {} if full_reload else {key: row for key, row in self._rows.items() if key[0] not in property_ids}
+            rows.update(loaded)
+
+            self._snapshot = _Snapshot(list(rows.values()))
+            self._rows = rows
+            self._watermark = started_at
+            # Results cached from the previous snapshot may no longer match it
+            if result_cache is not None:
+                result_cache.invalidate()
+            print(f"✅ Property index {'built' if full_reload else 'updated'}: {len(rows)} rows ({len(loaded)} loaded)")
+            return True
+
+    def _changed_property_ids(self, db, since: datetime) -> Set[str]:
+        """Properties whose own row or any row they are searched by changed since the watermark"""
+        changed_projects = select(Project.id).where(Project.updated_at > since)
+        changed_projects = changed_projects.union(
+            select(ProjectLocation.project_id).where(ProjectLocation.updated_at > since),
+            select(ProjectLocation.project_id).join(Location, Location.id == ProjectLocation.location_id).where(Location.updated_at > since),
+            select(ProjectAmenity.project_id).where(ProjectAmenity.updated_at > since),
+            select(cast(NearbyPlace.project_id, String)).where(NearbyPlace.updated_at > since),
+            select(ProjectMedia.project_id).where(ProjectMedia.updated_at > since),
+        )
+        rows = db.execute(
+            select(Property.id).where(or_(
+                Property.updated_at > since,
+                Property.project_id.in_(changed_projects),
+                Property.id.in_(select(RoomSpecification.property_id).where(RoomSpecification.updated_at > since))
+            ))
+        ).all()
+        return {property_id for property_id, in rows}
+
+    def _load_rows(self, db, property_ids: Optional[Set[str]]) -> Dict[Tuple[str, str], _IndexRow]:
+        """Fetch and assemble index rows (all of them when property_ids is None)"""
+        base = (
+            select(
+                Property.id, ProjectLocation.location_id, Property.project_id,
+                Location.city, Location.locality, Project.project_status, Property.status,
+                Property.property_type, Property.bhk_count, Property.sell_price, Property.carpet_area_sqft
+            )
+            .join(Project, Project.id == Property.project_id)
+            .join(ProjectLocation, ProjectLocation.project_id == Property.project_id)
+            .join(Location, Location.id == ProjectLocation.location_id)
+        )
+        if property_ids is not None:
+            base = base.where(Property.id.in_(property_ids))
+        base_rows = db.execute(base).all()
+        if not base_rows:
+            return {}
+
+        project_ids = {row.project_id for row in base_rows}
+        row_property_ids = {row.id for row in base_rows}
+
+        amenities: Dict[str, List[str]] = {}
+        for project_id, name in db.execute(
+            select(ProjectAmenity.project_id, func.lower(Amenity.name))
+            .join(Amenity, Amenity.id == ProjectAmenity.amenity_id)
+            .where(ProjectAmenity.project_id.in_(project_ids))
+        ):
+            amenities.setdefault(project_id, []).append(name)
+
+        nearby: Dict[str, Dict[str, float]] = {}
+        nearby_named: Dict[str, Dict[Tuple[str, str], float]] = {}
+        place_type, place_name = func.lower(NearbyPlace.place_type), func.lower(func.coalesce(NearbyPlace.place_name, ""))
+        for project_id, type_lc, name_lc, distance in db.execute(
+            select(NearbyPlace.project_id, place_type, place_name, func.min(NearbyPlace.distance_km))
+            .where(NearbyPlace.project_id.in_(project_ids))
+            .group_by(NearbyPlace.project_id, place_type, place_name)
+        ):
+            # Places without a distance still count for "near <type>" with no distance bound
+            distance = float(distance) if distance is not None else float("inf")
+            by_type = nearby.setdefault(str(project_id), {})
+            by_type[type_lc] = min(distance, by_type.get(type_lc, distance))
+            if name_lc:
+                nearby_named.setdefault(str(project_id), {})[(type_lc, name_lc)] = distance
+
+        balconies: Dict[str, int] = {}
+        garden_view: Set[str] = set()
+        for property_id, room_type, features in db.execute(
+            select(RoomSpecification.property_id, RoomSpecification.room_type, RoomSpecification.features)
+            .where(RoomSpecification.property_id.in_(row_property_ids))
+        ):
+            if (room_type or "").lower() == "balcony":
+                balconies[property_id] = balconies.get(property_id, 0) + 1
+            if any("garden view" in (feature or "").lower() for feature in features or []):
+                garden_view.add(property_id)
+
+        with_media = {
+            project_id for project_id, in db.execute(
+                select(ProjectMedia.project_id.distinct())
+                .where(ProjectMedia.project_id.in_(project_ids), ProjectMedia.is_active == True)
+            )
+        }
+
+        rows = {}
+        for row in base_rows:
+            rows[(row.id, row.location_id)] = _IndexRow(
+                property_id=row.id,
+                location_id=row.location_id,
+                project_id=row.project_id,
+                city=row.city,
+                locality=row.locality,
+                project_status_code=_project_status_code(row.project_status),
+                is_sold="sold" in (row.status or "").lower(),  # Same rule as PROPERTY_STATUS_CODE_SQL, no status_code needed
+                property_type=row.property_type,
+                bhk_count=row.bhk_count,
+                sell_price=row.sell_price,
+                carpet_area_sqft=row.carpet_area_sqft,
+                amenities=tuple(amenities.get(row.project_id, ())),
+                nearby_min_km=nearby.get(str(row.project_id), {}),
+                nearby_named_km=nearby_named.get(str(row.project_id), {}),
+                balcony_count=balconies.get(row.id, 0),
+                garden_view=row.id in garden_view,
+                has_media=row.project_id in with_media
+            )
+        return rows
+
+    async def run(self):
+        """Refresh forever on a worker thread so requests are never blocked"""
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                # Keep serving the previous snapshot (or SQL) if the database is unavailable
+                print(f"⚠️ Property index refresh failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+# Shared by the sync and async search executors; refreshed by main.py when SEARCH_BACKEND=memory
+property_index = PropertyIndex(
+    interval_seconds=int(os.getenv("PROPERTY_INDEX_REFRESH_SECONDS", "60")),
+    full_reload_every=int(os.getenv("PROPERTY_INDEX_FULL_RELOAD_EVERY", "30"))
+)
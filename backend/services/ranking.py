@@ -0,0 +1,131 @@
+"""
+Relevance Ranking
+Scores matching rows for sort=relevance - entity match strength, nearby distance, budget fit, media and project status
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, case, cast, exists, func, literal, or_, select
+
+from models.project import Project
+from models.property import Property
+from models.location import Location
+from models.project_media import ProjectMedia
+from models.nearby_place import NearbyPlace
+
+from . import lookup
+from .search_doc import PROJECT_STATUS_CODES, project_status_code_expression
+
+# Share of the score per component; components that do not apply to a query drop out and the rest are rescaled
+RELEVANCE_WEIGHTS = {
+    "entities": 0.35,
+    "price": 0.25,
+    "nearby": 0.2,
+    "media": 0.1,
+    "status": 0.1,
+}
+
+# Preference by project_status_code when the query does not ask for a status
+STATUS_PREFERENCE = {
+    PROJECT_STATUS_CODES["ready_to_move"]: 1.0,
+    PROJECT_STATUS_CODES["completed"]: 0.8,
+    PROJECT_STATUS_CODES["under_construction"]: 0.5,
+}
+OTHER_STATUS_PREFERENCE = 0.3
+
+PARTIAL_MATCH = 0.5  # Match strength of a substring location hit or a non-exact BHK under >, <, ...
+DEFAULT_NEARBY_SCALE_KM = 5.0  # Distance at which the nearby component reaches 0 when the query gives none
+
+def entity_confidence(plan, label: str) -> float:
+    """Highest extraction confidence of the plan's entities with this label (1.0 if the filter has no entity)"""
+    confidences = [entity.confidence for entity in plan.entities if entity.label == label]
+    return max(confidences) if confidences else 1.0
+
+def nearby_target(plan) -> Optional[Tuple[str, Optional[str], float, bool]]:
+    """(place type, place name, km at which the score reaches 0, whether place names also match the type term)
+    the query asks to be near, or None"""
+    nearby_place_info = plan.filters.get("nearby_place")
+    if nearby_place_info and nearby_place_info.get("place_type"):
+        return (
+            nearby_place_info["place_type"].lower(),
+            (nearby_place_info.get("place_name") or "").lower() or None,
+            float(nearby_place_info.get("distance_km") or DEFAULT_NEARBY_SCALE_KM),
+            False
+        )
+    if plan.within_km is not None:
+        return plan.within_place.lower(), None, float(plan.within_km), True
+    return None
+
+def component_weights(plan) -> Dict[str, float]:
+    """Weights of the components that apply to the plan, summing to 1"""
+    filters = plan.filters
+    active = dict(RELEVANCE_WEIGHTS)
+    if "location" not in filters and "bhk" not in filters:
+        del active["entities"]
+    if filters.get("price_value") is None:
+        del active["price"]
+    if nearby_target(plan) is None:
+        del active["nearby"]
+    total = sum(active.values())
+    return {name: weight / total for name, weight in active.items()}
+
+def entity_terms(plan) -> List[Tuple[str, float]]:
+    """(filter, confidence) of the entities whose match strength varies between rows"""
+    terms = []
+    if "location" in plan.filters:
+        terms.append(("location", entity_confidence(plan, "LOCATION")))
+    if "bhk" in plan.filters:
+        terms.append(("bhk", entity_confidence(plan, "BHK")))
+    return terms
+
+# SQL
+
+def _nearest_distance_sql(place_type: str, place_name: Optional[str], match_names: bool):
+    """Correlated min distance from the row's project to a matching nearby place (NULL if none)"""
+    conditions = [NearbyPlace.project_id == Property.project_id, NearbyPlace.distance_km.isnot(None)]
+    if match_names:
+        conditions.append(or_(lookup.place_type_filter(place_type), lookup.place_name_filter(place_type)))
+    else:
+        conditions.append(lookup.place_type_filter(place_type))
+    if place_name:
+        conditions.append(lookup.place_name_filter(place_name))
+    return select(func.min(NearbyPlace.distance_km)).where(*conditions).correlate(Property).scalar_subquery()
+
+def relevance_expression(plan):
+    """Score in [0, 1] over Property, Project and Location; Postgres keeps only the best rows of ORDER BY ... LIMIT k
+    in a bounded top-N heap instead of sorting every match"""
+    filters = plan.filters
+    weights = component_weights(plan)
+    components = {}
+
+    if "entities" in weights:
+        strengths = []
+        for name, confidence in entity_terms(plan):
+            if name == "location":
+                value = filters["location"].strip().lower()
+                exact = or_(func.lower(Location.locality) == value, func.lower(Location.city) == value)
+            else:
+                exact = Property.bhk_count == filters["bhk"]
+            strengths.append((confidence, case((exact, 1.0), else_=PARTIAL_MATCH)))
+        components["entities"] = sum(confidence * strength for confidence, strength in strengths) / sum(c for c, _ in strengths)
+
+    if "price" in weights:
+        budget = float(filters["price_value"])
+        gap = func.abs(cast(Property.sell_price, Float) - budget) / budget
+        components["price"] = 1.0 - func.least(gap, 1.0)
+
+    if "nearby" in weights:
+        place_type, place_name, scale_km, match_names = nearby_target(plan)
+        distance = cast(_nearest_distance_sql(place_type, place_name, match_names), Float)
+        components["nearby"] = 1.0 - func.least(func.coalesce(distance, scale_km) / scale_km, 1.0)
+
+    has_media = exists().where(ProjectMedia.project_id == Property.project_id, ProjectMedia.is_active == True)
+    components["media"] = case((has_media, 1.0), else_=0.0)
+
+    status_code = project_status_code_expression(Project.project_status)
+    components["status"] = case(
+        *[(status_code == code, preference) for code, preference in STATUS_PREFERENCE.items()],
+        else_=OTHER_STATUS_PREFERENCE
+    )
+
+    return sum((weights[name] * components[name] for name in weights), literal(0.0))
@@ -0,0 +1,212 @@
+"""
+Result Cache
+Matching result ids per canonical filter plan, so differently worded queries with the same filters skip the search
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from .query_cache import QueryCache
+
+# memory = per-process LRU, redis = shared across API workers (REDIS_URL), off = disabled
+RESULT_CACHE_BACKEND = os.getenv("RESULT_CACHE_BACKEND", "memory").strip().lower()
+
+ResultKeys = List[Tuple[str, str]]  # (property_id, location_id) in result order
+
+class LocalResultCache:
+    """In-process backend: the bounded LRU + TTL of QueryCache"""
+
+    blocking = False
+
+    def __init__(self, max_size: int = 2048, ttl_seconds: Optional[float] = 300):
+        self.cache = QueryCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.data_version: Optional[int] = None
+
+    @property
+    def generation(self) -> int:
+        return self.cache.generation
+
+    def get(self, key: str) -> Optional[ResultKeys]:
+        return self.cache.get(key)
+
+    def put(self, key: str, keys: ResultKeys, generation: Optional[int] = None) -> None:
+        self.cache.put(key, keys, generation)
+
+    def invalidate(self) -> None:
+        self.cache.clear()
+
+    def sync_data_version(self, version: int) -> bool:
+        """Drop every entry if the database's search data version moved; returns True if it did"""
+        if version == self.data_version:
+            return False
+        # The first reading also clears, in case searches ran before the watcher started
+        first_reading = self.data_version is None
+        self.data_version = version
+        self.invalidate()
+        return not first_reading
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", **self.cache.stats()}
+
+class RedisResultCache:
+    """Redis (or any Redis-compatible store) backend shared by every API worker.
+
+    Entries live under a version number; invalidating increments it, so all
+    workers stop seeing older entries at once and those expire on their TTL.
+    Memory is bounded by the TTL and the server's maxmemory policy (use
+    allkeys-lru). Redis errors count as misses - a search never fails
+    because the cache is down.
+    """
+
+    blocking = True
+
+    def __init__(self, url: str, ttl_seconds: int = 300, namespace: str = "nlp_results"):
+        import redis  # Only needed for this backend
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+        self.ttl_seconds = max(int(ttl_seconds), 1)
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def generation(self) -> int:
+        try:
+            return int(self.client.get(f"{self.namespace}:version") or 0)
+        except Exception as e:
+            self._failed(e)
+            return -1
+
+    def _entry_key(self, key: str, generation: int) -> str:
+        return f"{self.namespace}:{generation}:{hashlib.sha1(key.encode()).hexdigest()}"
+
+    def _failed(self, error: Exception) -> None:
+        self.errors += 1
+        print(f"⚠️ Result cache unavailable: {error}")
+
+    def get(self, key: str) -> Optional[ResultKeys]:
+        generation = self.generation
+        if generation < 0:
+            return None
+        try:
+            value = self.client.get(self._entry_key(key, generation))
+        except Exception as e:
+            self._failed(e)
+            return None
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [tuple(pair) for pair in json.loads(value)]
+
+    def put(self, key: str, keys: ResultKeys, generation: Optional[int] = None) -> None:
+        if generation is None:
+            generation = self.generation
+        if generation < 0:
+            return
+        try:
+            self.client.set(self._entry_key(key, generation), json.dumps(keys), ex=self.ttl_seconds)
+        except Exception as e:
+            self._failed(e)
+
+    def invalidate(self) -> None:
+        try:
+            self.client.incr(f"{self.namespace}:version")
+        except Exception as e:
+            self._failed(e)
+
+    def sync_data_version(self, version: int) -> bool:
+        """Invalidate once per database version change, however many workers observe it"""
+        try:
+            previous = self.client.getset(f"{self.namespace}:data_version", version)
+        except Exception as e:
+            self._failed(e)
+            return False
+        if previous is None or int(previous) == version:
+            return False
+        self.invalidate()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "redis",
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "generation": self.generation
+        }
+
+def create_result_cache():
+    """Backend chosen by RESULT_CACHE_BACKEND, or None when disabled"""
+    ttl_seconds = int(os.getenv("RESULT_CACHE_TTL", "300"))
+    if RESULT_CACHE_BACKEND == "off":
+        return None
+    if RESULT_CACHE_BACKEND == "redis":
+        try:
+            return RedisResultCache(os.getenv("REDIS_URL", "redis://localhost:6379"), ttl_seconds=ttl_seconds)
+        except ImportError:
+            print("⚠️ redis is not installed, using the in-process result cache")
+    return LocalResultCache(max_size=int(os.getenv("RESULT_CACHE_SIZE", "2048")), ttl_seconds=ttl_seconds)
+
+result_cache = create_result_cache()
+
+# Invalidation: statement-level triggers (database/search_data_version.sql) bump search_data_version
+# on every write to a table searches read, whichever process makes it; DataVersionWatcher polls it.
+
+DATA_VERSION_SQL = "SELECT version FROM search_data_version WHERE id = 1"
+
+def mark_search_data_changed(conn) -> bool:
+    """Bump the search data version from an out-of-process writer, in its transaction.
+
+    Returns False (and changes nothing) if database/search_data_version.sql has
+    not been applied.
+    """
+    if conn.execute(text("SELECT to_regclass('search_data_version')")).scalar() is None:
+        return False
+    conn.execute(text("UPDATE search_data_version SET version = version + 1, changed_at = now() WHERE id = 1"))
+    return True
+
+class DataVersionWatcher:
+    """Polls search_data_version and invalidates the result cache when it changes.
+
+    Cached results are at most ``interval_seconds`` stale after a committed
+    write (plus the TTL if the version table has not been created).
+    """
+
+    def __init__(self, db_engine, cache, interval_seconds: float = 2):
+        self.engine = db_engine
+        self.cache = cache
+        self.interval_seconds = interval_seconds
+
+    def check(self) -> bool:
+        """Read the version once; returns True if the cache was invalidated"""
+        with self.engine.connect() as conn:
+            version = conn.execute(text(DATA_VERSION_SQL)).scalar()
+        if version is None:
+            return False
+        changed = self.cache.sync_data_version(int(version))
+        if changed:
+            print(f"ℹ️ Search data changed (version {version}), result cache invalidated")
+        return changed
+
+    async def run(self):
+        """Poll forever on a worker thread so requests are never blocked"""
+        warned = False
+        while True:
+            try:
+                await asyncio.to_thread(self.check)
+                warned = False
+            except Exception as e:
+                if not warned:
+                    print(f"⚠️ Search data version unavailable, cached results expire on their TTL only: {e}")
+                    warned = True
+            await asyncio.sleep(self.interval_seconds)
@@ -0,0 +1,173 @@
+"""
+Property Search Document
+Single-relation search over the property_search_doc materialized view, and its background refresher
+"""
+
+import asyncio
+import operator
+from typing import Optional
+
+from sqlalchemy import and_, case, func, or_, select, text, bindparam
+
+from database import engine
+from models.project import Project
+from models.property import Property
+from models.location import Location
+from models.property_search_doc import PropertySearchDoc
+
+# Comparison operators produced by the NLP engine
+COMPARATORS = {
+    "<": operator.lt,
+    ">": operator.gt,
+    "<=": operator.le,
+    ">=": operator.ge,
+    "=": operator.eq,
+}
+
+# project_status_code values in property_search_doc
+PROJECT_STATUS_CODES = {
+    "ready_to_move": 1,
+    "under_construction": 2,
+    "completed": 3,
+}
+
+def project_status_code_expression(project_status_column):
+    """SQL twin of project_status_code in property_search_doc (0 = other)"""
+    status = func.lower(project_status_column)
+    return case(
+        (status.like('%ready%move%'), PROJECT_STATUS_CODES["ready_to_move"]),
+        (status.like('%under%construction%'), PROJECT_STATUS_CODES["under_construction"]),
+        (status.like('%completed%'), PROJECT_STATUS_CODES["completed"]),
+        else_=0
+    )
+
+GENERIC_PROPERTY_TYPES = ['flat', 'apartment', 'house', 'property', 'residential']
+
+def build_search_doc_statement(plan):
+    """Same search as search_queries.build_nlp_search_statement, filtering property_search_doc only.
+
+    Returns None when the plan uses a filter the document cannot answer
+    (specific nearby place names, exact distances, "within X km of <place>",
+    free-text price ranges, area ranges); callers fall back to the join query.
+    """
+    filters = plan.filters
+    doc = PropertySearchDoc
+    conditions = [doc.is_sold == False]
+
+    if "location" in filters:
+        location = filters["location"].lower()
+        conditions.append(or_(doc.city_lc.like(f"%{location}%"), doc.locality_lc.like(f"%{location}%")))
+
+    if plan.project_status in PROJECT_STATUS_CODES:
+        conditions.append(doc.project_status_code == PROJECT_STATUS_CODES[plan.project_status])
+
+    if "bhk" in filters:
+        compare = COMPARATORS.get(filters.get("bhk_operator", "="))
+        if compare:
+            conditions.append(compare(doc.bhk_count, filters["bhk"]))
+
+    if "property_type" in filters:
+        prop_type = filters["property_type"].lower()
+        # Generic and BHK-style types are skipped, as in the join query
+        if prop_type not in GENERIC_PROPERTY_TYPES and not any(term in prop_type for term in ['bhk', 'bedroom', 'bed']):
+            conditions.append(doc.property_type_lc.like(f"%{prop_type}%"))
+
+    if "price_range" in filters:
+        if filters.get("price_value") is None:
+            return None
+        compare = COMPARATORS.get(filters.get("price_operator", "="))
+        if compare:
+            conditions.append(compare(doc.sell_price, filters["price_value"]))
+
+    if "carpet_area" in filters and filters.get("area_value") is not None:
+        area_operator = filters.get("area_operator", "=")
+        if area_operator == "BETWEEN":
+            return None
+        compare = COMPARATORS.get(area_operator)
+        if compare:
+            conditions.append(compare(doc.carpet_area_sqft, filters["area_value"]))
+
+    if filters.get("amenities"):
+        combine = and_ if plan.amenity_match == "all" else or_
+        conditions.append(combine(*[doc.amenity_names_lc.like(f"%{amenity.lower()}%") for amenity in filters["amenities"]]))
+
+    nearby_place_info = filters.get("nearby_place")
+    if nearby_place_info and nearby_place_info.get("place_type"):
+        if nearby_place_info.get("place_name"):
+            return None
+        distance_km = nearby_place_info.get("distance_km")
+        distance_operator = nearby_place_info.get("distance_operator", "<=")
+        type_pattern = f"%{nearby_place_info['place_type'].lower()}%"
+        if distance_km is None:
+            conditions.append(text(
+                "EXISTS (SELECT 1 FROM jsonb_object_keys(property_search_doc.nearby_min_km) k WHERE k LIKE :nearby_type)"
+            ).bindparams(bindparam("nearby_type", type_pattern)))
+        elif distance_operator in ("<", "<="):
+            # The nearest place of a type is within range iff any place of that type is
+            conditions.append(text(
+                "EXISTS (SELECT 1 FROM jsonb_each_text(property_search_doc.nearby_min_km) d "
+                f"WHERE d.key LIKE :nearby_type AND d.value::numeric {distance_operator} :nearby_km)"
+            ).bindparams(bindparam("nearby_type", type_pattern), bindparam("nearby_km", distance_km)))
+        else:
+            return None
+
+    if plan.within_km is not None:
+        return None
+
+    if plan.min_balconies is not None:
+        conditions.append(doc.balcony_count >= plan.min_balconies)
+
+    if plan.garden_view:
+        conditions.append(doc.feature_tags_lc.like('%garden view%'))
+
+    print(f"✅ Using property_search_doc for: {filters}")
+    return (
+        select(Property, Project, Location)
+        .select_from(doc)
+        .join(Property, Property.id == doc.property_id)
+        .join(Project, Project.id == doc.project_id)
+        .join(Location, Location.id == doc.location_id)
+        .where(*conditions)
+    )
+
+class SearchDocRefresher:
+    """Refreshes property_search_doc concurrently after the source tables change.
+
+    Triggers on the source tables set property_search_doc_state.dirty; this
+    task polls the flag, clears it and runs REFRESH ... CONCURRENTLY, so reads
+    are never blocked and a burst of writes costs one refresh.
+    """
+
+    def __init__(self, db_engine=engine, interval_seconds: int = 30):
+        self.engine = db_engine
+        self.interval_seconds = interval_seconds
+
+    def refresh_if_dirty(self) -> bool:
+        """Refresh the view if it is marked dirty; returns True if it was refreshed"""
+        with self.engine.begin() as conn:
+            dirty = conn.execute(text(
+                "UPDATE property_search_doc_state SET dirty = false WHERE id = 1 AND dirty RETURNING id"
+            )).first()
+        if not dirty:
+            return False
+
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY property_search_doc"))
+                conn.execute(text("UPDATE property_search_doc_state SET refreshed_at = now() WHERE id = 1"))
+        except Exception:
+            # Leave it dirty so the next cycle retries
+            with self.engine.begin() as conn:
+                conn.execute(text("UPDATE property_search_doc_state SET dirty = true WHERE id = 1"))
+            raise
+        print("✅ property_search_doc refreshed")
+        return True
+
+    async def run(self):
+        """Poll forever on a worker thread so requests are never blocked"""
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh_if_dirty)
+            except Exception as e:
+                print(f"⚠️ property_search_doc refresh failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
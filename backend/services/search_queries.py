@@ -0,0 +1,703 @@
+"""
+Search Queries
+select() statements and response builders shared by the sync and async data-access paths
+"""
+
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import or_, and_, func, select, exists, text, case, tuple_, false, literal, literal_column, values, column, String, Float
+from sqlalchemy.orm import Session
+
+from models.project import Project
+from models.base import USE_STATUS_CODE
+from models.property import Property, PropertyStatus
+from models.location import Location
+from models.project_location import ProjectLocation
+from models.amenity import Amenity
+from models.project_amenity import ProjectAmenity
+from models.project_media import ProjectMedia
+from models.room_specification import RoomSpecification
+from models.nearby_place import NearbyPlace
+from models.project_place_distance import ProjectPlaceDistance
+
+from .search_doc import COMPARATORS, build_search_doc_statement
+from .property_index import property_index
+from . import lookup
+from .amenity_bits import USE_AMENITY_BITSET, amenity_catalog, amenity_mask_condition
+from .geo_index import USE_GEO_INDEX, geo_index
+from .result_cache import result_cache
+from .pagination import price_cursor, after_price_cursor, approximate_count
+from . import facets, ranking, serializers
+
+# Maximum number of results returned by the NLP search
+SEARCH_RESULT_LIMIT = 20
+
+# "joins" queries the normalized tables; "search_doc" uses the property_search_doc materialized view;
+# "memory" filters the in-process PropertyIndex and only fetches the matching rows
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "joins").lower()
+
+# Nearby place filters read project_place_distances (requires database/project_place_distances.sql)
+USE_PLACE_DISTANCES = os.getenv("USE_PLACE_DISTANCES", "false").strip().lower() in ("1", "true", "yes", "on")
+
+def not_sold():
+    """Globally exclude sold properties.
+
+    With USE_STATUS_CODE it is rendered as the literal ``status_code <> 3`` so
+    it matches the partial indexes in database/property_status.sql even under
+    generic (prepared) plans; otherwise a case-insensitive match on 'sold'.
+    """
+    if USE_STATUS_CODE:
+        return Property.status_code != literal_column(str(int(PropertyStatus.SOLD)))
+    return (Property.status.is_(None)) | (~func.lower(Property.status).like('%sold%'))
+
+def build_search_statement(plan, position: Optional[Tuple] = None, limit: int = SEARCH_RESULT_LIMIT, sort: str = "price"):
+    """One page of the search for the configured backend: the ``limit + 1`` rows after ``position`` in page order,
+    or with sort="relevance" the ``limit + 1`` best rows with their score as a fourth column"""
+    if sort == "relevance":
+        if SEARCH_BACKEND == "memory":
+            statement = build_indexed_search_statement(plan, None, limit, ranked=True)
+            if statement is not None:
+                return statement
+        relevance = ranking.relevance_expression(plan).label("relevance")
+        return (
+            build_filtered_statement(plan)
+            .add_columns(relevance)
+            .order_by(relevance.desc(), Property.sell_price, Property.id, Location.id)
+            .limit(limit + 1)
+        )
+    if SEARCH_BACKEND == "memory":
+        statement = build_indexed_search_statement(plan, position, limit)
+        if statement is not None:
+            return statement
+    return search_page(build_filtered_statement(plan), position, limit)
+
+def build_filtered_statement(plan):
+    """Unpaged SQL search statement, falling back to the join query when needed"""
+    if SEARCH_BACKEND == "search_doc":
+        statement = build_search_doc_statement(plan)
+        if statement is not None:
+            return statement
+        print("ℹ️  Query needs filters property_search_doc cannot answer, using the join query")
+    return build_nlp_search_statement(plan)
+
+def search_page(statement, position: Optional[Tuple], limit: int):
+    """Keyset page in (sell_price, property id, location id) order - served by idx_properties_available_price_id
+    at any depth. One extra row tells whether there is another page."""
+    if position:
+        statement = statement.where(after_price_cursor(Property.sell_price, Property.id, position, Location.id))
+    return statement.order_by(Property.sell_price, Property.id, Location.id).limit(limit + 1)
+
+def page_cursor(rows, limit: int, sort: str = "price") -> Tuple[list, bool, Optional[str]]:
+    """Rows of the page, whether more match, and the cursor of the next page (None on the last page and for
+    relevance, which returns the top ``limit`` only)"""
+    if len(rows) <= limit:
+        return rows, False, None
+    rows = rows[:limit]
+    if sort == "relevance":
+        return rows, True, None
+    last_property, _, last_location = rows[-1]
+    return rows, True, price_cursor(last_property.sell_price, last_property.id, last_location.id)
+
+def build_indexed_search_statement(plan, position: Optional[Tuple] = None, limit: int = SEARCH_RESULT_LIMIT,
+                                   ranked: bool = False):
+    """Hydrate the rows the in-memory property index matched (or ranked best), or None to use the join query"""
+    if not property_index.available:
+        print("⚠️ numpy is not installed, using the join query")
+        return None
+    if not property_index.ready:
+        print("ℹ️  Property index is still loading, using the join query")
+        return None
+    keys = property_index.rank(plan, limit + 1) if ranked else property_index.search(plan, limit + 1, position)
+    if keys is None:
+        print("ℹ️  Query needs filters the property index cannot answer, using the join query")
+        return None
+
+    print(f"✅ Property index matched {len(keys)} rows for: {plan.filters}")
+    return keyed_search_statement(keys, ranked)
+
+def keyed_search_statement(keys, ranked: bool = False):
+    """(Property, Project, Location) rows for known (property_id, location_id) keys, in page order.
+
+    Ranked keys are (property_id, location_id, relevance) triples; the scores
+    are joined in as a VALUES list, returned as a fourth column and ordered by.
+    """
+    statement = (
+        select(Property, Project, Location)
+        .join(Project, Project.id == Property.project_id)
+        .join(ProjectLocation, ProjectLocation.project_id == Property.project_id)
+        .join(Location, Location.id == ProjectLocation.location_id)
+    )
+    if not keys:
+        return statement.add_columns(literal(0.0)).where(false()) if ranked else statement.where(false())
+    if not ranked:
+        return statement.where(tuple_(Property.id, Location.id).in_(keys)).order_by(Property.sell_price, Property.id, Location.id)
+    scores = values(
+        column("property_id", String), column("location_id", String), column("relevance", Float), name="scores"
+    ).data([tuple(key) for key in keys])
+    return (
+        statement
+        .join(scores, and_(scores.c.property_id == Property.id, scores.c.location_id == Location.id))
+        .add_columns(scores.c.relevance)
+        .order_by(scores.c.relevance.desc(), Property.sell_price, Property.id, Location.id)
+    )
+
+def result_keys(rows) -> List[Tuple]:
+    """(property_id, location_id[, relevance]) of (Property, Project, Location[, relevance]) rows, in order"""
+    return [(str(row[0].id), str(row[2].id), *row[3:]) for row in rows]
+
+def result_cache_key(plan, position: Optional[Tuple], limit: int, sort: str = "price") -> str:
+    return f"{plan.filter_key()}|{sort}|{limit}|{position}"
+
+def search_page_info(sort: str, limit: int, has_more: bool, next_cursor: Optional[str], approximate_total: Optional[int]) -> Dict[str, Any]:
+    return {
+        "sort": sort,
+        "limit": limit,
+        "has_more": has_more,
+        "next_cursor": next_cursor,
+        "approximate_total": approximate_total
+    }
+
+def indexed_facet_counts(plan) -> Optional[Dict[str, Dict]]:
+    """Facet counts from the in-memory index, or None when it cannot answer the plan"""
+    if SEARCH_BACKEND == "memory" and property_index.available and property_index.ready:
+        return property_index.facet_counts(plan)
+    return None
+
+def indexed_total(plan) -> Optional[int]:
+    """Exact match count from the in-memory index, or None when it cannot answer the plan"""
+    if SEARCH_BACKEND == "memory" and property_index.available and property_index.ready:
+        return property_index.count(plan)
+    return None
+
+def amenities_condition(amenities_list: List[str], match_all: bool):
+    """Project has all (or any) of the amenities - a bitset test when enabled, EXISTS otherwise (no row fan-out)"""
+    if USE_AMENITY_BITSET and amenity_catalog.ready:
+        masks = amenity_catalog.masks(amenities_list, match_all)
+        if masks is None:
+            return false()
+        return amenity_mask_condition(Project.amenity_mask, *masks)
+    
+    def has_amenity(*conditions):
+        return exists().where(
+            ProjectAmenity.project_id == Property.project_id,
+            ProjectAmenity.amenity_id == Amenity.id,
+            *conditions
+        )
+    
+    if match_all:
+        return and_(*[has_amenity(lookup.amenity_filter(amenity)) for amenity in amenities_list])
+    return has_amenity(or_(*[lookup.amenity_filter(amenity) for amenity in amenities_list]))
+
+def nearby_place_condition(place_type: str, place_name: Optional[str], distance_km, distance_operator: str = "<="):
+    """Project has a nearby place of the type (and name) at the given distance - an EXISTS, so rows are not multiplied.
+
+    With USE_PLACE_DISTANCES the lookup is a range scan of the precomputed
+    nearest distances; "=" needs the individual places, so it always checks
+    nearby_places.
+    """
+    compare = COMPARATORS.get(distance_operator) if distance_km is not None else None
+    
+    if place_name and distance_km is not None and distance_operator in ("<", "<="):
+        radius = projects_within_condition(place_name, distance_km)
+        if radius is not None:
+            return radius
+    
+    if USE_PLACE_DISTANCES and distance_operator != "=":
+        distances = ProjectPlaceDistance
+        conditions = [
+            distances.project_id == Property.project_id,
+            lookup.place_type_lc_filter(distances.place_type_lc, place_type),
+            lookup.place_name_lc_filter(distances.place_name_lc, place_name) if place_name else distances.place_name_lc == ""
+        ]
+        if compare:
+            conditions.append(compare(distances.min_distance_km, distance_km))
+        return exists().where(*conditions)
+    
+    conditions = [NearbyPlace.project_id == Property.project_id, lookup.place_type_filter(place_type)]
+    if place_name:
+        conditions.append(lookup.place_name_filter(place_name))
+    if compare:
+        conditions.append(compare(NearbyPlace.distance_km, distance_km))
+    return exists().where(*conditions)
+
+def projects_within_condition(place: str, radius_km: float):
+    """Project lies within ``radius_km`` of the named place by coordinates, or None if the geo index cannot place it"""
+    if not (USE_GEO_INDEX and geo_index.ready):
+        return None
+    center = geo_index.resolve_point(place)
+    if center is None:
+        return None
+    project_ids = geo_index.projects_within(center, radius_km)
+    print(f"✅ Geo index: {len(project_ids)} projects within {radius_km} km of '{place}'")
+    if not project_ids:
+        return false()
+    return Property.project_id.in_(list(project_ids))
+
+def within_place_condition(place: str, within_km: float):
+    """Project has a nearby place whose type or name matches ``place`` within ``within_km``"""
+    radius = projects_within_condition(place, within_km)
+    if radius is not None:
+        return radius
+    if USE_PLACE_DISTANCES:
+        distances = ProjectPlaceDistance
+        return exists().where(
+            distances.project_id == Project.id,
+            distances.min_distance_km <= within_km,
+            or_(lookup.place_type_lc_filter(distances.place_type_lc, place), lookup.place_name_lc_filter(distances.place_name_lc, place))
+        )
+    return exists().where(
+        NearbyPlace.project_id == Project.id,
+        NearbyPlace.distance_km <= within_km,
+        or_(lookup.place_type_filter(place), lookup.place_name_filter(place))
+    )
+
+def build_nlp_search_statement(plan):
+    """Build the property search for a parsed query (a QueryPlan) as a select() of (Property, Project, Location)"""
+    filters = plan.filters
+    
+    # Build database query based on extracted criteria
+    statement = select(Property, Project, Location).join(Project).join(ProjectLocation).join(Location)
+    
+    # Globally exclude sold properties
+    statement = statement.filter(not_sold())
+    
+    # Apply filters based on extracted entities
+    if "location" in filters:
+        location = filters["location"]
+        # Search in cities and localities
+        statement = statement.filter(lookup.location_filter(location))
+        print(f"✅ Applied location filter: {location}")
+    
+    # Apply project-level status filters inferred from query text
+    if plan.project_status == "ready_to_move":
+        statement = statement.filter(func.lower(Project.project_status).like('%ready%move%'))
+        print("✅ Applied project status filter: Ready to move")
+    elif plan.project_status == "under_construction":
+        statement = statement.filter(func.lower(Project.project_status).like('%under%construction%'))
+        print("✅ Applied project status filter: Under construction")
+    elif plan.project_status == "completed":
+        statement = statement.filter(func.lower(Project.project_status).like('%completed%'))
+        print("✅ Applied project status filter: Completed")
+    else:
+        print("ℹ️  No explicit project status phrase detected in query")
+
+    if "bhk" in filters:
+        bhk = filters["bhk"]
+        bhk_operator = filters.get("bhk_operator", "=")
+        
+        # Apply BHK filter with operator
+        if bhk_operator == "=":
+            statement = statement.filter(Property.bhk_count == bhk)
+        elif bhk_operator == ">":
+            statement = statement.filter(Property.bhk_count > bhk)
+        elif bhk_operator == "<":
+            statement = statement.filter(Property.bhk_count < bhk)
+        elif bhk_operator == ">=":
+            statement = statement.filter(Property.bhk_count >= bhk)
+        elif bhk_operator == "<=":
+            statement = statement.filter(Property.bhk_count <= bhk)
+        
+        print(f"✅ Applied BHK filter: {bhk_operator} {bhk}")
+    
+    if "property_type" in filters:
+        prop_type = filters["property_type"]
+        # Skip generic property type filters that are too broad
+        generic_types = ['flat', 'apartment', 'house', 'property', 'residential']
+        if prop_type.lower() in generic_types:
+            print(f"⚠️ Skipped generic property_type filter '{prop_type}' (too broad, would exclude valid properties)")
+        # Only apply property_type filter if it's not a BHK-related property_type
+        # (since BHK is already handled by the bhk filter above)
+        elif not any(bhk_term in prop_type.lower() for bhk_term in ['bhk', 'bedroom', 'bed']):
+            statement = statement.filter(lookup.property_type_filter(prop_type))
+            print(f"✅ Applied property type filter: {prop_type}")
+        else:
+            print(f"⚠️ Skipped property_type filter '{prop_type}' as it's BHK-related (handled by BHK filter)")
+    
+    # Apply price filters from NLP extraction with operators
+    if "price_range" in filters:
+        price_operator = filters.get("price_operator", "=")
+        price_value = filters.get("price_value")
+        
+        if price_value is not None:
+            # Apply price filter using the sell_price column from properties table
+            if price_operator == "<":
+                statement = statement.filter(Property.sell_price < price_value)
+                print(f"✅ Applied price filter: < ₹{price_value:,} (using sell_price column)")
+            elif price_operator == ">":
+                statement = statement.filter(Property.sell_price > price_value)
+                print(f"✅ Applied price filter: > ₹{price_value:,} (using sell_price column)")
+            elif price_operator == "<=":
+                statement = statement.filter(Property.sell_price <= price_value)
+                print(f"✅ Applied price filter: <= ₹{price_value:,} (using sell_price column)")
+            elif price_operator == ">=":
+                statement = statement.filter(Property.sell_price >= price_value)
+                print(f"✅ Applied price filter: >= ₹{price_value:,} (using sell_price column)")
+            elif price_operator == "=":
+                statement = statement.filter(Property.sell_price == price_value)
+                print(f"✅ Applied price filter: = ₹{price_value:,} (using sell_price column)")
+        else:
+            # Fallback to old pattern matching for backward compatibility
+            price_text = filters["price_range"].lower()
+            
+            # Pattern for "under X crore/lakhs"
+            under_match = re.search(r'under\s+(\d+(?:\.\d+)?)\s*(?:cr|crore|crores|lakh|lakhs)', price_text)
+            if under_match:
+                max_price = float(under_match.group(1))
+                if 'lakh' in price_text:
+                    max_price = max_price * 100000  # Convert lakhs to rupees
+                elif 'crore' in price_text or 'cr' in price_text:
+                    max_price = max_price * 10000000  # Convert crores to rupees
+                
+                statement = statement.filter(Property.sell_price < max_price)
+                print(f"✅ Applied price filter: under ₹{max_price:,} (using sell_price column)")
+            
+            # Pattern for "above X crore/lakhs"
+            above_match = re.search(r'above\s+(\d+(?:\.\d+)?)\s*(?:cr|crore|crores|lakh|lakhs)', price_text)
+            if above_match:
+                min_price = float(above_match.group(1))
+                if 'lakh' in price_text:
+                    min_price = min_price * 100000  # Convert lakhs to rupees
+                elif 'crore' in price_text or 'cr' in price_text:
+                    min_price = min_price * 10000000  # Convert crores to rupees
+                
+                statement = statement.filter(Property.sell_price > min_price)
+                print(f"✅ Applied price filter: above ₹{min_price:,} (using sell_price column)")
+            
+            # Pattern for range "X-Y crore/lakhs"
+            range_match = re.search(r'(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)\s*(?:cr|crore|crores|lakh|lakhs)', price_text)
+            if range_match:
+                min_price = float(range_match.group(1))
+                max_price = float(range_match.group(2))
+                if 'lakh' in price_text:
+                    min_price = min_price * 100000
+                    max_price = max_price * 100000
+                elif 'crore' in price_text or 'cr' in price_text:
+                    min_price = min_price * 10000000
+                    max_price = max_price * 10000000
+                
+                statement = statement.filter(
+                    Property.sell_price >= min_price,
+                    Property.sell_price <= max_price
+                )
+                print(f"✅ Applied price filter: ₹{min_price:,} - ₹{max_price:,} (using sell_price column)")
+            
+            # Pattern for "between X to Y crore/lakhs"
+            between_match = re.search(r'between\s+(\d+(?:\.\d+)?)\s*(?:lakh|lakhs|crore|crores)\s*to\s*(\d+(?:\.\d+)?)\s*(?:lakh|lakhs|crore|crores)', price_text)
+            if between_match:
+                min_price = float(between_match.group(1))
+                max_price = float(between_match.group(2))
+                if 'lakh' in price_text:
+                    min_price = min_price * 100000
+                    max_price = max_price * 100000
+                elif 'crore' in price_text or 'cr' in price_text:
+                    min_price = min_price * 10000000
+                    max_price = max_price * 10000000
+                
+                statement = statement.filter(
+                    Property.sell_price >= min_price,
+                    Property.sell_price <= max_price
+                )
+                print(f"✅ Applied price filter: between ₹{min_price:,} - ₹{max_price:,} (using sell_price column)")
+    
+    # Apply carpet area filters with operators
+    if "carpet_area" in filters:
+        area_operator = filters.get("area_operator", "=")
+        area_value = filters.get("area_value")
+        
+        if area_value is not None:
+            # Apply carpet area filter
+            if area_operator == "<":
+                statement = statement.filter(Property.carpet_area_sqft < area_value)
+                print(f"✅ Applied carpet area filter: < {area_value} sqft")
+            elif area_operator == ">":
+                statement = statement.filter(Property.carpet_area_sqft > area_value)
+                print(f"✅ Applied carpet area filter: > {area_value} sqft")
+            elif area_operator == "<=":
+                statement = statement.filter(Property.carpet_area_sqft <= area_value)
+                print(f"✅ Applied carpet area filter: <= {area_value} sqft")
+            elif area_operator == ">=":
+                statement = statement.filter(Property.carpet_area_sqft >= area_value)
+                print(f"✅ Applied carpet area filter: >= {area_value} sqft")
+            elif area_operator == "=":
+                statement = statement.filter(Property.carpet_area_sqft == area_value)
+                print(f"✅ Applied carpet area filter: = {area_value} sqft")
+            elif area_operator == "BETWEEN":
+                # Handle range queries like "1000-1500"
+                if isinstance(area_value, str) and "-" in str(area_value):
+                    try:
+                        min_area, max_area = map(int, str(area_value).split("-"))
+                        statement = statement.filter(
+                            Property.carpet_area_sqft >= min_area,
+                            Property.carpet_area_sqft <= max_area
+                        )
+                        print(f"✅ Applied carpet area filter: BETWEEN {min_area} - {max_area} sqft")
+                    except ValueError:
+                        print(f"⚠️ Invalid area range format: {area_value}")
+                else:
+                    # Fallback to equals if range parsing fails
+                    statement = statement.filter(Property.carpet_area_sqft == area_value)
+                    print(f"✅ Applied carpet area filter: = {area_value} sqft (fallback)")
+    
+    # Apply amenities filters
+    if "amenities" in filters:
+        amenities_list = filters["amenities"]
+        if amenities_list:
+            statement = statement.filter(amenities_condition(amenities_list, plan.amenity_match == "all"))
+            print(f"✅ Applied amenities filter ({plan.amenity_match} of): {', '.join(amenities_list)}")
+    
+    # Apply nearby place filters
+    nearby_place_info = filters.get("nearby_place")
+    
+    if nearby_place_info and nearby_place_info.get("place_type"):
+        place_type = nearby_place_info["place_type"]
+        place_name = nearby_place_info.get("place_name")  # Get specific place name if available
+        distance_km = nearby_place_info.get("distance_km")
+        distance_operator = nearby_place_info.get("distance_operator", "<=")
+        
+        statement = statement.filter(nearby_place_condition(place_type, place_name, distance_km, distance_operator))
+        target = f"'{place_name}' ({place_type})" if place_name else place_type
+        if distance_km is not None:
+            print(f"✅ Applied nearby place filter: {target} within {distance_km}km ({distance_operator})")
+        else:
+            print(f"✅ Applied nearby place filter: {target}")
+    
+    # Additional filters parsed from the raw query text
+    # 1) "within X km of <place>" → place type or name within distance
+    if plan.within_km is not None:
+        statement = statement.filter(within_place_condition(plan.within_place, plan.within_km))
+        print(f"✅ Applied nearby distance filter: within {plan.within_km} km of '{plan.within_place}'")
+
+        # Additionally, apply BHK filter if query contains an explicit BHK number
+        if plan.explicit_bhk is not None:
+            statement = statement.filter(Property.bhk_count == plan.explicit_bhk)
+            print(f"✅ Applied BHK filter from query: {plan.explicit_bhk} BHK")
+
+    # 2) "with N balconies" → properties having at least N balcony room specs
+    if plan.min_balconies is not None:
+        # Subquery: property_ids having at least N balconies
+        balc_subq = (
+            select(RoomSpecification.property_id.label("prop_id"))
+            .filter(func.lower(RoomSpecification.room_type) == 'balcony')
+            .group_by(RoomSpecification.property_id)
+            .having(func.count(RoomSpecification.id) >= plan.min_balconies)
+            .subquery()
+        )
+        statement = statement.filter(Property.id.in_(select(balc_subq.c.prop_id)))
+        print(f"✅ Applied balconies filter: >= {plan.min_balconies} balconies")
+
+    # 3) "garden view" → any room_specifications.features contains 'garden view'
+    if plan.garden_view:
+        # Subquery using Postgres unnest to do case-insensitive contains
+        garden_subq = (
+            select(RoomSpecification.property_id.label("prop_id"))
+            .filter(
+                text("EXISTS (SELECT 1 FROM unnest(room_specifications.features) f WHERE lower(f) like '%garden view%')")
+            )
+            .group_by(RoomSpecification.property_id)
+            .subquery()
+        )
+        statement = statement.filter(Property.id.in_(select(garden_subq.c.prop_id)))
+        print("✅ Applied feature filter: Garden View")
+
+    return statement
+
+def media_summary_statement(project_ids: Iterable[str]):
+    """Primary image and active media count per project, in one grouped query.
+    
+    Projects without active media are left out. A project has at most one
+    primary image (idx_project_media_primary_unique), so max() just picks it.
+    """
+    return select(
+        ProjectMedia.project_id,
+        func.count(ProjectMedia.id),
+        func.max(case((ProjectMedia.is_primary == True, ProjectMedia.file_path)))
+    ).where(
+        ProjectMedia.project_id.in_(set(project_ids)),
+        ProjectMedia.is_active == True
+    ).group_by(ProjectMedia.project_id)
+
+def media_summaries_from_rows(rows) -> Dict[str, Dict[str, Any]]:
+    return {
+        project_id: {"primary_image": primary_image, "total_count": total_count}
+        for project_id, total_count, primary_image in rows
+    }
+
+def result_project_ids(rows) -> set:
+    """Project ids of (Property, Project, Location[, relevance]) rows"""
+    return {row[1].id for row in rows if row[1]}
+
+def nlp_search_response(plan, rows, media_by_project: Dict[str, Dict[str, Any]], page: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Format (Property, Project, Location[, relevance]) rows as the NLP search response"""
+    # Format results
+    results = []
+    for property_item, project, location, *relevance in rows:
+        # Calculate price per sqft
+        price_per_sqft = None
+        if property_item.sell_price and property_item.carpet_area_sqft and property_item.carpet_area_sqft > 0:
+            price_per_sqft = property_item.sell_price / property_item.carpet_area_sqft
+        
+        project_data = serializers.search_listing(property_item)
+        project_data["price_per_sqft"] = serializers.float_or_none(price_per_sqft)
+        project_data["project"] = serializers.search_project(project) if project else None
+        project_data["location"] = {
+            "city": location.city,
+            "locality": location.locality
+        } if location else None
+        project_data["media"] = media_by_project.get(project.id) if project else None
+        if relevance:
+            project_data["relevance_score"] = round(float(relevance[0]), 4)
+        results.append(project_data)
+    
+    return {
+        "query": plan.query,
+        "intent": plan.intent,
+        "confidence": plan.confidence,
+        "extracted_entities": plan.filters,
+        "results_count": len(results),
+        "results": results,
+        **(page or {})
+    }
+
+def project_configurations_statement(project_id: str):
+    """Unsold properties (BHK configurations) of a project"""
+    return select(Property).where(
+        Property.project_id == project_id,
+        not_sold()
+    ).order_by(Property.bhk_count)
+
+def project_configurations_response(project_id: str, properties: List[Property]) -> Dict[str, Any]:
+    # Format results
+    configurations = []
+    for prop in properties:
+        config = {
+            "id": str(prop.id),
+            "bhk_count": float(prop.bhk_count) if prop.bhk_count else None,
+            "carpet_area_sqft": float(prop.carpet_area_sqft) if prop.carpet_area_sqft else None,
+            "super_builtup_area_sqft": float(prop.super_builtup_area_sqft) if prop.super_builtup_area_sqft else None,
+            "sell_price": float(prop.sell_price) if prop.sell_price else None,
+            "floor_plan_url": prop.floor_plan_url,
+            "property_type": prop.property_type,
+            "facing": prop.facing,
+            "status": prop.status,
+            "floor_number": prop.floor_number
+        }
+        configurations.append(config)
+    
+    return {
+        "success": True,
+        "project_id": project_id,
+        "configurations": configurations,
+        "total_configurations": len(configurations)
+    }
+
+def project_nearby_places_statement(project_id: str):
+    return select(NearbyPlace).where(
+        NearbyPlace.project_id == project_id
+    ).order_by(NearbyPlace.place_type, NearbyPlace.distance_km)
+
+def project_nearby_places_response(project_id: str, nearby_places: List[NearbyPlace]) -> Dict[str, Any]:
+    # Group by place type for better organization
+    places_by_category = {}
+    for place in nearby_places:
+        category = place.place_type
+        if category not in places_by_category:
+            places_by_category[category] = []
+        
+        places_by_category[category].append({
+            "id": str(place.id),
+            "place_name": place.place_name,
+            "distance_km": float(place.distance_km),
+            "walking_distance": place.walking_distance,
+            "created_at": str(place.created_at),
+            "updated_at": str(place.updated_at)
+        })
+    
+    return {
+        "success": True,
+        "project_id": project_id,
+        "nearby_places": places_by_category,
+        "total_categories": len(places_by_category),
+        "total_places": len(nearby_places)
+    }
+
+def project_media_statement(project_id: str):
+    return select(ProjectMedia).where(
+        ProjectMedia.project_id == project_id,
+        ProjectMedia.is_active == True
+    ).order_by(ProjectMedia.sort_order, ProjectMedia.created_at)
+
+def project_media_response(project_id: str, project_media: List[ProjectMedia]) -> Dict[str, Any]:
+    # Convert SQLAlchemy objects to dictionaries
+    media_list = []
+    for media in project_media:
+        media_dict = {
+            "id": str(media.id),
+            "file_name": media.file_name,
+            "file_path": media.file_path,
+            "file_type": media.file_type,
+            "mime_type": media.mime_type,
+            "media_category": media.media_category,
+            "is_primary": media.is_primary,
+            "alt_text": media.alt_text,
+            "sort_order": media.sort_order,
+            "width": media.width,
+            "height": media.height,
+            "duration_seconds": media.duration_seconds,
+            "caption": media.caption
+        }
+        media_list.append(media_dict)
+    
+    return {
+        "success": True,
+        "project_id": project_id,
+        "media": media_list,
+        "total_media": len(media_list)
+    }
+
+# Synchronous execution (run on the thread pool) - see async_queries for the asyncpg path
+
+def execute_nlp_search(db: Session, plan, position: Optional[Tuple] = None, limit: int = SEARCH_RESULT_LIMIT,
+                       include_total: bool = False, sort: str = "price", include_facets: bool = False) -> Dict[str, Any]:
+    """Run the database search for a parsed query and format one page of the response (blocking)"""
+    if result_cache is None:
+        rows = db.execute(build_search_statement(plan, position, limit, sort)).all()
+    else:
+        # Same filters and page, same rows: a hit only re-reads the cached keys by primary key
+        cache_key = result_cache_key(plan, position, limit, sort)
+        generation = result_cache.generation
+        keys = result_cache.get(cache_key)
+        if keys is not None:
+            rows = db.execute(keyed_search_statement(keys, sort == "relevance")).all()
+        else:
+            rows = db.execute(build_search_statement(plan, position, limit, sort)).all()
+            result_cache.put(cache_key, result_keys(rows), generation)
+    rows, has_more, next_cursor = page_cursor(rows, limit, sort)
+    
+    # Primary image and media count for every project on the page in one query
+    project_ids = result_project_ids(rows)
+    media_by_project = media_summaries_from_rows(db.execute(media_summary_statement(project_ids)).all()) if project_ids else {}
+    
+    approximate_total = None
+    if include_total:
+        approximate_total = indexed_total(plan)
+        if approximate_total is None:
+            approximate_total = approximate_count(db, build_filtered_statement(plan))
+    
+    response = nlp_search_response(plan, rows, media_by_project, search_page_info(sort, limit, has_more, next_cursor, approximate_total))
+    if include_facets:
+        counts = indexed_facet_counts(plan)
+        if counts is None:
+            counts = facets.counts_from_rows(db.execute(facets.facet_statement(build_filtered_statement(plan))).all())
+        response["facets"] = facets.format_facets(counts)
+    return response
+
+def project_configurations(db: Session, project_id: str) -> Dict[str, Any]:
+    return project_configurations_response(project_id, db.execute(project_configurations_statement(project_id)).scalars().all())
+
+def project_nearby_places(db: Session, project_id: str) -> Dict[str, Any]:
+    return project_nearby_places_response(project_id, db.execute(project_nearby_places_statement(project_id)).scalars().all())
+
+def project_media(db: Session, project_id: str) -> Dict[str, Any]:
+    return project_media_response(project_id, db.execute(project_media_statement(project_id)).scalars().all())
@@ -0,0 +1,103 @@
+"""
+Response Serializers
+orjson-backed JSON and NDJSON encoding with Decimal handling in one place, and precomputed row-to-dict mappers
+"""
+
+import json
+import operator
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Optional dependency - falls back to the standard library encoder
+    orjson = None
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def _default(value):
+    """Types the encoder does not know natively: Decimal as float, anything else as its string form"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+if orjson is not None:
+    def dumps(content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+else:
+    def dumps(content: Any) -> bytes:
+        return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson. Returned directly from an endpoint, it also skips FastAPI's jsonable_encoder pass."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def ndjson_lines(items: Iterable[Any]) -> Iterator[bytes]:
+    """One encoded JSON document per line"""
+    for item in items:
+        yield dumps(item) + b"\n"
+
+def row_mapper(*attributes: str, **converters: Callable[[Any], Any]) -> Callable[[Any], Dict[str, Any]]:
+    """Build obj -> dict for a fixed set of attributes, read with a single attrgetter call.
+
+    ``converters`` maps an attribute to a function applied to its value, for
+    fields whose response form differs from what dumps() would produce.
+    Unconverted values are left as-is (Decimal, UUID, date) for dumps().
+    """
+    keys = list(attributes)
+    getter = operator.attrgetter(*keys)
+    plan = [(key, converters.get(key)) for key in keys]
+    if len(keys) == 1:
+        key, convert = plan[0]
+        return lambda obj: {key: convert(getter(obj)) if convert else getter(obj)}
+    if not converters:
+        return lambda obj: dict(zip(keys, getter(obj)))
+    return lambda obj: {key: convert(value) if convert else value for (key, convert), value in zip(plan, getter(obj))}
+
+# Converters keeping the response values of the original hand-written formatters
+
+def float_or_none(value) -> Optional[float]:
+    """float(value), with None for NULL and for 0"""
+    return float(value) if value else None
+
+def str_or_none(value) -> Optional[str]:
+    """str(value) (dates as YYYY-MM-DD), with None for NULL"""
+    return str(value) if value else None
+
+# Per-model mappers for the list endpoints
+
+property_listing = row_mapper(
+    "id", "project_id", "property_type", "bhk_count", "carpet_area_sqft", "super_builtup_area_sqft",
+    "sell_price", "floor_plan_url", "facing", "status", "floor_number",
+    id=str, project_id=str, bhk_count=float_or_none, carpet_area_sqft=float_or_none,
+    super_builtup_area_sqft=float_or_none, sell_price=float_or_none
+)
+
+search_listing = row_mapper(
+    "id", "bhk_count", "carpet_area_sqft", "sell_price", "floor_number", "property_type", "facing", "status",
+    id=str, bhk_count=float_or_none, carpet_area_sqft=float_or_none, sell_price=float_or_none
+)
+
+project_summary = row_mapper(
+    "id", "name", "project_status", "total_units", "total_floors", "possession_date", "rera_number",
+    "description", "project_type",
+    possession_date=str_or_none
+)
+
+search_project = row_mapper(
+    "id", "name", "developer_id", "project_status", "total_units", "total_floors", "possession_date",
+    "rera_number", "description", "project_type",
+    id=str, developer_id=str_or_none, possession_date=str_or_none
+)
+
+nearby_place_summary = row_mapper("place_name", "place_type", "distance_km", "walking_distance", distance_km=float)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark the sync (thread pool) and async (asyncpg) data-access paths against each other.
+Runs the same NLP search statements concurrently through both and prints latency / throughput.
+
+Usage: python benchmark_db_access.py [concurrency] [rounds]
+"""
+
+import sys
+import os
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# The async engine is only created when enabled
+os.environ.setdefault("USE_ASYNC_DB", "true")
+os.environ.setdefault("SQL_ECHO", "false")
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from database import SessionLocal, AsyncSessionLocal, engine, async_engine
+from services.nlp_engine import RealEstateNLPEngine
+from services import search_queries, async_queries
+
+BENCHMARK_QUERIES = [
+    "2 BHK in Baner under 1 crore",
+    "3 bhk flats with gym and swimming pool in wakad",
+    "flats within 2 km of metro station in pune",
+    "apartments above 2 crores in andheri",
+    "ready to move 2 bhk in kharadi",
+    "carpet area under 1000 sqft in hinjewadi",
+    "2 bhk near hospital in pune",
+    "4 bhk above 3 crores in mumbai",
+]
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def report(label, latencies, elapsed):
+    print(f"📊 {label}: {len(latencies)} searches in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:.1f}/s) - "
+          f"p50 {percentile(latencies, 50) * 1000:.1f}ms, "
+          f"p95 {percentile(latencies, 95) * 1000:.1f}ms, "
+          f"max {max(latencies) * 1000:.1f}ms")
+
+def run_sync(plans, concurrency):
+    def search(plan):
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            search_queries.execute_nlp_search(db, plan)
+        finally:
+            db.close()
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(search, plans))
+    report("sync  (thread pool)", latencies, time.perf_counter() - started)
+
+async def run_async(plans, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def search(plan):
+        async with semaphore:
+            started = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                await async_queries.execute_nlp_search(db, plan)
+            return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(search(plan) for plan in plans))
+    report("async (asyncpg)    ", latencies, time.perf_counter() - started)
+    await async_engine.dispose()
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    print("🚀 Parsing benchmark queries...")
+    nlp_engine = RealEstateNLPEngine(pipeline_profile="rules")
+    plans = nlp_engine.plan_queries(BENCHMARK_QUERIES) * rounds
+
+    print(f"🚀 Running {len(plans)} searches with concurrency {concurrency}")
+    # Warm up both pools so connection setup is not measured
+    run_sync(plans[:concurrency], concurrency)
+    asyncio.run(run_async(plans[:concurrency], concurrency))
+
+    print("\n✅ Results:")
+    run_sync(plans, concurrency)
+    asyncio.run(run_async(plans, concurrency))
+    engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Build Nearby Distances
+Recomputes nearby_places for every project with coordinates from a landmark CSV in one batch.
+Supersedes populate_distances.py, populate_nearby_places.py and populate_pune_mumbai_distances_final.py.
+
+Requires database/geo_coordinates.sql and database/nearby_places_unique.sql, with USE_GEO_INDEX=true.
+
+    python build_nearby_distances.py --landmarks landmarks.csv --city Pune --cutoff "Metro Station=2"
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from database import SessionLocal
+from services.distance_builder import load_landmarks, rebuild_nearby_places
+from services.geo_index import USE_GEO_INDEX
+
+def parse_cutoff(value: str):
+    place_type, _, km = value.partition("=")
+    try:
+        return place_type.strip(), float(km)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected 'Place Type=km', got {value!r}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild nearby_places from landmark coordinates")
+    parser.add_argument("--landmarks", required=True, help="CSV with name, place_type, latitude, longitude[, city]")
+    parser.add_argument("--city", help="Only rebuild projects (and landmarks) of this city")
+    parser.add_argument("--cutoff", action="append", type=parse_cutoff, default=[],
+                        help="Per place type cutoff, e.g. 'Airport=25'; repeatable")
+    args = parser.parse_args()
+
+    if not USE_GEO_INDEX:
+        print("❌ Project and landmark coordinates are not mapped - set USE_GEO_INDEX=true (database/geo_coordinates.sql)")
+        sys.exit(1)
+
+    landmarks = load_landmarks(args.landmarks)
+    print(f"ℹ️ Loaded {len(landmarks)} landmarks from {args.landmarks}")
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        stats = rebuild_nearby_places(db, landmarks, city=args.city, cutoffs=dict(args.cutoff))
+        elapsed = time.perf_counter() - started
+    except Exception as e:
+        print(f"❌ Rebuild failed, nothing was changed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print(f"✅ {stats['projects']} projects x {stats['landmarks']} landmarks in {elapsed:.2f}s: "
+          f"{stats['upserted']} nearby places upserted, {stats['deleted']} out-of-range removed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+-- Amenity bitsets
+-- Every amenity gets a stable bit_index; projects.amenity_mask holds the project's amenities as
+-- 64-bit words (bit b lives in amenity_mask[b / 64 + 1] at position b % 64), so "gym and pool and
+-- clubhouse" is one (amenity_mask[1] & m) = m test instead of a join per amenity.
+-- Maintained by triggers on project_amenities. Used when USE_AMENITY_BITSET=true.
+-- Safe to re-run
+
+CREATE SEQUENCE IF NOT EXISTS amenity_bit_index_seq MINVALUE 0 START 0;
+
+ALTER TABLE amenities ADD COLUMN IF NOT EXISTS bit_index SMALLINT;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_amenities_bit_index ON amenities(bit_index);
+
+-- Number existing amenities after any already numbered, then hand out new ones from the sequence
+UPDATE amenities a
+SET bit_index = numbered.bit_index
+FROM (
+    SELECT id, (SELECT coalesce(max(bit_index), -1) FROM amenities) + row_number() OVER (ORDER BY name, id) AS bit_index
+    FROM amenities
+    WHERE bit_index IS NULL
+) numbered
+WHERE a.id = numbered.id;
+
+SELECT setval('amenity_bit_index_seq', (SELECT coalesce(max(bit_index), -1) + 1 FROM amenities), false);
+ALTER TABLE amenities ALTER COLUMN bit_index SET DEFAULT nextval('amenity_bit_index_seq');
+
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS amenity_mask BIGINT[] NOT NULL DEFAULT '{}';
+
+CREATE OR REPLACE FUNCTION project_amenity_mask(p_project_id VARCHAR) RETURNS BIGINT[] AS $$
+    SELECT coalesce(array_agg(coalesce(words.word, 0) ORDER BY slots.word_index), '{}')
+    FROM generate_series(0, (
+        SELECT coalesce(max(a.bit_index) / 64, -1)
+        FROM project_amenities pa JOIN amenities a ON a.id = pa.amenity_id
+        WHERE pa.project_id = p_project_id
+    )) AS slots(word_index)
+    LEFT JOIN (
+        SELECT a.bit_index / 64 AS word_index, bit_or(1::BIGINT << (a.bit_index % 64)) AS word
+        FROM project_amenities pa JOIN amenities a ON a.id = pa.amenity_id
+        WHERE pa.project_id = p_project_id
+        GROUP BY a.bit_index / 64
+    ) words ON words.word_index = slots.word_index;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION refresh_project_amenity_mask() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        UPDATE projects SET amenity_mask = project_amenity_mask(OLD.project_id) WHERE id = OLD.project_id;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        UPDATE projects SET amenity_mask = project_amenity_mask(NEW.project_id) WHERE id = NEW.project_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_project_amenities_mask ON project_amenities;
+CREATE TRIGGER trg_project_amenities_mask AFTER INSERT OR UPDATE OR DELETE ON project_amenities
+FOR EACH ROW EXECUTE FUNCTION refresh_project_amenity_mask();
+
+-- Backfill
+UPDATE projects SET amenity_mask = project_amenity_mask(id);
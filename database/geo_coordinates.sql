@@ -0,0 +1,31 @@
+-- Geographic coordinates for locations, projects and nearby places
+-- WGS84 latitude / longitude in degrees. A project without its own coordinates is placed at its
+-- location's. Radius searches run against the in-process grid (services/geo_index.py); the
+-- (latitude, longitude) indexes serve the bounding-box prefilter of the SQL fallback.
+-- Used when USE_GEO_INDEX=true.
+-- Safe to re-run
+
+ALTER TABLE locations ADD COLUMN IF NOT EXISTS latitude DOUBLE PRECISION;
+ALTER TABLE locations ADD COLUMN IF NOT EXISTS longitude DOUBLE PRECISION;
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS latitude DOUBLE PRECISION;
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS longitude DOUBLE PRECISION;
+ALTER TABLE nearby_places ADD COLUMN IF NOT EXISTS latitude DOUBLE PRECISION;
+ALTER TABLE nearby_places ADD COLUMN IF NOT EXISTS longitude DOUBLE PRECISION;
+
+DO $$
+DECLARE
+    geo_table TEXT;
+BEGIN
+    FOREACH geo_table IN ARRAY ARRAY['locations', 'projects', 'nearby_places'] LOOP
+        EXECUTE format(
+            'ALTER TABLE %I DROP CONSTRAINT IF EXISTS %I, ADD CONSTRAINT %I CHECK '
+            '(latitude BETWEEN -90 AND 90 AND longitude BETWEEN -180 AND 180)',
+            geo_table, geo_table || '_coordinates_check', geo_table || '_coordinates_check'
+        );
+        EXECUTE format(
+            'CREATE INDEX IF NOT EXISTS %I ON %I(latitude, longitude) WHERE latitude IS NOT NULL',
+            'idx_' || geo_table || '_lat_lng', geo_table
+        );
+    END LOOP;
+END;
+$$;
@@ -0,0 +1,17 @@
+-- One nearby_places row per (project, place type, place name)
+-- Lets build_nearby_distances.py bulk-upsert with ON CONFLICT instead of checking each row first.
+-- Existing duplicates keep their nearest-distance row.
+-- Safe to re-run
+
+DELETE FROM nearby_places n
+USING (
+    SELECT id, row_number() OVER (
+        PARTITION BY project_id, place_type, place_name
+        ORDER BY distance_km NULLS LAST, updated_at DESC, id
+    ) AS rn
+    FROM nearby_places
+) ranked
+WHERE n.id = ranked.id AND ranked.rn > 1;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_nearby_places_project_place
+    ON nearby_places(project_id, place_type, place_name);
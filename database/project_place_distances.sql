@@ -0,0 +1,66 @@
+-- Nearest nearby-place distance per project
+-- One row per (project, place type) with place_name_lc = '' holding the nearest place of that type,
+-- plus one row per (project, place type, named place). "near metro within 2 km" becomes a range scan
+-- of idx_project_place_distances_lookup instead of a join over every nearby place.
+-- Maintained by statement-level triggers on nearby_places. Used when USE_PLACE_DISTANCES=true.
+-- Safe to re-run
+
+CREATE TABLE IF NOT EXISTS project_place_distances (
+    project_id VARCHAR NOT NULL,
+    place_type_lc VARCHAR(100) NOT NULL,
+    place_name_lc VARCHAR(200) NOT NULL DEFAULT '',  -- '' = nearest of any name
+    min_distance_km NUMERIC(5, 2),  -- NULL when no place of the group has a distance
+    PRIMARY KEY (project_id, place_type_lc, place_name_lc)
+);
+
+CREATE INDEX IF NOT EXISTS idx_project_place_distances_lookup
+    ON project_place_distances(place_type_lc, place_name_lc, min_distance_km, project_id);
+
+CREATE OR REPLACE FUNCTION refresh_project_place_distances(p_project_ids VARCHAR[]) RETURNS void AS $$
+    DELETE FROM project_place_distances WHERE project_id = ANY(p_project_ids);
+
+    INSERT INTO project_place_distances (project_id, place_type_lc, place_name_lc, min_distance_km)
+    SELECT n.project_id::varchar, lower(n.place_type), '', min(n.distance_km)
+    FROM nearby_places n
+    WHERE n.project_id::varchar = ANY(p_project_ids)
+    GROUP BY n.project_id::varchar, lower(n.place_type)
+    UNION ALL
+    SELECT n.project_id::varchar, lower(n.place_type), lower(n.place_name), min(n.distance_km)
+    FROM nearby_places n
+    WHERE n.project_id::varchar = ANY(p_project_ids) AND coalesce(n.place_name, '') <> ''
+    GROUP BY n.project_id::varchar, lower(n.place_type), lower(n.place_name);
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION nearby_places_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_project_place_distances(ARRAY(SELECT DISTINCT project_id::varchar FROM new_rows));
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM refresh_project_place_distances(ARRAY(
+            SELECT project_id::varchar FROM new_rows UNION SELECT project_id::varchar FROM old_rows
+        ));
+    ELSE
+        PERFORM refresh_project_place_distances(ARRAY(SELECT DISTINCT project_id::varchar FROM old_rows));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables need one trigger per event; statement-level so a bulk load refreshes each project once
+DROP TRIGGER IF EXISTS trg_nearby_places_distances_insert ON nearby_places;
+CREATE TRIGGER trg_nearby_places_distances_insert AFTER INSERT ON nearby_places
+REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION nearby_places_changed();
+
+DROP TRIGGER IF EXISTS trg_nearby_places_distances_update ON nearby_places;
+CREATE TRIGGER trg_nearby_places_distances_update AFTER UPDATE ON nearby_places
+REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION nearby_places_changed();
+
+DROP TRIGGER IF EXISTS trg_nearby_places_distances_delete ON nearby_places;
+CREATE TRIGGER trg_nearby_places_distances_delete AFTER DELETE ON nearby_places
+REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION nearby_places_changed();
+
+-- Backfill
+TRUNCATE project_place_distances;
+SELECT refresh_project_place_distances(ARRAY(SELECT DISTINCT project_id::varchar FROM nearby_places));
+
+ANALYZE project_place_distances;
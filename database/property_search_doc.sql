@@ -0,0 +1,122 @@
+-- Flattened property search document
+-- One row per (property, project location) with every column the NLP search filters on,
+-- pre-joined and lower-cased so a search is a single indexed scan of one relation.
+-- Refreshed concurrently by the API (SearchDocRefresher) whenever the triggers below mark it dirty.
+-- Safe to re-run
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS property_search_doc AS
+SELECT
+    p.id AS property_id,
+    p.project_id,
+    pl.location_id,
+    lower(l.city) AS city_lc,
+    lower(l.locality) AS locality_lc,
+    -- Status enums: 1 = ready to move, 2 = under construction, 3 = completed, 0 = other
+    CASE
+        WHEN lower(pr.project_status) LIKE '%ready%move%' THEN 1
+        WHEN lower(pr.project_status) LIKE '%under%construction%' THEN 2
+        WHEN lower(pr.project_status) LIKE '%completed%' THEN 3
+        ELSE 0
+    END::smallint AS project_status_code,
+    coalesce(lower(p.status) LIKE '%sold%', false) AS is_sold,
+    lower(p.property_type) AS property_type_lc,
+    p.bhk_count,
+    p.sell_price,
+    p.carpet_area_sqft,
+    p.sell_price / nullif(p.carpet_area_sqft, 0) AS price_per_sqft,
+    -- Amenities: ids for exact lookups, '|'-joined lower-cased names for substring matches
+    coalesce(am.amenity_ids, ARRAY[]::varchar[]) AS amenity_ids,
+    coalesce(am.amenity_names_lc, '') AS amenity_names_lc,
+    -- Minimum distance per lower-cased nearby place type, e.g. {"metro station": 0.8, "school": 1.2}
+    coalesce(np.nearby_min_km, '{}'::jsonb) AS nearby_min_km,
+    coalesce(rs.balcony_count, 0) AS balcony_count,
+    coalesce(rs.feature_tags_lc, '') AS feature_tags_lc,
+    media.primary_image,
+    coalesce(media.media_count, 0) AS media_count
+FROM properties p
+JOIN projects pr ON pr.id = p.project_id
+JOIN project_locations pl ON pl.project_id = p.project_id
+JOIN locations l ON l.id = pl.location_id
+LEFT JOIN LATERAL (
+    SELECT
+        array_agg(a.id ORDER BY a.id) AS amenity_ids,
+        string_agg(lower(a.name), '|' ORDER BY a.name) AS amenity_names_lc
+    FROM project_amenities pa
+    JOIN amenities a ON a.id = pa.amenity_id
+    WHERE pa.project_id = p.project_id
+) am ON true
+LEFT JOIN LATERAL (
+    SELECT jsonb_object_agg(place_type_lc, min_km) AS nearby_min_km
+    FROM (
+        SELECT lower(n.place_type) AS place_type_lc, min(n.distance_km) AS min_km
+        FROM nearby_places n
+        WHERE n.project_id::varchar = p.project_id
+        GROUP BY lower(n.place_type)
+    ) per_type
+) np ON true
+LEFT JOIN LATERAL (
+    SELECT
+        count(*) FILTER (WHERE lower(r.room_type) = 'balcony') AS balcony_count,
+        (
+            SELECT string_agg(DISTINCT lower(f), '|')
+            FROM room_specifications r2, unnest(r2.features) f
+            WHERE r2.property_id = p.id
+        ) AS feature_tags_lc
+    FROM room_specifications r
+    WHERE r.property_id = p.id
+) rs ON true
+LEFT JOIN LATERAL (
+    SELECT
+        count(*) AS media_count,
+        max(m.file_path) FILTER (WHERE m.is_primary) AS primary_image
+    FROM project_media m
+    WHERE m.project_id = p.project_id AND m.is_active
+) media ON true
+WITH DATA;
+
+-- Required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_property_search_doc_pk ON property_search_doc(property_id, location_id);
+
+CREATE INDEX IF NOT EXISTS idx_property_search_doc_price ON property_search_doc(sell_price, property_id) WHERE NOT is_sold;
+CREATE INDEX IF NOT EXISTS idx_property_search_doc_bhk ON property_search_doc(bhk_count) WHERE NOT is_sold;
+CREATE INDEX IF NOT EXISTS idx_property_search_doc_city ON property_search_doc(city_lc);
+CREATE INDEX IF NOT EXISTS idx_property_search_doc_locality ON property_search_doc(locality_lc);
+CREATE INDEX IF NOT EXISTS idx_property_search_doc_status ON property_search_doc(project_status_code);
+CREATE INDEX IF NOT EXISTS idx_property_search_doc_nearby ON property_search_doc USING GIN (nearby_min_km);
+
+-- Dirty flag set by triggers on every source table and cleared by the refresher
+CREATE TABLE IF NOT EXISTS property_search_doc_state (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    dirty BOOLEAN NOT NULL DEFAULT false,
+    changed_at TIMESTAMP WITH TIME ZONE,
+    refreshed_at TIMESTAMP WITH TIME ZONE
+);
+INSERT INTO property_search_doc_state (id, dirty, refreshed_at) VALUES (1, false, now())
+ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION mark_property_search_doc_dirty() RETURNS trigger AS $$
+BEGIN
+    UPDATE property_search_doc_state SET dirty = true, changed_at = now() WHERE id = 1 AND NOT dirty;
+    PERFORM pg_notify('property_search_doc_dirty', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Statement-level, so a bulk load marks the view dirty once
+DO $$
+DECLARE
+    source_table TEXT;
+BEGIN
+    FOREACH source_table IN ARRAY ARRAY[
+        'properties', 'projects', 'project_locations', 'locations', 'project_amenities',
+        'amenities', 'nearby_places', 'room_specifications', 'project_media'
+    ] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%s_search_doc_dirty ON %I', source_table, source_table);
+        EXECUTE format(
+            'CREATE TRIGGER trg_%s_search_doc_dirty AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I '
+            'FOR EACH STATEMENT EXECUTE FUNCTION mark_property_search_doc_dirty()',
+            source_table, source_table
+        );
+    END LOOP;
+END;
+$$;
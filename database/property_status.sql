@@ -0,0 +1,22 @@
+-- Normalized property status
+-- properties.status_code (1 = available, 2 = booked/reserved/on hold, 3 = sold) derived from the
+-- free-text status by Postgres, so existing writers that only set status keep working.
+-- Adding the column backfills every existing row (one table rewrite); run outside peak hours.
+-- Listed inventory is status_code <> 3; the partial indexes below only cover those rows.
+-- Used when USE_STATUS_CODE=true; apply this first.
+-- Safe to re-run
+
+ALTER TABLE properties ADD COLUMN IF NOT EXISTS status_code SMALLINT NOT NULL GENERATED ALWAYS AS (
+    CASE
+        WHEN lower(status) LIKE '%sold%' THEN 3
+        WHEN lower(status) LIKE '%book%' OR lower(status) LIKE '%reserv%' OR lower(status) LIKE '%hold%' THEN 2
+        ELSE 1
+    END
+) STORED;
+
+-- Available inventory: project configurations, price-ordered search pages, BHK filters
+CREATE INDEX IF NOT EXISTS idx_properties_available_project ON properties(project_id, bhk_count) WHERE status_code <> 3;
+CREATE INDEX IF NOT EXISTS idx_properties_available_price_id ON properties(sell_price, id) WHERE status_code <> 3;
+CREATE INDEX IF NOT EXISTS idx_properties_available_bhk ON properties(bhk_count) WHERE status_code <> 3;
+
+ANALYZE properties;
@@ -0,0 +1,46 @@
+-- Search data version
+-- A counter bumped by statement-level triggers on every table an NLP search or list endpoint reads.
+-- API workers poll it (DataVersionWatcher) and drop cached search results when it moves, so writes
+-- from populate scripts, build_nearby_distances.py or psql invalidate the cache like API writes do.
+-- Safe to re-run
+
+CREATE TABLE IF NOT EXISTS search_data_version (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 0,
+    changed_at TIMESTAMP WITH TIME ZONE
+);
+INSERT INTO search_data_version (id, version, changed_at) VALUES (1, 0, now())
+ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_search_data_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE search_data_version SET version = version + 1, changed_at = now() WHERE id = 1;
+    PERFORM pg_notify('search_data_changed', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Statement-level, so a bulk load bumps the version once. Optional tables (project_place_distances,
+-- and property_search_doc_state, updated when the materialized view is refreshed) are skipped if absent;
+-- re-run this script after creating them.
+DO $$
+DECLARE
+    source_table TEXT;
+BEGIN
+    FOREACH source_table IN ARRAY ARRAY[
+        'properties', 'projects', 'project_locations', 'locations', 'project_amenities', 'amenities',
+        'nearby_places', 'room_specifications', 'project_media', 'project_place_distances',
+        'property_search_doc_state'
+    ] LOOP
+        IF to_regclass(source_table) IS NULL THEN
+            CONTINUE;
+        END IF;
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%s_search_data_version ON %I', source_table, source_table);
+        EXECUTE format(
+            'CREATE TRIGGER trg_%s_search_data_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I '
+            'FOR EACH STATEMENT EXECUTE FUNCTION bump_search_data_version()',
+            source_table, source_table
+        );
+    END LOOP;
+END;
+$$;
@@ -0,0 +1,15 @@
+-- Indexes for the keyset-paginated search endpoints
+-- Safe to re-run
+
+-- Keyset pagination order: (sell_price, id)
+CREATE INDEX IF NOT EXISTS idx_properties_price_id ON properties(sell_price, id);
+CREATE INDEX IF NOT EXISTS idx_properties_project_id ON properties(project_id);
+
+-- Nearby place EXISTS filters and per-page nearby place lookups
+CREATE INDEX IF NOT EXISTS idx_nearby_places_project_distance ON nearby_places(project_id, distance_km);
+
+-- One location per project
+CREATE INDEX IF NOT EXISTS idx_project_locations_project_id ON project_locations(project_id, location_id);
+
+-- /api/v1/properties keyset order: (name, id)
+CREATE INDEX IF NOT EXISTS idx_projects_name_id ON projects(name, id);
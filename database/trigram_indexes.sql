@@ -0,0 +1,37 @@
+-- Normalized lookup columns and trigram indexes for free-text search filters
+-- Exact lookups hit the B-tree indexes on the lowercase columns; substring and
+-- fuzzy matches (LIKE '%x%', the % similarity operator) hit the pg_trgm GIN indexes.
+-- Used by services/lookup.py when USE_TRIGRAM_LOOKUPS=true.
+-- Adding a stored generated column rewrites the table once; run outside peak hours.
+-- Safe to re-run
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Lowercase copies maintained by Postgres, so they can never drift from the source column
+ALTER TABLE locations ADD COLUMN IF NOT EXISTS city_lc VARCHAR(100) GENERATED ALWAYS AS (lower(city)) STORED;
+ALTER TABLE locations ADD COLUMN IF NOT EXISTS locality_lc VARCHAR(255) GENERATED ALWAYS AS (lower(locality)) STORED;
+ALTER TABLE amenities ADD COLUMN IF NOT EXISTS name_lc VARCHAR(100) GENERATED ALWAYS AS (lower(name)) STORED;
+ALTER TABLE nearby_places ADD COLUMN IF NOT EXISTS place_type_lc VARCHAR(100) GENERATED ALWAYS AS (lower(place_type)) STORED;
+ALTER TABLE nearby_places ADD COLUMN IF NOT EXISTS place_name_lc VARCHAR(200) GENERATED ALWAYS AS (lower(place_name)) STORED;
+ALTER TABLE properties ADD COLUMN IF NOT EXISTS property_type_lc VARCHAR(100) GENERATED ALWAYS AS (lower(property_type)) STORED;
+
+-- Exact lookups
+CREATE INDEX IF NOT EXISTS idx_locations_city_lc ON locations(city_lc);
+CREATE INDEX IF NOT EXISTS idx_locations_locality_lc ON locations(locality_lc);
+CREATE INDEX IF NOT EXISTS idx_amenities_name_lc ON amenities(name_lc);
+CREATE INDEX IF NOT EXISTS idx_nearby_places_type_lc ON nearby_places(place_type_lc, project_id);
+CREATE INDEX IF NOT EXISTS idx_nearby_places_name_lc ON nearby_places(place_name_lc);
+CREATE INDEX IF NOT EXISTS idx_properties_type_lc ON properties(property_type_lc);
+
+-- Substring and similarity fallbacks
+CREATE INDEX IF NOT EXISTS idx_locations_city_trgm ON locations USING GIN (city_lc gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_locations_locality_trgm ON locations USING GIN (locality_lc gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_amenities_name_trgm ON amenities USING GIN (name_lc gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_nearby_places_type_trgm ON nearby_places USING GIN (place_type_lc gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_nearby_places_name_trgm ON nearby_places USING GIN (place_name_lc gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_properties_type_trgm ON properties USING GIN (property_type_lc gin_trgm_ops);
+
+ANALYZE locations;
+ANALYZE amenities;
+ANALYZE nearby_places;
+ANALYZE properties;
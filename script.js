@@ -1321,7 +1321,7 @@ async function searchProperties(query, isUserInput = false) {
             headers: {
                 'Content-Type': 'application/x-www-form-urlencoded',
             },
-            body: `query=${encodeURIComponent(enhancedQuery)}`
+            body: `query=${encodeURIComponent(enhancedQuery)}&sort=relevance`  // Best matches first, ranked server-side
         });
         
         if (!response.ok) {
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for the amenity bitset masks
+"""
+
+import sys
+import os
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from sqlalchemy import column
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.types import BigInteger
+
+from services.amenity_bits import WORD_BITS, amenity_masks, amenity_mask_condition, word_mask, _signed
+
+# Bit 70 lands in the second word
+CATALOGUE = {"gym": 0, "swimming pool": 1, "kids pool": 2, "clubhouse": 3, "power backup": 70}
+
+def project_bits(*names):
+    return word_mask(CATALOGUE[name] for name in names)
+
+def satisfies(bits, masks):
+    """What amenity_mask_condition checks in SQL, over a {word: bits} project bitset"""
+    all_of, any_of = masks
+    if any(bits.get(word, 0) & mask != mask for word, mask in all_of.items()):
+        return False
+    return all(any(bits.get(word, 0) & mask for word, mask in group.items()) for group in any_of)
+
+def test_word_mask_spans_words():
+    assert word_mask([0, 3, 70]) == {0: 0b1001, 1: 1 << (70 - WORD_BITS)}
+
+def test_all_requires_every_amenity():
+    masks = amenity_masks(CATALOGUE, ["gym", "clubhouse"], match_all=True)
+    assert masks == ({0: 0b1001}, [])  # distinct amenities fold into one mask test
+    assert satisfies(project_bits("gym", "clubhouse", "kids pool"), masks)
+    assert not satisfies(project_bits("gym"), masks)
+
+def test_all_with_ambiguous_term():
+    # "pool" names two amenities, so it is one any-of group next to the exact gym bit
+    masks = amenity_masks(CATALOGUE, ["gym", "pool"], match_all=True)
+    assert masks == ({0: 0b1}, [{0: 0b110}])
+    assert satisfies(project_bits("gym", "kids pool"), masks)
+    assert not satisfies(project_bits("gym"), masks)
+    assert not satisfies(project_bits("swimming pool"), masks)
+
+def test_any_requires_one_amenity():
+    masks = amenity_masks(CATALOGUE, ["gym", "power backup"], match_all=False)
+    assert satisfies(project_bits("power backup"), masks)
+    assert satisfies(project_bits("gym"), masks)
+    assert not satisfies(project_bits("clubhouse"), masks)
+
+def test_unknown_amenities():
+    # ALL cannot match if one amenity does not exist; ANY only needs one that does
+    assert amenity_masks(CATALOGUE, ["gym", "helipad"], match_all=True) is None
+    assert amenity_masks(CATALOGUE, ["helipad"], match_all=False) is None
+    assert amenity_masks(CATALOGUE, ["gym", "helipad"], match_all=False) == ({}, [{0: 0b1}])
+
+def test_sql_condition_uses_signed_words():
+    assert _signed((1 << 64) - 1) == -1 and _signed(1 << 63) == -(1 << 63) and _signed(5) == 5
+    mask_column = column("amenity_mask", ARRAY(BigInteger))
+    all_of, any_of = amenity_masks(CATALOGUE, ["gym", "pool", "power backup"], match_all=True)
+    compiled = amenity_mask_condition(mask_column, all_of, any_of).compile(dialect=postgresql.dialect())
+    assert str(compiled).count("amenity_mask[") == 3 and str(compiled).count("!=") == 1
+    # Words are 1-based in the BIGINT[] column: gym in word 1, power backup in word 2, the pool group in word 1
+    params = compiled.params
+    assert [params[f"amenity_mask_{i}"] for i in (1, 2, 3)] == [1, 2, 1]
+
+if __name__ == "__main__":
+    test_word_mask_spans_words()
+    test_all_requires_every_amenity()
+    test_all_with_ambiguous_term()
+    test_any_requires_one_amenity()
+    test_unknown_amenities()
+    test_sql_condition_uses_signed_words()
+    print("✅ Amenity bitset tests passed!")
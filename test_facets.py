@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for the NLP search facets
+"""
+
+import sys
+import os
+from decimal import Decimal
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from services.facets import FACETS, PRICE_BANDS, counts_from_rows, format_facets
+from services.search_doc import PROJECT_STATUS_CODES
+
+def grouping_row(facet, value, count):
+    """A facet_statement row: GROUPING() sets one bit per column outside the row's set, first column highest"""
+    index = FACETS.index(facet)
+    grouping = sum(1 << (len(FACETS) - 1 - i) for i in range(len(FACETS)) if i != index)
+    values = [None] * len(FACETS)
+    values[index] = value
+    return (grouping, *values, count)
+
+def test_rows_fold_into_their_facet():
+    rows = [
+        grouping_row("bhk", Decimal("2.0"), 7),
+        grouping_row("bhk", Decimal("3.0"), 4),
+        grouping_row("price_band", 1, 9),
+        grouping_row("locality", "baner", 5),
+        grouping_row("project_status", PROJECT_STATUS_CODES["ready_to_move"], 6),
+        grouping_row("amenity", "gym", 3),
+    ]
+    counts = counts_from_rows(rows)
+    assert counts["bhk"] == {Decimal("2.0"): 7, Decimal("3.0"): 4}
+    assert counts["price_band"] == {1: 9}
+    assert counts["locality"] == {"baner": 5}
+    assert counts["project_status"] == {PROJECT_STATUS_CODES["ready_to_move"]: 6}
+    assert counts["amenity"] == {"gym": 3}
+
+def test_null_values_are_dropped():
+    # NULL locality / no amenity rows come back as their own group and are not a facet value
+    counts = counts_from_rows([grouping_row("locality", None, 2), grouping_row("amenity", None, 8)])
+    assert counts["locality"] == {} and counts["amenity"] == {}
+    assert set(counts) == set(FACETS)
+
+def test_format_orders_and_caps():
+    counts = {
+        "bhk": {Decimal("3.0"): 1, Decimal("1.0"): 2, Decimal("2.0"): 5},
+        "price_band": {len(PRICE_BANDS) - 1: 1, 0: 4},
+        "locality": {"wakad": 2, "baner": 2, "aundh": 9},
+        "project_status": {PROJECT_STATUS_CODES["completed"]: 1, 0: 3},
+        "amenity": {"gym": 1},
+    }
+    facets = format_facets(counts, limit=2)
+    assert facets["bhk"] == [{"value": 1.0, "count": 2}, {"value": 2.0, "count": 5}]  # natural order, capped
+    assert [band["value"] for band in facets["price_band"]] == [PRICE_BANDS[0][1], PRICE_BANDS[-1][1]]
+    assert facets["locality"] == [{"value": "aundh", "count": 9}, {"value": "baner", "count": 2}]  # ties by name
+    assert facets["project_status"] == [{"value": "other", "count": 3}, {"value": "completed", "count": 1}]
+    assert facets["amenity"] == [{"value": "gym", "count": 1}]
+
+if __name__ == "__main__":
+    test_rows_fold_into_their_facet()
+    test_null_values_are_dropped()
+    test_format_orders_and_caps()
+    print("✅ Facet tests passed!")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script for the Aho-Corasick gazetteer matcher
+"""
+
+import sys
+import os
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from services.gazetteer import Gazetteer
+
+def build_gazetteer():
+    gazetteer = Gazetteer()
+    gazetteer.add_all(["pune", "mumbai", "navi mumbai"], "city")
+    gazetteer.add_all(["baner", "wakad", "navi mumbai"], "locality")
+    gazetteer.add_all(["metro station", "metro", "station"], "nearby_place_type")
+    return gazetteer.build()
+
+def test_finds_overlapping_terms_with_offsets():
+    """Every occurrence is reported, including terms nested inside longer ones"""
+    text = "2 bhk in navi mumbai near metro station"
+    matches = build_gazetteer().scan(text)
+
+    found = {(hit.term, hit.category, hit.start, hit.end) for hit in matches.hits}
+    assert ("navi mumbai", "city", 9, 20) in found
+    assert ("navi mumbai", "locality", 9, 20) in found
+    assert ("mumbai", "city", 14, 20) in found
+    assert ("metro station", "nearby_place_type", 26, 39) in found
+    assert ("metro", "nearby_place_type", 26, 31) in found
+    assert ("station", "nearby_place_type", 32, 39) in found
+    for hit in matches.hits:
+        assert text[hit.start:hit.end] == hit.term
+
+def test_first_occurrences_follow_registration_order():
+    """first_occurrences mirrors looping over the term list with text.find()"""
+    matches = build_gazetteer().scan("wakad or baner, baner preferred")
+    localities = matches.first_occurrences("locality")
+
+    assert [hit.term for hit in localities] == ["baner", "wakad"]
+    assert localities[0].start == 9
+
+def test_category_helpers():
+    matches = build_gazetteer().scan("flats in pune")
+    assert matches.has("city")
+    assert not matches.has("locality")
+    assert matches.terms("city") == ["pune"]
+
+def test_no_hits_on_unrelated_text():
+    matches = build_gazetteer().scan("what is carpet area")
+    assert matches.hits == []
+
+if __name__ == "__main__":
+    test_finds_overlapping_terms_with_offsets()
+    test_first_occurrences_follow_registration_order()
+    test_category_helpers()
+    test_no_hits_on_unrelated_text()
+    print("✅ Gazetteer tests passed!")
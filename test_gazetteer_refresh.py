@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental gazetteer refresh watermarks
+"""
+
+import sys
+import os
+import uuid
+from datetime import datetime, timedelta
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models import Base, Location, ProjectLocation, NearbyPlace
+from services.gazetteer_refresh import GazetteerRefresher
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+class RecordingEngine:
+    """Stands in for the NLP engine; keeps the last dictionary it was given"""
+    def __init__(self):
+        self.localities = []
+        self.place_types = {}
+
+    def update_locations(self, cities, localities, place_types):
+        self.localities = sorted(localities)
+        self.place_types = place_types
+
+def make_refresher(overlap_seconds=60):
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    tables = [Base.metadata.tables[name] for name in ("locations", "project_locations", "nearby_places")]
+    Base.metadata.create_all(engine, tables=tables)
+    Session = sessionmaker(bind=engine)
+    refresher = GazetteerRefresher(RecordingEngine(), session_factory=Session, interval_seconds=300,
+                                   full_reload_every=1000, overlap_seconds=overlap_seconds)
+    return refresher, Session
+
+def add_location(db, location_id, locality, updated_at, linked_at=None):
+    db.add(Location(id=location_id, city="Pune", locality=locality, created_at=updated_at, updated_at=updated_at))
+    if linked_at is not None:
+        link(db, location_id, linked_at)
+
+def link(db, location_id, linked_at):
+    db.add(ProjectLocation(id=str(uuid.uuid4()), project_id="proj-1", location_id=location_id,
+                           created_at=linked_at, updated_at=linked_at))
+
+def test_late_commits_inside_the_overlap_are_picked_up():
+    refresher, Session = make_refresher(overlap_seconds=60)
+    with Session() as db:
+        add_location(db, "loc-1", "Baner", T0, linked_at=T0)
+        db.commit()
+    assert refresher.refresh()
+    assert refresher.nlp_engine.localities == ["Baner"]
+
+    # Stamped before the watermark (its transaction started earlier) but committed after the last refresh
+    with Session() as db:
+        add_location(db, "loc-2", "Wakad", T0 - timedelta(seconds=20), linked_at=T0 - timedelta(seconds=20))
+        db.add(NearbyPlace(id=uuid.uuid4(), project_id=uuid.uuid4(), place_type="Metro Station",
+                           place_name="Wakad Metro", created_at=T0, updated_at=T0))
+        db.commit()
+    assert refresher.refresh()
+    assert refresher.nlp_engine.localities == ["Baner", "Wakad"]
+    assert refresher.nlp_engine.place_types == {"Wakad Metro": "Metro Station"}
+
+    # Re-reading the window is harmless: nothing changed, nothing is rebuilt
+    assert not refresher.refresh()
+
+def test_newly_linked_location_advances_its_own_watermark():
+    refresher, Session = make_refresher(overlap_seconds=0)
+    with Session() as db:
+        add_location(db, "loc-1", "Baner", T0, linked_at=T0)
+        # Old location without inventory yet
+        add_location(db, "loc-old", "Aundh", T0 - timedelta(days=30))
+        db.commit()
+    refresher.refresh()
+    assert refresher.nlp_engine.localities == ["Baner"]
+
+    linked_at = T0 + timedelta(minutes=5)
+    with Session() as db:
+        link(db, "loc-old", linked_at)
+        db.commit()
+    assert refresher.refresh()
+    assert refresher.nlp_engine.localities == ["Aundh", "Baner"]
+    # The link moved the project_locations watermark, not the locations one
+    assert refresher._link_watermark == linked_at
+    assert refresher._location_watermark == T0
+
+if __name__ == "__main__":
+    test_late_commits_inside_the_overlap_are_picked_up()
+    test_newly_linked_location_advances_its_own_watermark()
+    print("✅ Gazetteer refresh tests passed!")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for the coordinate grid and radius helpers
+"""
+
+import sys
+import os
+import math
+import random
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from services.geo_index import CELL_DEGREES, EARTH_RADIUS_KM, GeoGrid, GeoPoint, bounding_box, haversine_km
+
+PUNE = GeoPoint(18.5204, 73.8567)
+
+def offset(center: GeoPoint, north_km: float = 0.0, east_km: float = 0.0) -> GeoPoint:
+    """Point at the given great-circle distance due north (or south) / east (or west) of ``center``"""
+    latitude = center.latitude + math.degrees(north_km / EARTH_RADIUS_KM)
+    if not east_km:
+        return GeoPoint(latitude, center.longitude)
+    # Destination point along an initial bearing of 90 / 270 degrees
+    lat1, lng1, angle = math.radians(center.latitude), math.radians(center.longitude), abs(east_km) / EARTH_RADIUS_KM
+    bearing = math.pi / 2 if east_km > 0 else -math.pi / 2
+    lat2 = math.asin(math.sin(lat1) * math.cos(angle) + math.cos(lat1) * math.sin(angle) * math.cos(bearing))
+    lng2 = lng1 + math.atan2(math.sin(bearing) * math.sin(angle) * math.cos(lat1), math.cos(angle) - math.sin(lat1) * math.sin(lat2))
+    return GeoPoint(math.degrees(lat2), math.degrees(lng2))
+
+def test_haversine_known_distances():
+    assert haversine_km(PUNE, PUNE) == 0.0
+    mumbai = GeoPoint(19.0760, 72.8777)
+    assert abs(haversine_km(PUNE, mumbai) - 119.9) < 1.0
+    assert abs(haversine_km(mumbai, PUNE) - haversine_km(PUNE, mumbai)) < 1e-9
+    # A quarter of a meridian, and antipodes (asin argument clamped to 1)
+    assert abs(haversine_km(GeoPoint(0, 0), GeoPoint(90, 0)) - math.pi * EARTH_RADIUS_KM / 2) < 1e-6
+    assert abs(haversine_km(GeoPoint(0, 0), GeoPoint(0, 180)) - math.pi * EARTH_RADIUS_KM) < 1e-6
+
+def test_radius_is_inclusive_and_exact():
+    grid = GeoGrid([("inside", offset(PUNE, north_km=2.999)), ("outside", offset(PUNE, north_km=3.001)), ("center", PUNE)])
+    matches = grid.within(PUNE, 3.0)
+    assert set(matches) == {"inside", "center"}
+    assert matches["center"] == 0.0 and abs(matches["inside"] - 2.999) < 1e-6
+    assert set(grid.within(PUNE, 0.0)) == {"center"}
+
+def test_points_at_the_box_edge_are_found():
+    # Just inside the radius in every direction - the bounding box must not clip them
+    radius_km = 25.0
+    points = [
+        ("n", offset(PUNE, north_km=radius_km * 0.9999)),
+        ("s", offset(PUNE, north_km=-radius_km * 0.9999)),
+        ("e", offset(PUNE, east_km=radius_km * 0.9999)),
+        ("w", offset(PUNE, east_km=-radius_km * 0.9999)),
+    ]
+    assert set(GeoGrid(points).within(PUNE, radius_km)) == {"n", "s", "e", "w"}
+    min_lat, max_lat, min_lng, max_lng = bounding_box(PUNE, radius_km)
+    for _, point in points:
+        assert min_lat <= point.latitude <= max_lat and min_lng <= point.longitude <= max_lng
+
+def test_cell_boundaries_and_negative_coordinates():
+    # Points sitting exactly on cell edges, and on both sides of the equator / prime meridian
+    edge = GeoPoint(CELL_DEGREES * 371, CELL_DEGREES * 1477)
+    points = [
+        ("edge", edge),
+        ("below_edge", GeoPoint(edge.latitude - 1e-9, edge.longitude - 1e-9)),
+        ("equator_south", GeoPoint(-0.001, 0.0)),
+        ("meridian_west", GeoPoint(0.0, -0.001)),
+    ]
+    grid = GeoGrid(points)
+    assert set(grid.within(edge, 0.01)) == {"edge", "below_edge"}
+    assert set(grid.within(GeoPoint(0.0, 0.0), 0.5)) == {"equator_south", "meridian_west"}
+
+def test_grid_matches_brute_force():
+    rng = random.Random(7)
+    points = [
+        (f"p{i}", GeoPoint(PUNE.latitude + rng.uniform(-0.6, 0.6), PUNE.longitude + rng.uniform(-0.6, 0.6)))
+        for i in range(2000)
+    ]
+    grid = GeoGrid(points)
+    assert grid.size == len(points)
+    for radius_km in (0.5, 3.0, 12.0, 40.0):
+        for _ in range(5):
+            center = GeoPoint(PUNE.latitude + rng.uniform(-0.5, 0.5), PUNE.longitude + rng.uniform(-0.5, 0.5))
+            expected = {key for key, point in points if haversine_km(center, point) <= radius_km}
+            assert set(grid.within(center, radius_km)) == expected
+            # The SQL path pre-filters on the same box
+            min_lat, max_lat, min_lng, max_lng = bounding_box(center, radius_km)
+            for key, point in points:
+                if key in expected:
+                    assert min_lat <= point.latitude <= max_lat and min_lng <= point.longitude <= max_lng
+
+if __name__ == "__main__":
+    test_haversine_known_distances()
+    test_radius_is_inclusive_and_exact()
+    test_points_at_the_box_edge_are_found()
+    test_cell_boundaries_and_negative_coordinates()
+    test_grid_matches_brute_force()
+    print("✅ Geo index tests passed!")
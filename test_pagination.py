@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for the keyset pagination cursors
+"""
+
+import sys
+import os
+import base64
+from decimal import Decimal
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from sqlalchemy import column
+from sqlalchemy.dialects import postgresql
+
+from services.pagination import (
+    encode_cursor, decode_cursor, price_cursor, decode_price_cursor, after_price_cursor,
+    name_cursor, decode_name_cursor, after_position
+)
+
+def expect_invalid(decode, cursor, *args):
+    try:
+        decode(cursor, *args)
+    except ValueError:
+        return
+    raise AssertionError(f"{cursor!r} should be rejected")
+
+def test_price_cursor_round_trip():
+    cursor = price_cursor(Decimal("4500000.50"), "prop-1")
+    assert "=" not in cursor  # URL-safe, padding stripped
+    assert decode_price_cursor(cursor) == (Decimal("4500000.50"), "prop-1")
+
+    # Exact decimals survive, no float rounding
+    assert decode_price_cursor(price_cursor(Decimal("0.1"), 7)) == (Decimal("0.1"), "7")
+
+    cursor = price_cursor(Decimal("100"), "prop-2", "loc-9")
+    assert decode_price_cursor(cursor, tie_breakers=1) == (Decimal("100"), "prop-2", "loc-9")
+
+def test_first_page_has_no_position():
+    assert decode_price_cursor(None) is None
+    assert decode_price_cursor("") is None
+    assert decode_name_cursor(None) is None
+
+def test_name_cursor_round_trip():
+    cursor = name_cursor("Émerald Heights, Phase 2", "proj-1")
+    assert decode_name_cursor(cursor) == ("Émerald Heights, Phase 2", "proj-1")
+
+def test_invalid_cursors_are_rejected():
+    for cursor in ("not base64 !!", "%%%", base64.urlsafe_b64encode(b"\xff\xfe").decode()):
+        expect_invalid(decode_cursor, cursor)
+    # Valid JSON, but not an object
+    expect_invalid(decode_cursor, encode_cursor([1, 2]).rstrip("="))
+    # Missing or malformed fields
+    expect_invalid(decode_price_cursor, encode_cursor({"id": "x"}))
+    expect_invalid(decode_price_cursor, encode_cursor({"p": "abc", "id": "x"}))
+    expect_invalid(decode_name_cursor, encode_cursor({"p": "1", "id": "x"}))
+    # Cursor of another sort order or page shape
+    expect_invalid(decode_price_cursor, name_cursor("A", "x"))
+    expect_invalid(decode_price_cursor, price_cursor(1, "x", "loc"))  # tie breaker not expected
+    expect_invalid(decode_price_cursor, price_cursor(1, "x"), 1)  # tie breaker missing
+
+def test_tampered_cursor_is_rejected_or_decodes_to_its_content():
+    cursor = price_cursor(Decimal("100"), "prop-1")
+    expect_invalid(decode_price_cursor, cursor[:-3])  # truncated
+    forged = encode_cursor({"p": "1; DROP TABLE properties", "id": "x"})
+    expect_invalid(decode_price_cursor, forged)
+    # A well-formed forged cursor only moves the position; values are bound, never spliced into SQL
+    forged = encode_cursor({"p": "5", "id": "x' OR '1'='1"})
+    assert decode_price_cursor(forged) == (Decimal("5"), "x' OR '1'='1")
+
+def test_keyset_predicates_are_row_comparisons():
+    position = (Decimal("100"), "prop-1", "loc-1")
+    predicate = after_price_cursor(column("sell_price"), column("id"), position, column("location_id"))
+    sql = str(predicate.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("(sell_price, id, location_id) > (")
+    assert list(predicate.compile().params.values()) == list(position)
+
+    sql = str(after_position((column("name"), column("id")), ("A", "x")).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("(name, id) > (")
+
+if __name__ == "__main__":
+    test_price_cursor_round_trip()
+    test_first_page_has_no_position()
+    test_name_cursor_round_trip()
+    test_invalid_cursors_are_rejected()
+    test_tampered_cursor_is_rejected_or_decodes_to_its_content()
+    test_keyset_predicates_are_row_comparisons()
+    print("✅ Pagination tests passed!")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-memory property index (masks, keyset pages and top-k ranking)
+"""
+
+import sys
+import os
+import random
+from decimal import Decimal
+from types import SimpleNamespace
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from services.property_index import _IndexRow, _Snapshot, _page_key
+
+LOCALITIES = ["Baner", "Wakad", "Aundh", "Kharadi"]
+AMENITIES = ["gym", "swimming pool", "kids pool", "clubhouse"]
+INF = float("inf")
+
+def plan(filters=None, **fields):
+    """The QueryPlan attributes the index reads"""
+    values = {
+        "filters": filters or {}, "entities": (), "project_status": None, "within_km": None, "within_place": None,
+        "explicit_bhk": None, "min_balconies": None, "garden_view": False, "amenity_match": "all"
+    }
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+def make_rows(count=400, seed=11):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        nearby = {}
+        if rng.random() < 0.5:
+            # Some metro stations have no distance recorded
+            nearby["metro station"] = rng.choice([INF, round(rng.uniform(0.2, 6.0), 2)])
+        rows.append(_IndexRow(
+            property_id=f"prop-{i:04d}",
+            location_id=f"loc-{i % 3}",
+            project_id=f"proj-{i // 4}",
+            city="Pune",
+            locality=rng.choice(LOCALITIES),
+            project_status_code=rng.choice([0, 1, 2, 3]),
+            is_sold=rng.random() < 0.1,
+            property_type="Apartment",
+            bhk_count=Decimal(rng.choice(["1.0", "2.0", "3.0", "4.0"])),
+            sell_price=Decimal(rng.randrange(30, 300) * 100000),
+            carpet_area_sqft=Decimal(rng.randrange(400, 2500)),
+            amenities=tuple(sorted(rng.sample(AMENITIES, rng.randrange(0, 4)))),
+            nearby_min_km=nearby,
+            nearby_named_km={},
+            balcony_count=rng.randrange(0, 3),
+            garden_view=rng.random() < 0.2,
+            has_media=rng.random() < 0.5
+        ))
+    return rows
+
+def expected_keys(rows, predicate):
+    """Brute force: unsold rows passing the predicate, in page order"""
+    matches = [row for row in rows if not row.is_sold and predicate(row)]
+    matches.sort(key=lambda row: _page_key(row.sell_price, row.property_id, row.location_id))
+    return [(row.property_id, row.location_id) for row in matches]
+
+def test_masks_match_brute_force():
+    rows = make_rows()
+    snapshot = _Snapshot(rows)
+    cases = [
+        (plan(), lambda row: True),
+        (plan({"bhk": 2.0, "bhk_operator": "="}), lambda row: row.bhk_count == 2),
+        (plan({"bhk": 3.0, "bhk_operator": ">="}), lambda row: row.bhk_count >= 3),
+        (plan({"price_range": "under 1 cr", "price_operator": "<=", "price_value": 10000000}),
+         lambda row: row.sell_price <= 10000000),
+        (plan({"location": "baner"}), lambda row: row.locality == "Baner"),
+        (plan({"amenities": ["gym", "clubhouse"]}), lambda row: {"gym", "clubhouse"} <= set(row.amenities)),
+        (plan({"amenities": ["gym", "clubhouse"]}, amenity_match="any"),
+         lambda row: bool({"gym", "clubhouse"} & set(row.amenities))),
+        # "pool" names two amenities: any of them satisfies the term
+        (plan({"amenities": ["gym", "pool"]}), lambda row: "gym" in row.amenities and any("pool" in a for a in row.amenities)),
+        (plan({"amenities": ["helipad"]}), lambda row: False),
+        (plan(project_status="ready_to_move"), lambda row: row.project_status_code == 1),
+        (plan(min_balconies=2), lambda row: row.balcony_count >= 2),
+        (plan(garden_view=True), lambda row: row.garden_view),
+    ]
+    for query, predicate in cases:
+        expected = expected_keys(rows, predicate)
+        assert snapshot.search(query, limit=len(rows)) == expected, query.filters
+        assert snapshot.count(query) == len(expected)
+
+def test_nearby_with_and_without_distance():
+    rows = make_rows()
+    snapshot = _Snapshot(rows)
+    near_metro = plan({"nearby_place": {"place_type": "metro", "place_name": None, "distance_km": None, "distance_operator": "<="}})
+    # No distance bound: any metro station counts, also ones without a recorded distance (SQL EXISTS)
+    assert snapshot.search(near_metro, len(rows)) == expected_keys(rows, lambda row: "metro station" in row.nearby_min_km)
+
+    within_2 = plan({"nearby_place": {"place_type": "metro", "place_name": None, "distance_km": 2, "distance_operator": "<="}})
+    assert snapshot.search(within_2, len(rows)) == expected_keys(rows, lambda row: row.nearby_min_km.get("metro station", INF) <= 2)
+
+    # "=" needs the individual places - left to SQL
+    exact = plan({"nearby_place": {"place_type": "metro", "place_name": None, "distance_km": 2, "distance_operator": "="}})
+    assert snapshot.search(exact, 10) is None
+
+def test_keyset_pages_cover_every_match_once():
+    rows = make_rows()
+    snapshot = _Snapshot(rows)
+    query = plan({"bhk": 2.0, "bhk_operator": ">="})
+    by_key = {(row.property_id, row.location_id): row for row in rows}
+
+    pages, after = [], None
+    while True:
+        page = snapshot.search(query, limit=25, after=after)
+        pages.extend(page)
+        if len(page) < 25:
+            break
+        last = by_key[page[-1]]
+        after = (last.sell_price, last.property_id, last.location_id)
+    assert pages == expected_keys(rows, lambda row: row.bhk_count >= 2)
+
+def test_top_k_is_the_head_of_the_full_ranking():
+    rows = make_rows()
+    snapshot = _Snapshot(rows)
+    query = plan({"price_range": "around 1 cr", "price_operator": "<=", "price_value": 10000000})
+    full = snapshot.rank(query, k=len(rows))
+    assert len(full) == snapshot.count(query)
+    scores = [score for _, _, score in full]
+    assert scores == sorted(scores, reverse=True)
+    for k in (1, 5, 20):
+        assert snapshot.rank(query, k) == full[:k]
+    assert snapshot.rank(query, 0) == []
+    assert snapshot.rank(plan({"amenities": ["helipad"]}), 5) == []
+
+def test_ranking_prefers_budget_fit_and_media():
+    def row(property_id, price, has_media):
+        return _IndexRow(property_id, "loc-1", "proj-" + property_id, "Pune", "Baner", 1, False, "Apartment",
+                         Decimal("2.0"), Decimal(price), Decimal(1000), (), {}, {}, 0, False, has_media)
+    snapshot = _Snapshot([row("far", 4000000, True), row("close", 9500000, False), row("close-media", 9500000, True)])
+    query = plan({"price_range": "under 1 cr", "price_operator": "<=", "price_value": 10000000})
+    assert [key[0] for *key, _ in snapshot.rank(query, 3)] == ["close-media", "close", "far"]
+
+if __name__ == "__main__":
+    test_masks_match_brute_force()
+    test_nearby_with_and_without_distance()
+    test_keyset_pages_cover_every_match_once()
+    test_top_k_is_the_head_of_the_full_ranking()
+    test_ranking_prefers_budget_fit_and_media()
+    print("✅ Property index tests passed!")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test script for the NLP query cache
+"""
+
+import sys
+import os
+import time
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from services.query_cache import QueryCache, normalize_query
+
+def test_normalized_keys():
+    assert normalize_query("  2 BHK  in\tBaner ") == "2 bhk in baner"
+    assert normalize_query(None) == ""
+
+def test_lru_eviction_and_counters():
+    cache = QueryCache(max_size=2, ttl_seconds=None)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recently used
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["hits"] == 3 and stats["misses"] == 1 and stats["evictions"] == 1
+
+def test_ttl_expiry():
+    cache = QueryCache(max_size=10, ttl_seconds=0.05)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+def test_clear_drops_values_computed_before_it():
+    """A plan computed with the old gazetteer must not be stored after a refresh"""
+    cache = QueryCache(max_size=10)
+    generation = cache.generation
+    cache.clear()
+    cache.put("a", "stale", generation)
+    assert cache.get("a") is None
+
+    cache.put("a", "fresh", cache.generation)
+    assert cache.get("a") == "fresh"
+
+if __name__ == "__main__":
+    test_normalized_keys()
+    test_lru_eviction_and_counters()
+    test_ttl_expiry()
+    test_clear_drops_values_computed_before_it()
+    print("✅ Query cache tests passed!")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for the NLP search result cache
+"""
+
+import sys
+import os
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from services.result_cache import DataVersionWatcher, LocalResultCache
+
+def test_stale_results_are_not_stored():
+    """A search that was running while the cache was invalidated must not repopulate it"""
+    cache = LocalResultCache(max_size=10, ttl_seconds=None)
+    generation = cache.generation
+    cache.invalidate()
+    cache.put("plan", [("p1", "l1")], generation)
+    assert cache.get("plan") is None
+
+    cache.put("plan", [("p1", "l1")], cache.generation)
+    assert cache.get("plan") == [("p1", "l1")]
+
+def version_engine(version: int = 0):
+    """SQLite stand-in for database/search_data_version.sql (the triggers are Postgres-only)"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE search_data_version (id INTEGER PRIMARY KEY, version INTEGER NOT NULL)"))
+        conn.execute(text("INSERT INTO search_data_version (id, version) VALUES (1, :version)"), {"version": version})
+    return engine
+
+def set_version(engine, version: int):
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE search_data_version SET version = :version WHERE id = 1"), {"version": version})
+
+def test_version_change_invalidates():
+    """A write from any process bumps the version; the next poll drops cached results"""
+    cache = LocalResultCache(max_size=10, ttl_seconds=None)
+    engine = version_engine(7)
+    watcher = DataVersionWatcher(engine, cache)
+
+    assert watcher.check() is False  # first reading is the baseline
+    cache.put("plan", [("p1", "l1")], cache.generation)
+    assert watcher.check() is False
+    assert cache.get("plan") == [("p1", "l1")]
+
+    set_version(engine, 8)
+    assert watcher.check() is True
+    assert cache.get("plan") is None
+
+def test_unchanged_or_missing_version_keeps_entries():
+    cache = LocalResultCache(max_size=10, ttl_seconds=None)
+    engine = version_engine(3)
+    watcher = DataVersionWatcher(engine, cache)
+    watcher.check()
+    cache.put("plan", [("p1", "l1")], cache.generation)
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM search_data_version"))
+    assert watcher.check() is False
+    assert cache.get("plan") == [("p1", "l1")]
+
+    # Without the table, check() fails and run() keeps polling; entries expire on their TTL
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE search_data_version"))
+    try:
+        watcher.check()
+        assert False, "expected the missing table to raise"
+    except Exception:
+        pass
+    assert cache.get("plan") == [("p1", "l1")]
+
+if __name__ == "__main__":
+    test_stale_results_are_not_stored()
+    test_version_change_invalidates()
+    test_unchanged_or_missing_version_keeps_entries()
+    print("✅ Result cache tests passed!")